@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from app.core.db import get_db
+from app.core.list_cache import cached_list
 from app.crud import budget as crud_budget
-from app.schemas.budget import BudgetCreate, BudgetResponse
+from app.schemas.budget import BudgetCreate, BudgetResponse, BudgetListAdapter
 from app.schemas.common import APIResponse, APIListResponse
-from app.api.v1.dependencies import CurrentUser 
+from app.api.v1.dependencies import CurrentUser, get_read_db, ReleaseSessionRoute, ETAG
 
-router = APIRouter(prefix="/budgets", tags=["Budgets"])
+router = APIRouter(prefix="/budgets", tags=["Budgets"], route_class=ReleaseSessionRoute)
 
 DB_SESSION = Depends(get_db)
+READ_DB_SESSION = Depends(get_read_db) # Replica (read-your-writes aware)
 
 @router.post(
     "/",
@@ -38,38 +40,45 @@ async def create_budget(
 @router.get(
     "/",
     response_model=APIListResponse[BudgetResponse],
-    summary="Get all budgets for the authenticated user."
+    summary="Get all budgets for the authenticated user.",
+    dependencies=[ETAG],
 )
 async def read_budgets(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION,
+    db: AsyncSession = READ_DB_SESSION,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Retrieves a list of all user's budgets with pagination."""
-    
-    db_budgets, total_count = await crud_budget.get_all_budgets_for_user(
-        db, 
-        user_id=current_user.user_id,
-        limit=limit,
-        offset=offset
-    )
-    
-    return APIListResponse(
-        message="Budgets retrieved successfully.",
-        data=[BudgetResponse.model_validate(b) for b in db_budgets],
-        total_count=total_count
-    )
+
+    async def load() -> APIListResponse:
+        db_budgets, total_count = await crud_budget.get_all_budgets_for_user(
+            db, 
+            user_id=current_user.user_id,
+            limit=limit,
+            offset=offset
+        )
+
+        return APIListResponse(
+            message="Budgets retrieved successfully.",
+            data=BudgetListAdapter.validate_python(db_budgets, from_attributes=True),
+            total_count=total_count
+        )
+
+    return await cached_list(request, response, current_user.user_id, "budgets", load, limit=limit, offset=offset)
     
 @router.get(
     "/{budget_id}",
     response_model=APIResponse[BudgetResponse],
-    summary="Get a specific budget by ID."
+    summary="Get a specific budget by ID.",
+    dependencies=[ETAG],
 )
 async def read_budget(
     budget_id: uuid.UUID,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION
+    db: AsyncSession = READ_DB_SESSION
 ):
     """Retrieves details for a specific budget."""
     
@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import uuid
 
 from app.core.db import get_db
+from app.core.list_cache import cached_list
 from app.crud import category as crud_category
-from app.schemas.category import CategoryCreate, CategoryResponse
+from app.schemas.category import CategoryCreate, CategoryResponse, CategoryListAdapter
 from app.schemas.common import APIResponse, APIListResponse
-from app.api.v1.dependencies import CurrentUser 
+from app.api.v1.dependencies import CurrentUser, get_read_db, ReleaseSessionRoute, ETAG
 
-router = APIRouter(prefix="/categories", tags=["Categories"])
+router = APIRouter(prefix="/categories", tags=["Categories"], route_class=ReleaseSessionRoute)
 
 DB_SESSION = Depends(get_db)
+READ_DB_SESSION = Depends(get_read_db) # Replica (read-your-writes aware)
 
 @router.post(
     "/",
@@ -39,40 +41,47 @@ async def create_category(
 @router.get(
     "/",
     response_model=APIListResponse[CategoryResponse],
-    summary="Get all categories (including system defaults) for the authenticated user."
+    summary="Get all categories (including system defaults) for the authenticated user.",
+    dependencies=[ETAG],
 )
 async def read_categories(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION,
+    db: AsyncSession = READ_DB_SESSION,
     q: Optional[str] = Query(None, description="Search by category name."),
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Retrieves a list of all user-owned and system default categories with search and pagination."""
-    
-    db_categories, total_count = await crud_category.get_all_categories_for_user(
-        db, 
-        user_id=current_user.user_id,
-        q=q,
-        limit=limit,
-        offset=offset
-    )
-    
-    return APIListResponse(
-        message="Categories retrieved successfully.",
-        data=[CategoryResponse.model_validate(c) for c in db_categories],
-        total_count=total_count
-    )
+
+    async def load() -> APIListResponse:
+        db_categories, total_count = await crud_category.get_all_categories_for_user(
+            db, 
+            user_id=current_user.user_id,
+            q=q,
+            limit=limit,
+            offset=offset
+        )
+
+        return APIListResponse(
+            message="Categories retrieved successfully.",
+            data=CategoryListAdapter.validate_python(db_categories, from_attributes=True),
+            total_count=total_count
+        )
+
+    return await cached_list(request, response, current_user.user_id, "categories", load, q=q, limit=limit, offset=offset)
     
 @router.get(
     "/{category_id}",
     response_model=APIResponse[CategoryResponse],
-    summary="Get a specific category by ID."
+    summary="Get a specific category by ID.",
+    dependencies=[ETAG],
 )
 async def read_category(
     category_id: uuid.UUID,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION
+    db: AsyncSession = READ_DB_SESSION
 ):
     """Retrieves details for a specific category, ensuring access rights (user-owned or system)."""
     
@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import uuid
 
 from app.core.db import get_db
+from app.core.list_cache import cached_list
 from app.crud import debt as crud_debt
-from app.schemas.debt import DebtLedgerCreate, DebtLedgerUpdate, DebtLedgerResponse
+from app.schemas.debt import DebtLedgerCreate, DebtLedgerUpdate, DebtLedgerResponse, DebtLedgerListAdapter
 from app.schemas.common import APIResponse, APIListResponse
-from app.api.v1.dependencies import CurrentUser 
+from app.api.v1.dependencies import CurrentUser, get_read_db, ReleaseSessionRoute, ETAG
 
-router = APIRouter(prefix="/debts", tags=["Debt Ledger"])
+router = APIRouter(prefix="/debts", tags=["Debt Ledger"], route_class=ReleaseSessionRoute)
 
 DB_SESSION = Depends(get_db)
+READ_DB_SESSION = Depends(get_read_db) # Replica (read-your-writes aware)
 
 @router.post(
     "/",
@@ -39,40 +41,47 @@ async def create_debt(
 @router.get(
     "/",
     response_model=APIListResponse[DebtLedgerResponse],
-    summary="Get all debt ledger entries for the authenticated user."
+    summary="Get all debt ledger entries for the authenticated user.",
+    dependencies=[ETAG],
 )
 async def read_debts(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION,
+    db: AsyncSession = READ_DB_SESSION,
     q: Optional[str] = Query(None, description="Search by contact name or phone number."),
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Retrieves a list of all user's debt and receivable entries with search and pagination."""
-    
-    db_debts, total_count = await crud_debt.get_all_debts_for_user(
-        db, 
-        user_id=current_user.user_id,
-        q=q,
-        limit=limit,
-        offset=offset
-    )
-    
-    return APIListResponse(
-        message="Debt entries retrieved successfully.",
-        data=[DebtLedgerResponse.model_validate(d) for d in db_debts],
-        total_count=total_count
-    )
+
+    async def load() -> APIListResponse:
+        db_debts, total_count = await crud_debt.get_all_debts_for_user(
+            db, 
+            user_id=current_user.user_id,
+            q=q,
+            limit=limit,
+            offset=offset
+        )
+
+        return APIListResponse(
+            message="Debt entries retrieved successfully.",
+            data=DebtLedgerListAdapter.validate_python(db_debts, from_attributes=True),
+            total_count=total_count
+        )
+
+    return await cached_list(request, response, current_user.user_id, "debts", load, q=q, limit=limit, offset=offset)
     
 @router.get(
     "/{ledger_id}",
     response_model=APIResponse[DebtLedgerResponse],
-    summary="Get a specific debt entry by ID."
+    summary="Get a specific debt entry by ID.",
+    dependencies=[ETAG],
 )
 async def read_debt(
     ledger_id: uuid.UUID,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION
+    db: AsyncSession = READ_DB_SESSION
 ):
     """Retrieves details for a specific debt entry."""
     
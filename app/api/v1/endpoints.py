@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordRequestForm
+from datetime import datetime, timezone
+from typing import Annotated, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.token import Token
+from app.schemas.token import Token, RefreshTokenRequest
 from app.schemas.common import APIResponse
 from app.crud import user as crud_user
-from app.core.security import create_access_token
+from app.core.security import create_access_token, create_refresh_token, decode_token, REFRESH_TOKEN_TYPE
+from app.core import token_store
+from app.api.v1.dependencies import CurrentUser, oauth2_scheme, ReleaseSessionRoute
 from app.api.v1 import wallet 
 from app.api.v1 import category
 from app.api.v1 import transaction
 from app.api.v1 import debt
 from app.api.v1 import budget
 from app.api.v1 import report
+from app.api.v1 import internal
+from app.api.v1 import sync
 
-router = APIRouter()
+router = APIRouter(route_class=ReleaseSessionRoute)
 
 # ----------------------------------------------------------------------
 # 1. AUTHENTICATION ENDPOINTS (LOGIN)
@@ -25,27 +31,73 @@ async def login_for_access_token(
     db: AsyncSession = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends(), # Standard form login
 ):
-    # 1. Cari user berdasarkan username (email)
-    user = await crud_user.get_user_by_email(db, email=form_data.username)
+    # 1. Cari user berdasarkan email dan verifikasi password (di thread pool hashing)
+    user = await crud_user.authenticate_user(
+        db, email=form_data.username, password=form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect username or password"
         )
-    
-    # 2. Verifikasi Password
-    if not crud_user.verify_password(form_data.password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Incorrect username or password"
-        )
         
-    # 3. Buat Access Token (subject = user_id)
+    # 2. Buat Access + Refresh Token (subject = user_id)
+    return await _issue_token_pair(user.user_id)
+
+async def _issue_token_pair(user_id) -> Token:
+    """Creates an access token and a registered (single-use) refresh token."""
     access_token = create_access_token(
-        subject=user.user_id # Menggunakan UUID sebagai subject
+        subject=user_id # Menggunakan UUID sebagai subject
     )
+    refresh_token, refresh_jti, refresh_expire = create_refresh_token(subject=user_id)
+    await token_store.store_refresh_token(refresh_jti, str(user_id), refresh_expire)
     
-    return Token(access_token=access_token)
+    return Token(access_token=access_token, refresh_token=refresh_token)
+
+@router.post("/token/refresh", response_model=Token, summary="Exchange a refresh token for a new token pair.")
+async def refresh_access_token(body: RefreshTokenRequest):
+    """
+    Rotates the refresh token: the presented token is consumed and a new pair is issued,
+    so no password verification (pbkdf2) is needed to stay logged in.
+    """
+    invalid_refresh = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    payload = decode_token(body.refresh_token, expected_type=REFRESH_TOKEN_TYPE)
+    if payload is None:
+        raise invalid_refresh
+
+    # Single use: a replayed (already rotated) or logged-out token is rejected here
+    if not await token_store.consume_refresh_token(payload["jti"], payload["sub"]):
+        raise invalid_refresh
+
+    return await _issue_token_pair(payload["sub"])
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+    summary="Revoke the current access token (and optionally its refresh token)."
+)
+async def logout(
+    current_user: CurrentUser,
+    token: Annotated[str, Depends(oauth2_scheme)],
+    body: Optional[RefreshTokenRequest] = None,
+):
+    payload = decode_token(token)
+    if payload and payload.get("jti"):
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        await token_store.revoke_token(payload["jti"], expires_at)
+
+    if body:
+        refresh_payload = decode_token(body.refresh_token, expected_type=REFRESH_TOKEN_TYPE)
+        if refresh_payload:
+            await token_store.consume_refresh_token(refresh_payload["jti"], refresh_payload["sub"])
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 # ----------------------------------------------------------------------
 # 2. USER REGISTRATION (TETAP SAMA)
@@ -83,4 +135,6 @@ router.include_router(category.router)
 router.include_router(transaction.router)
 router.include_router(debt.router)
 router.include_router(budget.router)
-router.include_router(report.router)
\ No newline at end of file
+router.include_router(report.router)
+router.include_router(sync.router)
+router.include_router(internal.router)
\ No newline at end of file
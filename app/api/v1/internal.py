@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List
+import os
+
+from app.core.db import engine, read_engine, get_db
+from app.models.diagnostics import SlowQueryPlan
+from app.schemas.common import APIResponse
+from app.api.v1.dependencies import require_internal_key
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_key)],
+)
+
+@router.get(
+    "/db-pool",
+    response_model=APIResponse[Dict[str, Any]],
+    summary="Connection pool occupancy and checkout wait times for this worker."
+)
+async def read_db_pool_stats():
+    """Reports the pools of the worker process that served the request (pid included)."""
+    data = {"pid": os.getpid(), "primary": engine.sync_engine.pool.snapshot()}
+    if read_engine is not engine:
+        data["replica"] = read_engine.sync_engine.pool.snapshot()
+
+    return APIResponse(
+        message="Pool statistics retrieved successfully.",
+        data=data
+    )
+
+@router.get(
+    "/slow-queries",
+    response_model=APIResponse[List[Dict[str, Any]]],
+    summary="Most recent captured slow-query plans (EXPLAIN ANALYZE, BUFFERS)."
+)
+async def read_slow_query_plans(
+    db: AsyncSession = Depends(get_db),
+    endpoint: str = Query(None, description="Filter by originating endpoint, e.g. 'GET /api/v1/transactions/'"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    query = select(SlowQueryPlan).order_by(SlowQueryPlan.captured_at.desc()).limit(limit)
+    if endpoint:
+        query = query.where(SlowQueryPlan.endpoint == endpoint)
+    plans = (await db.execute(query)).scalars().all()
+
+    return APIResponse(
+        message="Slow query plans retrieved successfully.",
+        data=[
+            {
+                "captured_at": p.captured_at,
+                "endpoint": p.endpoint,
+                "duration_ms": p.duration_ms,
+                "params_shape": p.params_shape,
+                "statement": p.statement,
+                "plan": p.plan,
+            }
+            for p in plans
+        ]
+    )
@@ -3,23 +3,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 import uuid
 import json
-import redis.asyncio as redis
 from datetime import datetime
 from decimal import Decimal
 
 from app.core.db import get_db
-from app.core.redis import get_redis_client
+from app.core.redis import cache_delete, cache_get, cache_set
+from app.core.metrics import CACHE_REQUESTS
 from app.crud import report as crud_report
 from app.schemas.transfer import TransferCreate
 from app.schemas.report import FinancialSummaryResponse
 from app.schemas.transaction import TransactionResponse
 from app.schemas.common import APIResponse, APIListResponse
-from app.api.v1.dependencies import CurrentUser 
+from app.api.v1.dependencies import CurrentUser, get_read_db, ReleaseSessionRoute, ETAG
 
-router = APIRouter(prefix="/finance", tags=["Finance & Reports"])
+router = APIRouter(prefix="/finance", tags=["Finance & Reports"], route_class=ReleaseSessionRoute)
 
 DB_SESSION = Depends(get_db)
-REDIS_CLIENT = Depends(get_redis_client)
+READ_DB_SESSION = Depends(get_read_db) # Replica (read-your-writes aware)
 
 # --- Endpoint Transfer ---
 
@@ -54,9 +54,9 @@ async def create_transfer(
             detail="Transfer failed. Check if both wallets exist and belong to the user, or if source != target."
         )
 
-    # Invalidasi cache dashboard/summary setelah perubahan besar
-    r: redis.Redis = await anext(get_redis_client())
-    await r.delete(f"summary:{current_user.user_id}")
+    # Invalidasi cache dashboard/summary setelah perubahan besar. Transfer sudah di-commit:
+    # kegagalan Redis di sini tidak boleh menjadi 500 (entry cache tetap kedaluwarsa via TTL).
+    await cache_delete(f"summary:{current_user.user_id}")
 
     return APIResponse(
         message="Transfer successful. Two transactions created.",
@@ -69,22 +69,23 @@ async def create_transfer(
 @router.get(
     "/summary",
     response_model=APIResponse[FinancialSummaryResponse],
-    summary="Get high-level financial summary with Redis caching."
+    summary="Get high-level financial summary with Redis caching.",
+    dependencies=[ETAG],
 )
 async def get_summary(
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION,
-    r: redis.Redis = REDIS_CLIENT
+    db: AsyncSession = READ_DB_SESSION,
 ):
     """
     Mengambil ringkasan keuangan dari cache Redis. 
     Jika tidak ada, dihitung dari DB dan disimpan ke cache selama 300 detik.
+    Redis yang lambat/mati diperlakukan sebagai cache miss.
     """
     user_id_str = str(current_user.user_id)
     cache_key = f"summary:{user_id_str}"
     
     # 1. Coba ambil dari Cache
-    cached_data = await r.get(cache_key)
+    cached_data = await cache_get(cache_key)
     if cached_data:
         try:
             summary_dict = json.loads(cached_data)
@@ -92,6 +93,7 @@ async def get_summary(
             for key in ['total_income', 'total_expense', 'net_balance']:
                  summary_dict[key] = Decimal(summary_dict[key])
 
+            CACHE_REQUESTS.labels("summary", "hit").inc()
             return APIResponse(
                 message="Financial summary retrieved from cache.",
                 data=FinancialSummaryResponse(**summary_dict)
@@ -101,6 +103,7 @@ async def get_summary(
             print("Cache corrupted, recalculating summary.")
 
     # 2. Hitung dari Database
+    CACHE_REQUESTS.labels("summary", "miss").inc()
     summary_db = await crud_report.get_financial_summary(db, current_user.user_id)
 
     # 3. Simpan ke Cache (Convert Decimal ke string untuk JSON serialization)
@@ -109,7 +112,7 @@ async def get_summary(
         for key, value in summary_db.items()
     }
     
-    await r.set(cache_key, json.dumps(summary_to_cache), ex=300) # Cache selama 5 menit
+    await cache_set(cache_key, json.dumps(summary_to_cache), ex=300) # Cache selama 5 menit
 
     return APIResponse(
         message="Financial summary calculated from database.",
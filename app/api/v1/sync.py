@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.config import settings
+from app.core.db import get_db
+from app.crud import sync as crud_sync
+from app.schemas.common import APIResponse
+from app.schemas.sync import SyncPage
+from app.api.v1.dependencies import CurrentUser, ReleaseSessionRoute
+
+router = APIRouter(prefix="/sync", tags=["Sync"], route_class=ReleaseSessionRoute)
+
+# Primary only: a lagging replica could hide a change the cursor has already moved past
+DB_SESSION = Depends(get_db)
+
+@router.get(
+    "/",
+    response_model=APIResponse[SyncPage],
+    summary="Get all changes (upserts and deletions) since a sync cursor.",
+    responses={410: {"description": "Cursor too old: discard local data and sync again without `since`."}},
+)
+async def read_changes(
+    current_user: CurrentUser,
+    db: AsyncSession = DB_SESSION,
+    since: Optional[str] = Query(None, description="`next_cursor` from the previous response; omit for a full sync."),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE),
+):
+    """
+    Offline-first delta sync: wallets, categories, transactions, budgets and debts changed
+    after `since`, oldest first. Keep calling with `next_cursor` while `has_more` is true.
+    """
+    cursor = crud_sync.parse_cursor(since)
+    if cursor is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync cursor.")
+
+    result = await crud_sync.get_changes_since(db, user_id=current_user.user_id, since=cursor, limit=limit)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync cursor is too old. Discard local data and sync again without `since`.",
+        )
+    changes, next_cursor, has_more = result
+
+    return APIResponse(
+        message="Changes retrieved successfully.",
+        data=SyncPage(changes=changes, next_cursor=crud_sync.format_cursor(next_cursor), has_more=has_more)
+    )
@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import uuid
 
 from app.core.db import get_db
+from app.core.list_cache import cached_list
 from app.crud import transaction as crud_transaction
-from app.schemas.transaction import TransactionCreate, TransactionResponse
+from app.schemas.transaction import TransactionCreate, TransactionResponse, TransactionListAdapter
 from app.schemas.common import APIResponse, APIListResponse
-from app.api.v1.dependencies import CurrentUser 
+from app.api.v1.dependencies import CurrentUser, get_read_db, ReleaseSessionRoute, ETAG
 
-router = APIRouter(prefix="/transactions", tags=["Transactions"])
+router = APIRouter(prefix="/transactions", tags=["Transactions"], route_class=ReleaseSessionRoute)
 
 DB_SESSION = Depends(get_db)
+READ_DB_SESSION = Depends(get_read_db) # Replica (read-your-writes aware)
 
 @router.post(
     "/",
@@ -46,40 +48,47 @@ async def create_transaction(
 @router.get(
     "/",
     response_model=APIListResponse[TransactionResponse],
-    summary="Get all transactions for the authenticated user."
+    summary="Get all transactions for the authenticated user.",
+    dependencies=[ETAG],
 )
 async def read_transactions(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION,
+    db: AsyncSession = READ_DB_SESSION,
     q: Optional[str] = Query(None, description="Search by transaction description."),
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Retrieves a list of all user's transactions with search and pagination."""
-    
-    db_transactions, total_count = await crud_transaction.get_all_transactions_for_user(
-        db, 
-        user_id=current_user.user_id,
-        q=q,
-        limit=limit,
-        offset=offset
-    )
-    
-    return APIListResponse(
-        message="Transactions retrieved successfully.",
-        data=[TransactionResponse.model_validate(t) for t in db_transactions],
-        total_count=total_count
-    )
+
+    async def load() -> APIListResponse:
+        db_transactions, total_count = await crud_transaction.get_all_transactions_for_user(
+            db, 
+            user_id=current_user.user_id,
+            q=q,
+            limit=limit,
+            offset=offset
+        )
+
+        return APIListResponse(
+            message="Transactions retrieved successfully.",
+            data=TransactionListAdapter.validate_python(db_transactions, from_attributes=True),
+            total_count=total_count
+        )
+
+    return await cached_list(request, response, current_user.user_id, "transactions", load, q=q, limit=limit, offset=offset)
     
 @router.get(
     "/{transaction_id}",
     response_model=APIResponse[TransactionResponse],
-    summary="Get a specific transaction by ID."
+    summary="Get a specific transaction by ID.",
+    dependencies=[ETAG],
 )
 async def read_transaction(
     transaction_id: uuid.UUID,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION
+    db: AsyncSession = READ_DB_SESSION
 ):
     """Retrieves details for a specific transaction."""
     
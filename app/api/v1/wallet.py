@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import uuid
 
 from app.core.db import get_db
+from app.core.list_cache import cached_list
 from app.crud import wallet as crud_wallet
-from app.schemas.wallet import WalletCreate, WalletResponse, WalletBase
+from app.schemas.wallet import WalletCreate, WalletResponse, WalletBase, WalletListAdapter
 from app.schemas.common import APIResponse, APIListResponse
-from app.api.v1.dependencies import CurrentUser # Import dependency
+from app.api.v1.dependencies import CurrentUser, get_read_db, ReleaseSessionRoute, ETAG # Import dependency
 
-router = APIRouter(prefix="/wallets", tags=["Wallets"])
+router = APIRouter(prefix="/wallets", tags=["Wallets"], route_class=ReleaseSessionRoute)
 
 DB_SESSION = Depends(get_db)
+READ_DB_SESSION = Depends(get_read_db) # Replica (read-your-writes aware)
 
 @router.post(
     "/",
@@ -39,41 +41,48 @@ async def create_wallet(
 @router.get(
     "/",
     response_model=APIListResponse[WalletResponse],
-    summary="Get all financial wallets for the authenticated user."
+    summary="Get all financial wallets for the authenticated user.",
+    dependencies=[ETAG],
 )
 async def read_wallets(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION,
+    db: AsyncSession = READ_DB_SESSION,
     q: Optional[str] = Query(None, description="Search by wallet name or currency"), # Tambahkan Search
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Retrieves a list of all wallets owned by the current user."""
 
-    # Panggil CRUD dengan parameter baru
-    db_wallets, total_count = await crud_wallet.get_all_wallets_for_user(
-        db, 
-        user_id=current_user.user_id,
-        q=q,
-        limit=limit,
-        offset=offset
-    )
+    async def load() -> APIListResponse:
+        # Panggil CRUD dengan parameter baru
+        db_wallets, total_count = await crud_wallet.get_all_wallets_for_user(
+            db, 
+            user_id=current_user.user_id,
+            q=q,
+            limit=limit,
+            offset=offset
+        )
 
-    return APIListResponse(
-        message="Wallets retrieved successfully.",
-        data=[WalletResponse.model_validate(w) for w in db_wallets],
-        total_count=total_count # Gunakan total_count dari CRUD
-    )
+        return APIListResponse(
+            message="Wallets retrieved successfully.",
+            data=WalletListAdapter.validate_python(db_wallets, from_attributes=True),
+            total_count=total_count # Gunakan total_count dari CRUD
+        )
+
+    return await cached_list(request, response, current_user.user_id, "wallets", load, q=q, limit=limit, offset=offset)
     
 @router.get(
     "/{wallet_id}",
     response_model=APIResponse[WalletResponse],
-    summary="Get a specific wallet by ID."
+    summary="Get a specific wallet by ID.",
+    dependencies=[ETAG],
 )
 async def read_wallet(
     wallet_id: uuid.UUID,
     current_user: CurrentUser,
-    db: AsyncSession = DB_SESSION
+    db: AsyncSession = READ_DB_SESSION
 ):
     """Retrieves details for a specific wallet, ensuring ownership by the current user."""
     
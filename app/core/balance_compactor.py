@@ -0,0 +1,25 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.crud.wallet import compact_balance_deltas
+
+async def run_balance_compactor() -> None:
+    """
+    Background loop started from the application lifespan. Runs in every worker, but an
+    advisory lock lets only one of them compact at a time. It also runs with
+    WALLET_BALANCE_DELTAS off, so deltas left over from switching the mode off are
+    folded in within one interval (reads stop adding them as soon as the mode is off).
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                updated = await compact_balance_deltas(db)
+            if updated:
+                print(f"Balance compactor folded pending deltas into {updated} wallet(s).")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Deltas stay pending (and reads stay exact); retry next round
+            print(f"Balance delta compaction failed: {exc}")
+        await asyncio.sleep(settings.BALANCE_COMPACT_INTERVAL_SECONDS)
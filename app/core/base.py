@@ -1,4 +1,18 @@
+from sqlalchemy import Column, BigInteger, DateTime, FetchedValue
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.sql import func
 
 # Base class untuk semua model SQLAlchemy.
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+class SyncVersioned:
+    """
+    Mixin for entities served by GET /sync. These columns are maintained by the
+    bump_row_version trigger (migrations v0006, v0009) on every insert and update, including
+    Core statements; eager_defaults reads them back via RETURNING instead of expiring them.
+    """
+    row_version = Column(BigInteger, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    row_xid = Column(BigInteger, server_default=FetchedValue(), server_onupdate=FetchedValue())  # writer transaction
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
+
+    __mapper_args__ = {"eager_defaults": True}
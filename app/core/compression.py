@@ -0,0 +1,95 @@
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Picks 'br' or 'gzip' from an Accept-Encoding header (honouring q-values), preferring br on ties."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        offered[token.strip().lower()] = quality
+
+    candidates = [enc for enc in (("br",) if brotli else ()) + ("gzip",)
+                  if offered.get(enc, offered.get("*", 0.0)) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda enc: offered.get(enc, offered.get("*", 0.0)))
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing single-chunk JSON/text responses of at least
+    COMPRESSION_MINIMUM_SIZE bytes with brotli or gzip, as negotiated by Accept-Encoding.
+    Streaming responses pass through untouched. Strong ETags become weak on compressed
+    responses (the bytes differ per encoding); check_etag compares weakly.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            pending, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=pending["headers"])
+            if (
+                message.get("more_body", False)
+                or len(body) < settings.COMPRESSION_MINIMUM_SIZE
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(pending)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+            await send(pending)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,6 +1,6 @@
 import uuid
+from typing import Dict, Optional, Tuple
 from pydantic_settings import BaseSettings
-from app.crud.user import get_password_hash
 
 MOCK_USER_A_ID: uuid.UUID = uuid.UUID("00000000-0000-0000-0000-000000000001")
 
@@ -19,20 +19,176 @@ class Settings(BaseSettings):
         f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
 
+    # Optional read replica for GET endpoints. Pointing it at the primary's URL is valid
+    # (useful to exercise the routing locally).
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # After a write, that user's reads stay on the primary this long (must exceed replica lag)
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Lifetime of an idle user's data version (ETags, list cache keys); every write renews it.
+    # Also the upper bound on stale 304s should a worker die before publishing a bump.
+    DATA_VERSION_TTL_SECONDS: int = 3600
+
+    # --- Connection Pool Settings (per worker process) ---
+    # Gunicorn/uvicorn worker count; used to split the connection budget between workers
+    WEB_CONCURRENCY: int = 1
+    # Total connections this deployment may open (Postgres max_connections minus headroom)
+    DB_MAX_CONNECTIONS: int = 60
+    # Leave unset to derive from DB_MAX_CONNECTIONS / WEB_CONCURRENCY (2/3 pooled, 1/3 overflow)
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 10.0      # seconds to wait for a connection before failing
+    DB_POOL_RECYCLE: int = 1800        # seconds; avoids stale connections behind LBs/firewalls
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache per connection (set 0 behind pgbouncer transaction pooling)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Deadlock/serialization-failure retries for multi-row balance writes (full-jitter backoff, seconds)
+    DB_CONFLICT_RETRY_ATTEMPTS: int = 5
+    DB_CONFLICT_RETRY_BASE_DELAY: float = 0.02
+    DB_CONFLICT_RETRY_MAX_DELAY: float = 0.5
+    # Opt-in for hot wallets (e.g. POS cash drawers): transaction writes append to
+    # wallet_balance_deltas instead of updating the wallet row; a background compactor
+    # folds them into current_balance, and reads add any still-pending deltas.
+    WALLET_BALANCE_DELTAS: bool = False
+    # Keep on in production (it also drains deltas left after switching the mode off)
+    BALANCE_COMPACTOR_ENABLED: bool = True
+    BALANCE_COMPACT_INTERVAL_SECONDS: float = 2.0
+    BALANCE_COMPACT_BATCH_SIZE: int = 5000
+
+    # --- Change Feed (transactional outbox -> Redis Streams) ---
+    OUTBOX_RELAY_ENABLED: bool = True
+    OUTBOX_STREAM_KEY: str = "changes"
+    OUTBOX_STREAM_MAXLEN: int = 100_000      # approximate trimming (XADD MAXLEN ~)
+    OUTBOX_RELAY_BATCH_SIZE: int = 500
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 1.0
+
+    # --- Delta Sync (GET /sync) ---
+    SYNC_PAGE_SIZE: int = 500
+    SYNC_MAX_PAGE_SIZE: int = 2000
+    # Deletions are kept this long; clients whose cursor is older must resync from scratch
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+    SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS: float = 3600.0
+    SYNC_TOMBSTONE_PRUNE_BATCH_SIZE: int = 10_000
+
     # --- Redis Settings (for Caching/Sessions) ---
     REDIS_HOST: str = "127.0.0.1"
     REDIS_PORT: int = 6379
     REDIS_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
+    # Per worker. Redis trouble must degrade latency, not availability: commands time out
+    # quickly, and after REDIS_BREAKER_FAILURE_THRESHOLD consecutive failures the circuit
+    # breaker fails them instantly, probing again every REDIS_BREAKER_RESET_SECONDS.
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 0.2        # seconds to wait for a free pooled connection
+    REDIS_SOCKET_TIMEOUT: float = 0.5      # per command (read/write)
+    REDIS_CONNECT_TIMEOUT: float = 0.25
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_RESET_SECONDS: float = 5.0
 
     # --- Security Settings ---
     SECRET_KEY: str = "YOUR_SUPER_SECRET_KEY_HERE"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    # Revoked token IDs are mirrored into a per-worker bloom filter; this is how often it
+    # is rebuilt from Redis (i.e. the max delay before another worker sees a logout).
+    REVOCATION_SYNC_INTERVAL_SECONDS: float = 5.0
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    # Authenticated users are cached in Redis (0 disables) so cache-served requests skip the DB.
+    # Committed writes to a user retire the entry (see app.core.user_cache); the TTL only bounds
+    # how long a deactivated account keeps working if that invalidation cannot reach Redis.
+    AUTH_USER_CACHE_SECONDS: int = 300
+
+    # --- Password Hashing Settings ---
+    # pbkdf2_sha256 iteration count. Changing it triggers a transparent rehash on next login.
+    PASSWORD_HASH_ROUNDS: int = 29000
+    # Dedicated threads per worker for hashing/verification (keeps the event loop free)
+    PASSWORD_HASH_WORKERS: int = 2
+    # Max queued + running hash jobs per worker before login/register return 503
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # --- Rate Limiting Settings ---
+    RATE_LIMIT_ENABLED: bool = True
+    # "[METHOD ]path-prefix": (bucket capacity, refill tokens per second). The most specific
+    # match wins; authenticated requests are bucketed per user, anonymous ones per client IP.
+    RATE_LIMIT_POLICIES: Dict[str, Tuple[int, float]] = {
+        "POST /api/v1/token": (5, 0.1),         # brute-force guard: burst 5, then 1 per 10 s
+        # Prefixes also match deeper paths: refresh needs its own bucket, or it would share the
+        # login guard (refresh tokens are random, not guessable, and checked without hashing)
+        "POST /api/v1/token/refresh": (20, 0.5),
+        "POST /api/v1/users/": (3, 0.05),
+        "/api/v1/transactions": (60, 10.0),
+        "/api/v1/": (120, 20.0),
+    }
+    # Max buckets kept by the in-process fallback used while Redis is unreachable
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10_000
+    # Proxies trusted to report the client address (X-Forwarded-For / X-Forwarded-Proto),
+    # comma-separated IPs or networks. Anonymous requests are bucketed per client IP, so behind
+    # a load balancer its address must be listed here, otherwise every login shares one bucket.
+    # "*" trusts any peer: only safe when the app is reachable exclusively through the proxy.
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # --- Response Compression ---
+    COMPRESSION_MINIMUM_SIZE: int = 1024   # bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4    # 4-5 is the usual sweet spot for dynamic responses
+
+    # --- List Result Cache ---
+    # Opt-in cache of rendered list pages in Redis, keyed by user, data version, endpoint and
+    # normalized query params (any committed write of the user invalidates them).
+    LIST_CACHE_ENABLED: bool = False
+    # endpoint: (TTL seconds, highest offset cached; None caches every page)
+    LIST_CACHE_POLICIES: Dict[str, Tuple[int, Optional[int]]] = {
+        "wallets": (300, None),
+        "categories": (600, None),
+        "debts": (120, 100),
+        "budgets": (300, None),
+        "transactions": (60, 40),        # first pages only
+    }
+    LIST_CACHE_MAX_BYTES: int = 256 * 1024  # larger pages are served but not stored
+    # TTL of each user's own categories in Redis (0 disables); system categories are kept
+    # in memory per worker regardless (see app.crud.category)
+    CATEGORY_CACHE_SECONDS: int = 600
+
+    # --- Observability ---
+    # Server-Timing header (auth/db/redis/serialize/total) plus a JSON log line per request.
+    # Off by default: the header exposes internal timings to clients.
+    SERVER_TIMING_ENABLED: bool = False
+    SERVER_TIMING_LOG_MIN_MS: float = 0.0   # only log requests at least this slow (0 logs all)
+    # Prometheus /metrics (multiprocess aggregation under gunicorn: see gunicorn.conf.py);
+    # scraped with the X-Internal-Key header, so it is unreachable while INTERNAL_API_KEY is unset
+    METRICS_ENABLED: bool = True
+    METRICS_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    # Slow-query log (0 disables): statements slower than this are logged; a sampled fraction of
+    # the plain SELECTs is re-run under EXPLAIN (ANALYZE, BUFFERS) and stored in slow_query_plans
+    SLOW_QUERY_THRESHOLD_MS: float = 0.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
+    SLOW_QUERY_PLAN_RETENTION_DAYS: int = 7
+    # Per-request profiles (pyinstrument, optional dependency) written to PROFILE_DIR; taken for
+    # requests sending `X-Profile: 1` with a valid X-Internal-Key, or a PROFILE_SAMPLE_RATE fraction
+    PROFILE_DIR: str = "profiles"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_SECONDS: float = 0.001
+    PROFILE_FORMAT: str = "speedscope"       # or "collapsed" (folded stacks for flamegraph.pl)
+
+    # --- Internal/Admin Settings ---
+    # Shared secret for /internal endpoints (X-Internal-Key header); unset disables them
+    INTERNAL_API_KEY: Optional[str] = None
+
+    # --- Startup Settings ---
+    # Workers apply pending migrations (one SELECT when the schema is current; an advisory
+    # lock serializes concurrent workers). Mock-user seeding runs via `python -m app.initial_data`
+    # (set DB_INIT_ON_STARTUP True for local development/tests only).
+    DB_MIGRATE_ON_STARTUP: bool = True
+    DB_INIT_ON_STARTUP: bool = False
+    # Connections opened concurrently during lifespan so the first requests don't pay the connect cost
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
     
     # --- MOCK & TESTING Settings ---
     MOCK_USER_A_EMAIL: str = "authenticated@finanzio.id"
     MOCK_USER_A_PASSWORD: str = "testpassword123"
-    MOCK_USER_A_PASSWORD_HASH: str = get_password_hash(MOCK_USER_A_PASSWORD)
+    # Hashing depends on PASSWORD_HASH_ROUNDS, so it can no longer happen while Settings is built.
+    MOCK_USER_A_PASSWORD_HASH: Optional[str] = None
     
     class Config:
         # Load environment variables from a .env file if available
@@ -0,0 +1,146 @@
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from typing import Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+# Read-your-writes for replica routing: after a user's write commits on the primary, their
+# reads stay on the primary for REPLICA_READ_YOUR_WRITES_SECONDS (longer than replica lag).
+LAST_WRITE_KEY_PREFIX = "lastwrite:"
+# Per-user data version, bumped on every committed write; read endpoints derive ETags from it.
+# A hash: "n" counts writes, "epoch" is random and set whenever the key is (re)created, so a
+# key lost to eviction, FLUSHDB or its TTL never repeats a version already handed out. The TTL
+# (refreshed by every bump) also bounds how long a bump lost with a crashed worker can go unseen.
+DATA_VERSION_KEY_PREFIX = "dataver:"
+
+# Same-worker fast path (and cover for the moment before the Redis marker lands). Every mark
+# lasts REPLICA_READ_YOUR_WRITES_SECONDS and a new write moves it to the end, so the dict is
+# ordered by deadline and expired marks are dropped from the front on each write
+_local_marks: "OrderedDict[str, float]" = OrderedDict()
+_background_tasks: Set[asyncio.Task] = set()
+# Users whose data-version bump has not reached Redis yet (retried in the background);
+# until it lands their version is unknown here, so no ETag/304 is based on it
+_pending_bumps: Set[str] = set()
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+def _queue_bump(pipe, user_id: str) -> None:
+    key = f"{DATA_VERSION_KEY_PREFIX}{user_id}"
+    pipe.hincrby(key, "n", 1)
+    pipe.expire(key, settings.DATA_VERSION_TTL_SECONDS)
+
+async def _retry_bump(user_id: str) -> None:
+    delay = 0.5
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                _queue_bump(pipe, user_id)
+                await pipe.execute()
+        except Exception:
+            delay = min(delay * 2, 30.0)
+            continue
+        _pending_bumps.discard(user_id)
+        return
+
+async def _publish_write_mark(user_id: str) -> None:
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(
+                f"{LAST_WRITE_KEY_PREFIX}{user_id}", "1",
+                px=int(settings.REPLICA_READ_YOUR_WRITES_SECONDS * 1000),
+            )
+            _queue_bump(pipe, user_id)
+            await pipe.execute()
+    except Exception as exc:
+        print(f"Failed to record write marker for {user_id}: {exc}")
+        if user_id not in _pending_bumps:
+            _pending_bumps.add(user_id)
+            _spawn(_retry_bump(user_id))
+
+def note_user_write(user_id: UUID) -> asyncio.Task:
+    """
+    Records that user_id just committed a write. Safe to call from sync session events;
+    returns the task publishing the marker and data-version bump to Redis.
+    """
+    key = str(user_id)
+    now = time.monotonic()
+    _local_marks.pop(key, None)
+    _local_marks[key] = now + settings.REPLICA_READ_YOUR_WRITES_SECONDS
+    _prune_local_marks(now)
+
+    return _spawn(_publish_write_mark(key))
+
+async def get_data_version(user_id: str) -> Optional[str]:
+    """
+    Current data version of the user ("<epoch>.<n>"), or None when it is unknown: Redis is
+    unavailable or this worker still owes Redis a bump for the user.
+    """
+    if user_id in _pending_bumps:
+        return None
+    key = f"{DATA_VERSION_KEY_PREFIX}{user_id}"
+    try:
+        epoch, n = await redis_client.hmget(key, "epoch", "n")
+        if epoch is None:
+            # New (or recreated) key: start a new epoch; HSETNX makes concurrent readers agree
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hsetnx(key, "epoch", secrets.token_hex(8))
+                pipe.expire(key, settings.DATA_VERSION_TTL_SECONDS)
+                pipe.hmget(key, "epoch", "n")
+                *_, (epoch, n) = await pipe.execute()
+        return f"{epoch}.{n or 0}"
+    except Exception:
+        return None
+
+def _prune_local_marks(now: float) -> None:
+    while _local_marks:
+        user_id, deadline = next(iter(_local_marks.items()))
+        if deadline > now:
+            return
+        del _local_marks[user_id]
+
+async def recently_wrote(user_id: str) -> bool:
+    """True if the user's reads must go to the primary to observe their own writes."""
+    deadline = _local_marks.get(user_id)
+    if deadline is not None:
+        if deadline > time.monotonic():
+            return True
+        _local_marks.pop(user_id, None)
+
+    try:
+        return bool(await redis_client.exists(f"{LAST_WRITE_KEY_PREFIX}{user_id}"))
+    except Exception:
+        # Without the marker we cannot prove the replica is safe; use the primary
+        return True
+
+# --- Session Events (write detection) ---
+# get_current_user stores the user id in session.info["user_id"]; any flush or DML
+# executed through the session flags it as a writer, and a commit then records the mark.
+# The publishing task is kept in session.info["write_marks"] so the request can wait for it
+# before responding (see ReleaseSessionRoute): a client that immediately re-reads must not
+# be answered 304 against the pre-write data version.
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session):
+    if session.info.pop("wrote", False) and session.info.get("user_id"):
+        session.info.setdefault("write_marks", []).append(note_user_write(session.info["user_id"]))
@@ -1,18 +1,50 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
 from sqlalchemy.future import select
-from uuid import UUID 
 
 # Import dependencies for user seeding
 from app.core.config import settings, MOCK_USER_A_ID
-from app.core.base import Base 
+from app.core.pool_stats import InstrumentedAsyncQueuePool
+from app.core.migrations import run_migrations
+from app.core import consistency # noqa: F401  (registers write-tracking session events)
+from app.core import user_cache # noqa: F401  (registers user cache invalidation events)
 from app.models.user import User # Import User model
-from app.models.category import Category, TransactionType # Import Category model
-from app.crud.user import get_password_hash # Import password hashing utility
+from app.core.hashing import hash_password, check_password # Pooled password hashing
 
 # --- Database Setup ---
-engine = create_async_engine(settings.DATABASE_URL, future=True, echo=False)
+
+def pool_sizing() -> Tuple[int, int]:
+    """Returns (pool_size, max_overflow) for this worker, derived from the connection budget unless set explicitly."""
+    per_worker = max(settings.DB_MAX_CONNECTIONS // max(settings.WEB_CONCURRENCY, 1), 2)
+    pool_size = settings.DB_POOL_SIZE or max(per_worker * 2 // 3, 1)
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else max(per_worker - pool_size, 0)
+    return pool_size, max_overflow
+
+def create_engine_for(url: str) -> AsyncEngine:
+    """Creates an async engine with the configured pool settings and checkout instrumentation."""
+    pool_size, max_overflow = pool_sizing()
+    db_url = make_url(url).update_query_dict(
+        {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+    )
+    return create_async_engine(
+        db_url,
+        future=True,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+engine = create_engine_for(settings.DATABASE_URL)
+# Tanpa replica, read engine adalah primary engine itu sendiri (satu pool saja)
+read_engine = create_engine_for(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else engine
 
 # NOTE: Mengubah AsyncSessionLocal menjadi async_sessionmaker (best practice modern)
 AsyncSessionLocal = async_sessionmaker(
@@ -21,25 +53,84 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# --- Lazy Session ---
+
+class LazySession:
+    """
+    Stand-in for AsyncSession handed to endpoints. The real session (and with it a
+    pooled connection) is only created on first use, so requests served from cache
+    never touch the pool; release() hands the connection back as soon as the
+    endpoint's DB work is done. Any later use transparently opens a new session.
+    """
+
+    def __init__(self, factory: async_sessionmaker):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+        self._info: Dict[str, Any] = {}
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        # Writable before the session exists (e.g. user_id from get_current_user)
+        return self._session.info if self._session is not None else self._info
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    def _get_session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+            self._session.info.update(self._info)
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self._get_session(), name)
+
+    async def release(self) -> None:
+        """Closes the underlying session (rolling back anything uncommitted) if one was opened."""
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        self._info = dict(session.info)
+        await session.close()
+
 # --- Dependency Injection Functions ---
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Provides a transactional database session for endpoints."""
+    """Provides a transactional database session for endpoints (opened on first use)."""
     # Koneksi yang digunakan oleh endpoints API
-    async with AsyncSessionLocal() as session:
+    session = LazySession(AsyncSessionLocal)
+    try:
         yield session
+    finally:
+        await session.release()
+
+async def warm_up_pool():
+    """
+    Opens DB_POOL_WARMUP_CONNECTIONS connections concurrently and returns them to the pool,
+    so a freshly booted worker does not pay connection setup on its first requests.
+    """
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
 
-# Function to initialize database tables AND seed mock data
+    await asyncio.gather(*(_ping() for _ in range(settings.DB_POOL_WARMUP_CONNECTIONS)))
+
+# Function to migrate the schema AND seed mock data.
+# NOTE: Dijalankan sekali via `python -m app.initial_data`, bukan di setiap worker boot.
 async def init_db():
-    """Initializes the database by creating all defined tables and seeding mock user data."""
+    """Applies pending schema migrations (including system categories) and seeds the mock user."""
     
-    # 1. Block DDL (Create Tables)
-    async with engine.begin() as conn:
-        print("Initializing database...")
-        await conn.run_sync(Base.metadata.create_all)
-        print("Database structure created.")
+    # 1. Schema + system categories (versioned, advisory-locked; no-op when current)
+    print("Initializing database...")
+    await run_migrations(engine)
 
-    # 2. Block DML (Seeding) - Menggunakan koneksi langsung yang aman
-    # Kita menggunakan koneksi baru dari engine untuk isolasi
+    # 2. Block DML (Seeding mock user) - Menggunakan koneksi langsung yang aman
     async with engine.begin() as conn:
         # Gunakan AsyncSession yang terikat pada transaksi koneksi ini (conn)
         session = AsyncSession(bind=conn)
@@ -51,17 +142,13 @@ async def init_db():
         )
         existing_user = user_result.scalars().first()
         
-        # Gunakan password hash yang benar
-        hashed_password = get_password_hash(settings.MOCK_USER_A_PASSWORD)
-        
         if not existing_user:
             print(f"Seeding mock user: {mock_user_id}")
             
             mock_user = User(
                 user_id=mock_user_id,
                 email=settings.MOCK_USER_A_EMAIL,
-                # Menggunakan password hash yang benar dari settings
-                password_hash=hashed_password, 
+                password_hash=await hash_password(settings.MOCK_USER_A_PASSWORD), 
                 is_active=True
             )
             session.add(mock_user)
@@ -69,36 +156,18 @@ async def init_db():
         
         # --- Update User/Password Hash jika sudah ada (untuk testing) ---
         else:
-            if existing_user.password_hash != hashed_password:
+            # Hash yang di-salt tidak pernah sama, jadi verifikasi (bukan bandingkan string)
+            is_valid, new_hash = await check_password(settings.MOCK_USER_A_PASSWORD, existing_user.password_hash)
+            if not is_valid or new_hash:
                 print("Updating mock user's password hash in DB.")
-                existing_user.password_hash = hashed_password
+                existing_user.password_hash = new_hash or await hash_password(settings.MOCK_USER_A_PASSWORD)
                 existing_user.email = settings.MOCK_USER_A_EMAIL
                 session.add(existing_user)
                 print("Mock user password updated.")
             else:
                 print("Mock user already exists. Skipping seed.")
-
-        # --- Seed System Categories (untuk Transfer Logic) ---
-        transfer_categories = [
-            (UUID('ffffffff-0000-0000-0000-000000000001'), "Transfer In", TransactionType.INCOME),
-            (UUID('ffffffff-0000-0000-0000-000000000002'), "Transfer Out", TransactionType.EXPENSE)
-        ]
-
-        for id, name, type in transfer_categories:
-            cat_exists = await session.execute(select(Category.category_id).where(Category.category_id == id))
-            if not cat_exists.scalar_one_or_none():
-                system_cat = Category(
-                    category_id=id,
-                    user_id=None, # System Category
-                    category_name=name,
-                    type=type
-                )
-                session.add(system_cat)
         
         # Session commit dilakukan, dan transaksi di-commit oleh engine.begin()
         await session.commit()
-        print("System transfer categories ensured.")
-        
-        # Session ditutup secara otomatis saat keluar dari context manager
 
     print("Database initialization complete.")
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTED
+
+T = TypeVar("T")
+
+@lru_cache
+def get_pwd_context() -> CryptContext:
+    """
+    Built on first use, not at import: workers that never hash skip the setup.
+    min_rounds == max_rounds == default_rounds: setiap hash dengan cost berbeda
+    dari konfigurasi dianggap "needs update" sehingga di-rehash saat login.
+    """
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+class PasswordHashPoolSaturated(Exception):
+    """Raised when too many hashing jobs are already queued on this worker."""
+
+# --- Synchronous Primitives (CPU-bound, never call directly from the event loop) ---
+
+def _truncate(password: str) -> bytes:
+    return password.encode('utf-8')[:72]
+
+def get_password_hash(password: str) -> str:
+    """Securely hashes the provided password."""
+    return get_pwd_context().hash(_truncate(password))
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a plain password against the stored hash."""
+    return get_pwd_context().verify(_truncate(plain_password), hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, if the stored hash uses an outdated cost,
+    returns a replacement hash computed with the current settings.
+    """
+    return get_pwd_context().verify_and_update(_truncate(plain_password), hashed_password)
+
+# --- Bounded Thread Pool ---
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending_jobs = 0
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _executor
+
+async def _run_in_pool(func: Callable[..., T], *args) -> T:
+    """
+    Runs a hashing primitive in the dedicated pool. The pending counter is only
+    touched from the event loop thread, so no lock is needed.
+    """
+    global _pending_jobs
+    if _pending_jobs >= settings.PASSWORD_HASH_MAX_PENDING:
+        PASSWORD_HASH_REJECTED.inc()
+        raise PasswordHashPoolSaturated()
+
+    _pending_jobs += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _pending_jobs -= 1
+        PASSWORD_HASH_DURATION.labels(func.__name__).observe(time.perf_counter() - started)
+
+async def hash_password(password: str) -> str:
+    """Hashes a password off the event loop."""
+    return await _run_in_pool(get_password_hash, password)
+
+async def check_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verifies a password off the event loop. Returns (is_valid, new_hash_or_None)."""
+    return await _run_in_pool(verify_and_update_password, plain_password, hashed_password)
+
+def shutdown_hash_pool() -> None:
+    """Stops the hashing pool (called from the application lifespan)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
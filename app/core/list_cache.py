@@ -0,0 +1,74 @@
+import hashlib
+import uuid
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.consistency import get_data_version
+from app.core.metrics import CACHE_REQUESTS
+from app.core.redis import cache_get, cache_set
+
+# Opt-in (LIST_CACHE_ENABLED) cache of rendered list pages. Keys embed the user's data version
+# (see app.core.consistency), so the bump that follows every committed write invalidates all of
+# the user's cached pages at once; superseded entries are never read again and expire by TTL.
+# Without Redis the data version is unknown and lists are served from the database.
+
+LIST_CACHE_KEY_PREFIX = "listcache:"
+
+def cache_key(user_id: uuid.UUID, data_version: str, name: str, params: dict) -> str:
+    """listcache:<user>:<version>:<endpoint>:<digest of the normalized params>."""
+    query = "&".join(f"{k}={'' if v is None else v}" for k, v in sorted(params.items()))
+    digest = hashlib.sha256(query.encode()).hexdigest()[:24]
+    return f"{LIST_CACHE_KEY_PREFIX}{user_id}:{data_version}:{name}:{digest}"
+
+def _cacheable(name: str, params: dict) -> bool:
+    policy = settings.LIST_CACHE_POLICIES.get(name)
+    if not settings.LIST_CACHE_ENABLED or policy is None:
+        return False
+    # Deep pages are rarely requested twice; caching them only churns Redis memory
+    max_offset = policy[1]
+    return max_offset is None or params.get("offset", 0) <= max_offset
+
+def _respond(body: bytes, response: Response) -> Response:
+    # A returned Response skips FastAPI's header merge; carry over what dependencies set (ETag)
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def cached_list(
+    request: Request,
+    response: Response,
+    user_id: uuid.UUID,
+    name: str,
+    load: Callable[[], Awaitable[BaseModel]],
+    **params: Any,
+) -> Any:
+    """
+    Serves the `name` list page for params from the cache, or runs load() and caches its
+    rendered body. Returns load()'s payload unchanged when the endpoint is not cached.
+    """
+    if not _cacheable(name, params):
+        return await load()
+
+    # check_etag (ETAG route dependency) has already fetched the version for this request
+    if hasattr(request.state, "data_version"):
+        data_version = request.state.data_version
+    else:
+        data_version = await get_data_version(str(user_id))
+    if data_version is None:
+        CACHE_REQUESTS.labels(f"list_{name}", "bypass").inc()
+        return await load()
+
+    key = cache_key(user_id, data_version, name, params)
+    cached = await cache_get(key)
+    if cached is not None:
+        CACHE_REQUESTS.labels(f"list_{name}", "hit").inc()
+        return _respond(cached.encode(), response)
+
+    CACHE_REQUESTS.labels(f"list_{name}", "miss").inc()
+    payload = await load()
+    body = payload.__pydantic_serializer__.to_json(payload)
+    if len(body) <= settings.LIST_CACHE_MAX_BYTES:
+        await cache_set(key, body, ex=settings.LIST_CACHE_POLICIES[name][0])
+    return _respond(body, response)
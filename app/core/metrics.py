@@ -0,0 +1,141 @@
+import asyncio
+import os
+import time
+from typing import Dict, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import REGISTRY, multiprocess
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.routing import replace_params
+
+from app.core.config import settings
+
+# Prometheus metrics. Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+# (set in gunicorn.conf.py, before prometheus_client is imported) and /metrics aggregates the
+# files of all workers, so any worker can answer a scrape. Without the variable (single uvicorn
+# process, tests) the default in-process registry is used.
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# --- HTTP ---
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being handled.", multiprocess_mode="livesum"
+)
+
+# --- DB pool ---
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size.", ["pool"], multiprocess_mode="livesum")
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections checked out.", ["pool"], multiprocess_mode="livesum")
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to obtain a pooled connection.", ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that hit DB_POOL_TIMEOUT.", ["pool"])
+
+# --- Caches ---
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result (hit/miss).", ["cache", "result"])
+
+# --- Password hashing ---
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "Hash/verify latency including queueing in the hash pool.", ["op"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+PASSWORD_HASH_REJECTED = Counter("password_hash_rejected_total", "Hash jobs shed because the pool was saturated.")
+
+# --- Event loop ---
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay of a scheduled wake-up beyond its due time.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+def render_latest() -> bytes:
+    """Text exposition of all metrics (of every worker in multiprocess mode)."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+# --- Instrumentation ---
+
+def instrument_pool(async_engine: AsyncEngine, name: str) -> None:
+    pool = async_engine.sync_engine.pool
+    in_use = DB_POOL_IN_USE.labels(name)
+    event.listen(pool, "checkout", lambda *args: in_use.inc())
+    event.listen(pool, "checkin", lambda *args: in_use.dec())
+    DB_POOL_SIZE.labels(name).set(pool.size())
+    pool.stats.on_wait = DB_POOL_WAIT.labels(name).observe
+    pool.stats.on_timeout = DB_POOL_TIMEOUTS.labels(name).inc
+
+def route_template(scope) -> str:
+    """
+    Template of the matched route as requested, e.g. /api/v1/wallets/{wallet_id}; raw paths would
+    blow up label cardinality. scope["route"] is the route as declared on its router, without the
+    include_router() prefixes (FastAPI includes routers lazily), so the template is anchored at
+    the end of the request path instead: what precedes the filled-in route path is the prefix
+    (router prefixes and root_path).
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    root_path = scope.get("root_path", "")
+    if not path.startswith(root_path):
+        path = root_path + path
+    try:
+        concrete, _ = replace_params(route.path_format, route.param_convertors, dict(scope.get("path_params", {})))
+    except (AttributeError, KeyError, TypeError, ValueError, AssertionError):
+        return template
+    if not concrete or not path.endswith(concrete):
+        return template
+    return path[:len(path) - len(concrete)] + template
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request count, latency and in-flight requests per route template."""
+
+    def __init__(self, app):
+        self.app = app
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            key = (scope["method"], route_template(scope))
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = HTTP_LATENCY.labels(*key)
+            latency.observe(elapsed)
+            HTTP_REQUESTS.labels(key[0], key[1], str(status_code)).inc()
+
+async def run_loop_lag_monitor() -> None:
+    """Background loop started from the application lifespan; samples how late the event loop wakes up."""
+    interval = settings.METRICS_LOOP_LAG_INTERVAL_SECONDS
+    while True:
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(time.perf_counter() - due, 0.0))
@@ -0,0 +1,77 @@
+import importlib
+import pkgutil
+from types import ModuleType
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import app.migrations as migrations_package
+
+# Arbitrary app-wide key for pg_advisory_xact_lock; only the holder applies migrations
+MIGRATION_LOCK_KEY = 4_726_371_001
+
+CREATE_SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+)
+"""
+
+CURRENT_VERSION_QUERY = "SELECT coalesce(max(version), 0) FROM schema_version"
+
+def load_migrations() -> List[ModuleType]:
+    """Imports every vNNNN_* module in app.migrations, ordered by VERSION (which must be 1..N without gaps)."""
+    modules = [
+        importlib.import_module(f"{migrations_package.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(migrations_package.__path__)
+        if info.name.startswith("v")
+    ]
+    modules.sort(key=lambda module: module.VERSION)
+
+    versions = [module.VERSION for module in modules]
+    if versions != list(range(1, len(modules) + 1)):
+        raise RuntimeError(f"Migration versions must be contiguous from 1, found {versions}")
+    return modules
+
+MIGRATIONS = load_migrations()
+LATEST_VERSION = MIGRATIONS[-1].VERSION if MIGRATIONS else 0
+
+async def get_schema_version(engine: AsyncEngine) -> int:
+    """Applied schema version, or 0 on a database that has never been migrated."""
+    async with engine.connect() as conn:
+        try:
+            return (await conn.execute(text(CURRENT_VERSION_QUERY))).scalar_one()
+        except DBAPIError:
+            # schema_version does not exist yet
+            return 0
+
+async def run_migrations(engine: AsyncEngine) -> int:
+    """
+    Brings the schema to LATEST_VERSION and returns it.
+
+    Fast path: when the schema is current this costs a single SELECT. Otherwise all
+    pending migrations run in one transaction under a transaction-scoped advisory
+    lock; concurrent workers block on the lock, then find nothing left to apply.
+    """
+    if await get_schema_version(engine) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        await conn.execute(text(CREATE_SCHEMA_VERSION_TABLE))
+
+        # Re-read under the lock: another process may have migrated while we waited
+        current = (await conn.execute(text(CURRENT_VERSION_QUERY))).scalar_one()
+        for migration in MIGRATIONS[current:]:
+            print(f"Applying migration {migration.VERSION}: {migration.DESCRIPTION}")
+            await migration.upgrade(conn)
+            await conn.execute(
+                text("INSERT INTO schema_version (version, description) VALUES (:version, :description)"),
+                {"version": migration.VERSION, "description": migration.DESCRIPTION},
+            )
+
+    print(f"Database schema is at version {LATEST_VERSION}.")
+    return LATEST_VERSION
@@ -0,0 +1,122 @@
+import asyncio
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.redis import redis_client
+from app.models.outbox import OutboxEvent
+
+# Single relay cluster-wide, so events are stamped and published in feed order. A session-level
+# advisory lock, held by the relay's own connection from stamping until the batch is deleted
+# (a transaction-level lock would be released by the commit that precedes the publish).
+RELAY_LOCK_KEY = 4_726_371_003
+
+# outbox_events.version is drawn at INSERT time, and writers commit in any order: a lower
+# version can become visible after higher ones were already published. Feed versions are
+# therefore assigned here, to events that are already committed: a block of the sequence is
+# reserved (contiguous, as only the lock holder draws from it) and handed out in change
+# version order, so two changes of one entity in the same batch keep their order.
+STAMP_BATCH_SQL = text("""
+WITH candidates AS (
+    SELECT version FROM outbox_events
+    WHERE relay_version IS NULL
+    ORDER BY version
+    LIMIT :batch_size
+    FOR UPDATE
+), numbered AS (
+    SELECT version, row_number() OVER (ORDER BY version) AS n FROM candidates
+), base AS (
+    SELECT setval('outbox_relay_seq', nextval('outbox_relay_seq') + count(*) - 1) - count(*) AS value
+    FROM candidates
+    HAVING count(*) > 0
+)
+UPDATE outbox_events e SET relay_version = base.value + numbered.n
+FROM numbered, base
+WHERE e.version = numbered.version
+""")
+
+def _stream_fields(event: OutboxEvent) -> dict:
+    return {
+        "version": event.relay_version,
+        "entity": event.entity,
+        "id": str(event.entity_id),
+        "user": str(event.user_id) if event.user_id else "",
+        "op": event.op,
+    }
+
+async def _stamped_events(db: AsyncSession):
+    return (await db.execute(
+        select(OutboxEvent)
+        .where(OutboxEvent.relay_version.is_not(None))
+        .order_by(OutboxEvent.relay_version)
+        .limit(settings.OUTBOX_RELAY_BATCH_SIZE)
+    )).scalars().all()
+
+async def relay_outbox_batch(db: AsyncSession) -> int:
+    """
+    Publishes up to OUTBOX_RELAY_BATCH_SIZE events to the Redis stream in one pipeline:
+    under the relay lock, committed events are stamped with the next feed versions (the
+    stamp is committed), then published in that order and deleted.
+
+    A batch stamped earlier but not deleted (publish or delete failed) is published again
+    with the same versions before anything new is stamped, so each version first reaches
+    the stream in increasing order. Delivery is at-least-once: consumers drop any version
+    at or below the last one they processed.
+
+    db must stay on one connection across commits (see run_outbox_relay): the lock is held
+    by that connection and released before returning.
+    """
+    got_lock = (await db.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": RELAY_LOCK_KEY})).scalar()
+    if not got_lock:
+        await db.rollback()
+        return 0
+
+    try:
+        return await _relay_locked(db)
+    finally:
+        # A failed step leaves its transaction aborted; end it so the unlock can run
+        await db.rollback()
+        await db.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": RELAY_LOCK_KEY})
+        await db.commit()
+
+async def _relay_locked(db: AsyncSession) -> int:
+    events = await _stamped_events(db)
+    if not events:
+        await db.execute(STAMP_BATCH_SQL, {"batch_size": settings.OUTBOX_RELAY_BATCH_SIZE})
+        events = await _stamped_events(db)
+    await db.commit()
+    if not events:
+        return 0
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for event in events:
+            pipe.xadd(settings.OUTBOX_STREAM_KEY, _stream_fields(event), maxlen=settings.OUTBOX_STREAM_MAXLEN, approximate=True)
+        await pipe.execute()
+
+    await db.execute(delete(OutboxEvent).where(OutboxEvent.relay_version.in_([event.relay_version for event in events])))
+    await db.commit()
+    return len(events)
+
+async def run_outbox_relay() -> None:
+    """Background loop started from the application lifespan; drains full batches back to back."""
+    while True:
+        published = 0
+        try:
+            # One connection per round: the session-level relay lock lives on it
+            async with engine.connect() as conn:
+                try:
+                    async with AsyncSession(bind=conn, expire_on_commit=False) as db:
+                        published = await relay_outbox_batch(db)
+                except BaseException:
+                    # The unlock may not have run: never hand a connection holding the lock back to the pool
+                    await conn.invalidate()
+                    raise
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Events stay in the outbox and are retried next round
+            print(f"Outbox relay failed: {exc}")
+        if published < settings.OUTBOX_RELAY_BATCH_SIZE:
+            await asyncio.sleep(settings.OUTBOX_RELAY_INTERVAL_SECONDS)
@@ -0,0 +1,82 @@
+import bisect
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds (ms) of the connection-acquire histogram buckets; the last bucket is +Inf
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class PoolStats:
+    """Counters and a wait-time histogram for connection checkouts on one pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        # Optional exporters (see app.core.metrics.instrument_pool)
+        self.on_wait: Optional[Callable[[float], None]] = None
+        self.on_timeout: Optional[Callable[[], None]] = None
+
+    def record_wait(self, seconds: float) -> None:
+        wait_ms = seconds * 1000
+        self.checkouts += 1
+        self.wait_sum_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.bucket_counts[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+        if self.on_wait is not None:
+            self.on_wait(seconds)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+        if self.on_timeout is not None:
+            self.on_timeout()
+
+    def as_dict(self) -> Dict[str, Any]:
+        # Cumulative buckets (Prometheus style): count of waits <= each bound
+        cumulative, running = {}, 0
+        for bound, count in zip(list(WAIT_BUCKETS_MS) + ["+Inf"], self.bucket_counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {
+            "checkouts_total": self.checkouts,
+            "timeouts_total": self.timeouts,
+            "wait_ms_sum": round(self.wait_sum_ms, 3),
+            "wait_ms_max": round(self.wait_max_ms, 3),
+            "wait_ms_buckets": cumulative,
+        }
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout, including time spent queued
+    behind other requests when the pool and its overflow are exhausted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except sa_exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return conn
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current occupancy plus accumulated checkout statistics."""
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            # overflow() starts at -pool_size; only connections beyond pool_size count
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            **self.stats.as_dict(),
+        }
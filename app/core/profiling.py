@@ -0,0 +1,114 @@
+import asyncio
+import hmac
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # optional dependency: profiling is simply unavailable
+    Profiler = None
+
+from app.core.config import settings
+
+# On-demand request profiling with pyinstrument (statistical, async-aware: only the profiled
+# request's task is attributed, even with other requests interleaved on the loop). A request
+# is profiled when it carries `X-Profile: 1` plus a valid X-Internal-Key, or for a
+# PROFILE_SAMPLE_RATE fraction of traffic. One profile at a time per worker.
+
+def is_available() -> bool:
+    return Profiler is not None
+
+def collapsed_stacks(root) -> List[str]:
+    """Brendan Gregg's folded format ("a;b;c <microseconds>"), for flamegraph.pl or speedscope."""
+    lines = []
+
+    def walk(frame, prefix: str):
+        name = f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+        path = f"{prefix};{name}" if prefix else name
+        self_time = frame.time - sum(child.time for child in frame.children)
+        if self_time > 0:
+            lines.append(f"{path} {int(self_time * 1_000_000)}")
+        for child in frame.children:
+            walk(child, path)
+
+    if root is not None:
+        walk(root, "")
+    return lines
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_") or "root"
+
+def profile_filename(method: str, route: str, duration_ms: float, fmt: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    extension = "speedscope.json" if fmt == "speedscope" else "collapsed.txt"
+    return f"{stamp}_{method}_{_slug(route)}_{duration_ms:.0f}ms.{extension}"
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fh:
+        fh.write(content)
+
+class ProfilerMiddleware:
+    """Pure ASGI middleware wrapping selected requests in a pyinstrument Profiler."""
+
+    def __init__(self, app):
+        self.app = app
+        self._active = False
+
+    @staticmethod
+    def _requested(scope) -> bool:
+        if not settings.INTERNAL_API_KEY:
+            return False
+        wants, key = False, None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-profile":
+                wants = value in (b"1", b"true")
+            elif name == b"x-internal-key":
+                key = value.decode("latin-1")
+        return wants and key is not None and hmac.compare_digest(key, settings.INTERNAL_API_KEY)
+
+    def _should_profile(self, scope) -> bool:
+        if self._active:
+            return False
+        return self._requested(scope) or (
+            settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        profiler = Profiler(interval=settings.PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            self._active = False
+            duration_ms = (time.perf_counter() - started) * 1000
+            route = getattr(scope.get("route"), "path", scope["path"])
+            await self._save(profiler, scope["method"], route, duration_ms)
+
+    async def _save(self, profiler, method: str, route: str, duration_ms: float) -> Optional[str]:
+        fmt = settings.PROFILE_FORMAT
+        try:
+            if fmt == "collapsed":
+                content = "\n".join(collapsed_stacks(profiler.last_session.root_frame())) + "\n"
+            else:
+                content = profiler.output(SpeedscopeRenderer())
+            path = os.path.join(settings.PROFILE_DIR, profile_filename(method, route, duration_ms, fmt))
+            # The response is already sent; keep the file write off the event loop anyway
+            await asyncio.to_thread(_write, path, content)
+        except Exception as exc:
+            print(f"Failed to write request profile: {exc}")
+            return None
+        print(f"Request profile written to {path}")
+        return path
@@ -0,0 +1,164 @@
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.security import decode_token
+
+# Token bucket evaluated atomically in Redis. Uses the Redis clock so all workers
+# agree on elapsed time. Returns {allowed, tokens_left (as string, keeps fractions)}.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+class Policy:
+    """A token bucket definition parsed from a RATE_LIMIT_POLICIES entry."""
+    __slots__ = ("name", "method", "prefix", "capacity", "rate")
+
+    def __init__(self, name: str, capacity: int, rate: float):
+        method, _, prefix = name.rpartition(" ")
+        self.name = name
+        self.method = method.upper() or None
+        self.prefix = prefix
+        self.capacity = capacity
+        self.rate = rate
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method is None or self.method == method) and path.startswith(self.prefix)
+
+def _load_policies() -> List[Policy]:
+    policies = [Policy(name, int(capacity), float(rate)) for name, (capacity, rate) in settings.RATE_LIMIT_POLICIES.items()]
+    # Most specific first: longest prefix, then method-bound before method-agnostic
+    return sorted(policies, key=lambda p: (len(p.prefix), p.method is not None), reverse=True)
+
+class LocalTokenBuckets:
+    """
+    In-process fallback used while Redis is unreachable. Limits become per worker
+    (so effectively multiplied by the worker count), which beats failing open entirely.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, capacity: int, rate: float, cost: int = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, ts = self._buckets.pop(key, (float(capacity), now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, tokens
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware applying per-user (authenticated) or per-IP token buckets
+    according to RATE_LIMIT_POLICIES, and emitting RateLimit-* response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.policies = _load_policies()
+        self.local = LocalTokenBuckets(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+        self._script = redis_client.register_script(TOKEN_BUCKET_LUA)
+
+    def _match(self, method: str, path: str) -> Optional[Policy]:
+        for policy in self.policies:
+            if policy.matches(method, path):
+                return policy
+        return None
+
+    @staticmethod
+    def _identity(scope) -> str:
+        """user:<sub> for valid bearer tokens, else ip:<client> (set from trusted proxy headers, see FORWARDED_ALLOW_IPS)."""
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer":
+                    payload = decode_token(token)
+                    if payload:
+                        return f"user:{payload['sub']}"
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def _take(self, key: str, policy: Policy) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = await self._script(keys=[key], args=[policy.capacity, policy.rate, 1])
+            return bool(int(allowed)), float(tokens)
+        except Exception:
+            return self.local.take(key, policy.capacity, policy.rate)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        policy = self._match(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = f"ratelimit:{policy.name}:{self._identity(scope)}"
+        allowed, tokens = await self._take(key, policy)
+
+        remaining = max(int(tokens), 0)
+        reset = math.ceil((policy.capacity - tokens) / policy.rate)
+        headers = [
+            (b"ratelimit-limit", str(policy.capacity).encode()),
+            (b"ratelimit-remaining", str(remaining).encode()),
+            (b"ratelimit-reset", str(reset).encode()),
+            (b"ratelimit-policy", f"{policy.capacity};w={math.ceil(policy.capacity / policy.rate)}".encode()),
+        ]
+
+        if not allowed:
+            retry_after = math.ceil((1 - tokens) / policy.rate)
+            body = json.dumps({"detail": "Too many requests. Please slow down."}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"retry-after", str(retry_after).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,17 +1,186 @@
 # app/core/redis.py
+import asyncio
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError, TimeoutError as RedisTimeoutError
+
 from app.core.config import settings # Assuming you store REDIS_URL here
 
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Redis is a cache and coordination aid, never the source of truth: a slow or unreachable
+# Redis must cost latency, not availability. Hence explicit pool/socket timeouts and a
+# circuit breaker that fails commands fast while Redis is known to be down.
+
+class RedisUnavailable(RedisConnectionError):
+    """Raised without any I/O while the circuit breaker is open."""
+
+# Errors that say "Redis is unreachable/slow" (ResponseError & co. mean it is up)
+_OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError, asyncio.TimeoutError, OSError)
+_CACHE_ERRORS = (RedisError, asyncio.TimeoutError, OSError)
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures; while open, calls fail fast.
+    After `reset_seconds` a single probe call is let through (half-open): success
+    closes the circuit, failure re-opens it for another `reset_seconds`.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self._probing else "open"
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if not self._probing and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            print("Redis reachable again; circuit breaker closed.")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def end_probe(self) -> None:
+        """Lets the next call probe again, e.g. when a probe ended without a verdict."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            if self.opened_at is None:
+                print(f"Redis failing ({self.failures} consecutive errors); circuit breaker opened.")
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+async def _guarded(breaker: CircuitBreaker, call, *args, **kwargs):
+    if not breaker.allow():
+        raise RedisUnavailable("Redis circuit breaker is open")
+    probe = breaker.state == "half-open"
+    try:
+        result = await call(*args, **kwargs)
+    except _OUTAGE_ERRORS:
+        breaker.record_failure()
+        raise
+    except RedisError:
+        # Redis replied (ResponseError & co.), so it is reachable
+        breaker.record_success()
+        raise
+    except asyncio.CancelledError:
+        # No reply before cancellation: counts like a timeout
+        breaker.record_failure()
+        raise
+    else:
+        breaker.record_success()
+        return result
+    finally:
+        # Any other outcome (e.g. a bug in the caller's arguments) must not leave the probe in flight
+        if probe:
+            breaker.end_probe()
+
+class ResilientPipeline(Pipeline):
+    breaker: CircuitBreaker
+
+    async def execute(self, raise_on_error: bool = True):
+        return await _guarded(self.breaker, super().execute, raise_on_error)
+
+class ResilientRedis(redis.Redis):
+    """redis.asyncio.Redis whose commands, scripts and pipelines go through a CircuitBreaker."""
+
+    def __init__(self, *args, breaker: CircuitBreaker, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = breaker
+
+    async def execute_command(self, *args, **options):
+        return await _guarded(self.breaker, super().execute_command, *args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> ResilientPipeline:
+        pipe = ResilientPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+        pipe.breaker = self.breaker
+        return pipe
+
+def create_redis_client() -> ResilientRedis:
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        # Waiting longer than this for a free connection counts as an outage
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+        health_check_interval=30,
+        decode_responses=True,
+    )
+    breaker = CircuitBreaker(settings.REDIS_BREAKER_FAILURE_THRESHOLD, settings.REDIS_BREAKER_RESET_SECONDS)
+    return ResilientRedis(connection_pool=pool, breaker=breaker)
+
+redis_client = create_redis_client()
 
 async def get_redis_client():
     """Dependency to get the Redis client."""
     return redis_client
 
-# Example use in an endpoint:
-# @router.get("/dashboard/")
-# async def get_dashboard_data(r: redis.Redis = Depends(get_redis_client)):
-#     cached_data = await r.get("dashboard_data:user_id")
-#     if cached_data:
-#         return json.loads(cached_data)
-#     # ... fetch from Postgres, then r.set() ...
\ No newline at end of file
+# --- Cache Helpers (never raise: a cache failure behaves like a miss / a no-op) ---
+
+async def cache_get(key: str) -> Optional[str]:
+    try:
+        return await redis_client.get(key)
+    except _CACHE_ERRORS as exc:
+        _log_cache_error("GET", exc)
+        return None
+
+async def cache_get_many(keys: Sequence[str]) -> List[Optional[str]]:
+    """One MGET round trip for several keys."""
+    if not keys:
+        return []
+    try:
+        return await redis_client.mget(keys)
+    except _CACHE_ERRORS as exc:
+        _log_cache_error("MGET", exc)
+        return [None] * len(keys)
+
+async def cache_set(key: str, value: Union[str, bytes], ex: int) -> None:
+    try:
+        await redis_client.set(key, value, ex=ex)
+    except _CACHE_ERRORS as exc:
+        _log_cache_error("SET", exc)
+
+async def cache_set_many(values: Dict[str, str], ex: int) -> None:
+    """SETs with a TTL for several keys, pipelined into one round trip."""
+    if not values:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, ex=ex)
+            await pipe.execute()
+    except _CACHE_ERRORS as exc:
+        _log_cache_error("SET (pipeline)", exc)
+
+async def cache_delete(*keys: str) -> None:
+    """Invalidates several keys with a single DEL. Entries carry TTLs, so a failed delete self-heals."""
+    if not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except _CACHE_ERRORS as exc:
+        _log_cache_error("DEL", exc)
+
+def _log_cache_error(op: str, exc: Exception) -> None:
+    # While the breaker is open every call would log; its open/close transitions are logged instead
+    if not isinstance(exc, RedisUnavailable):
+        print(f"Redis cache {op} failed: {exc}")
@@ -0,0 +1,154 @@
+import json
+import time
+from contextvars import ContextVar
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+# Per-request timing breakdown (Server-Timing header + one JSON log line), enabled with
+# SERVER_TIMING_ENABLED. When disabled neither the middleware nor the DB/Redis hooks are
+# installed; the remaining marks are a single ContextVar lookup returning None.
+
+class RequestTimings:
+    """Accumulated timings of one request (seconds, perf_counter based)."""
+    __slots__ = ("started", "db_count", "db", "redis", "auth", "endpoint_done", "rendered")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db = 0.0
+        self.redis = 0.0
+        self.auth = 0.0
+        self.endpoint_done: Optional[float] = None
+        self.rendered: Optional[float] = None
+
+    @property
+    def serialize(self) -> Optional[float]:
+        """Endpoint return -> response body rendered: response_model validation plus JSON rendering."""
+        if self.endpoint_done is None or self.rendered is None:
+            return None
+        return self.rendered - self.endpoint_done
+
+    def metrics(self, total: float) -> List[Tuple[str, float, Optional[str]]]:
+        """(name, ms, description) entries in Server-Timing order; auth overlaps its own db/redis time."""
+        entries = [
+            ("auth", self.auth * 1000, None),
+            ("db", self.db * 1000, f"{self.db_count} queries"),
+            ("redis", self.redis * 1000, None),
+        ]
+        if self.serialize is not None:
+            entries.append(("serialize", self.serialize * 1000, None))
+        entries.append(("total", total * 1000, None))
+        return entries
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current() -> Optional[RequestTimings]:
+    """Timings of the request being handled, or None (disabled or outside a request)."""
+    return _current.get()
+
+def mark_endpoint_done() -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.endpoint_done = time.perf_counter()
+
+def mark_rendered() -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.rendered = time.perf_counter()
+
+def server_timing_header(metrics: Iterable[Tuple[str, float, Optional[str]]]) -> str:
+    parts = []
+    for name, ms, desc in metrics:
+        part = f"{name};dur={ms:.2f}"
+        if desc:
+            part += f';desc="{desc}"'
+        parts.append(part)
+    return ", ".join(parts)
+
+# --- DB hooks ---
+# Cursor events fire inside SQLAlchemy's greenlet, which inherits the request task's context,
+# so the ContextVar lookup finds the request's RequestTimings.
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._timing_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    started = getattr(context, "_timing_started", None)
+    if timings is not None and started is not None:
+        timings.db_count += 1
+        timings.db += time.perf_counter() - started
+
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+# --- Redis hooks ---
+
+def _timed(call):
+    async def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return await call(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await call(*args, **kwargs)
+        finally:
+            timings.redis += time.perf_counter() - started
+    return wrapper
+
+def instrument_redis(client) -> None:
+    """Times single commands (incl. scripts) and pipeline executions on this client instance."""
+    client.execute_command = _timed(client.execute_command)
+    create_pipeline = client.pipeline
+
+    def pipeline(*args, **kwargs):
+        pipe = create_pipeline(*args, **kwargs)
+        pipe.execute = _timed(pipe.execute)
+        return pipe
+
+    client.pipeline = pipeline
+
+# --- Middleware ---
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware (outermost) that opens a RequestTimings for every HTTP request,
+    appends the Server-Timing header when the response starts and logs one JSON line.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                header = server_timing_header(timings.metrics(time.perf_counter() - timings.started))
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            total_ms = (time.perf_counter() - timings.started) * 1000
+            if total_ms >= settings.SERVER_TIMING_LOG_MIN_MS:
+                record = {"method": scope["method"], "path": scope["path"], "status": status_code}
+                record.update({f"{name}_ms": round(ms, 2) for name, ms, _ in timings.metrics(total_ms / 1000)})
+                record["db_queries"] = timings.db_count
+                print(f"request_timing {json.dumps(record)}")
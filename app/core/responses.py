@@ -0,0 +1,37 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.request_timing import mark_rendered
+
+def _default(obj: Any) -> Any:
+    # orjson handles UUID, datetime/date and dataclasses natively
+    if isinstance(obj, Decimal):
+        # Same representation Pydantic uses for condecimal fields in JSON mode
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class. FastAPI hands it the response_model output already reduced
+    to JSON-compatible data by pydantic-core; orjson then renders it several times faster
+    than the stdlib encoder. Pydantic models returned directly (e.g. cached payloads) are
+    serialized by pydantic-core itself, skipping the dict round trip.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            body = content.__pydantic_serializer__.to_json(content)
+        else:
+            body = dumps(content)
+        mark_rendered()
+        return body
@@ -0,0 +1,54 @@
+import asyncio
+import functools
+import random
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+
+# PostgreSQL SQLSTATEs that are safe to retry: the whole transaction was rolled back
+DEADLOCK_DETECTED = "40P01"
+SERIALIZATION_FAILURE = "40001"
+RETRYABLE_SQLSTATES = {DEADLOCK_DETECTED, SERIALIZATION_FAILURE}
+FOREIGN_KEY_VIOLATION = "23503"
+
+def _sqlstate(exc: DBAPIError) -> Optional[str]:
+    # SQLAlchemy's asyncpg adapter exposes sqlstate; fall back to the driver exception it wraps
+    orig = exc.orig
+    for candidate in (orig, getattr(orig, "__cause__", None)):
+        code = getattr(candidate, "sqlstate", None) or getattr(candidate, "pgcode", None)
+        if code:
+            return code
+    return None
+
+def is_retryable(exc: BaseException) -> bool:
+    return isinstance(exc, DBAPIError) and _sqlstate(exc) in RETRYABLE_SQLSTATES
+
+def is_foreign_key_violation(exc: BaseException) -> bool:
+    return isinstance(exc, DBAPIError) and _sqlstate(exc) == FOREIGN_KEY_VIOLATION
+
+def retry_on_conflict(func):
+    """
+    Retries an async CRUD function `func(db, ...)` when its transaction is aborted by a
+    deadlock or serialization failure. The session is rolled back before each retry and
+    waits use full jitter (uniform in [0, min(max, base * 2**attempt)]) so contending
+    requests don't retry in lockstep. The function must be safe to re-run from scratch,
+    i.e. do all of its work and its commit inside the call.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(db, *args, **kwargs):
+        attempts = max(settings.DB_CONFLICT_RETRY_ATTEMPTS, 1)
+        for attempt in range(attempts):
+            try:
+                return await func(db, *args, **kwargs)
+            except DBAPIError as exc:
+                if not is_retryable(exc) or attempt == attempts - 1:
+                    raise
+                await db.rollback()
+                delay = min(settings.DB_CONFLICT_RETRY_MAX_DELAY, settings.DB_CONFLICT_RETRY_BASE_DELAY * 2 ** attempt)
+                print(f"{func.__name__}: retrying after {_sqlstate(exc)} (attempt {attempt + 1}/{attempts})")
+                await asyncio.sleep(random.uniform(0, delay))
+
+    return wrapper
@@ -2,10 +2,21 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Union
 from jose import jwt, JWTError
 from app.core.config import settings
-from typing import Optional
+from typing import Optional, Tuple
+import uuid
+
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
 
 # --- Token Creation and Validation ---
 
+def _encode_token(subject: Union[str, Any], token_type: str, expire: datetime) -> Tuple[str, str]:
+    """Encodes a JWT with a unique token ID (jti) so it can be revoked individually."""
+    jti = uuid.uuid4().hex
+    to_encode = {"exp": expire, "sub": str(subject), "jti": jti, "type": token_type}
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return encoded_jwt, jti
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -16,21 +27,38 @@ def create_access_token(
         # Default expiration time (e.g., 30 minutes)
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt, _ = _encode_token(subject, ACCESS_TOKEN_TYPE, expire)
     return encoded_jwt
 
-def decode_access_token(token: str) -> Union[str, dict, None]:
-    """Decodes and validates a JWT access token."""
+def create_refresh_token(subject: Union[str, Any]) -> Tuple[str, str, datetime]:
+    """Creates a long-lived JWT refresh token. Returns (token, jti, expiry)."""
+    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    encoded_jwt, jti = _encode_token(subject, REFRESH_TOKEN_TYPE, expire)
+    return encoded_jwt, jti, expire
+
+def decode_token(token: str, expected_type: str = ACCESS_TOKEN_TYPE) -> Optional[dict]:
+    """
+    Decodes and validates a JWT, returning its payload only if it is of the expected type.
+    Tokens issued before token types existed carry no 'type' and count as access tokens.
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        # The 'sub' field typically holds the user identifier (user_id)
-        user_id = payload.get("sub")
-        if user_id is None:
-            return None
-        return user_id
     except JWTError:
         # Token is invalid or expired
         return None
+
+    if payload.get("sub") is None:
+        return None
+    if payload.get("type", ACCESS_TOKEN_TYPE) != expected_type:
+        return None
+    return payload
+
+def decode_access_token(token: str) -> Union[str, dict, None]:
+    """Decodes and validates a JWT access token."""
+    payload = decode_token(token, ACCESS_TOKEN_TYPE)
+    if payload is None:
+        return None
+    # The 'sub' field typically holds the user identifier (user_id)
+    return payload["sub"]
@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+import json
+import random
+import time
+from typing import Any, Optional
+
+from sqlalchemy import delete, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.core.config import settings
+from app.models.diagnostics import SlowQueryPlan
+
+# Slow-query log (SLOW_QUERY_THRESHOLD_MS). Every statement over the threshold is logged with
+# its text, parameter shape, duration and originating endpoint; a SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+# fraction of the read-only ones is re-run out of band under EXPLAIN (ANALYZE, BUFFERS) and the
+# plan stored in slow_query_plans (see GET /internal/slow-queries).
+
+# "GET /api/v1/transactions/" while a route handles the request (set by ReleaseSessionRoute)
+current_endpoint: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_endpoint", default=None)
+# Set inside the EXPLAIN task so its own statements are never sampled again
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar("slow_query_explaining", default=False)
+
+# One capture in flight per worker: sampling must never compete with requests for connections
+_explain_in_flight = False
+_background_tasks = set()
+
+# Locking reads would take row locks again; only plain SELECTs are safe to re-run
+_LOCKING_CLAUSES = (" FOR UPDATE", " FOR NO KEY UPDATE", " FOR SHARE", " FOR KEY SHARE")
+
+def params_shape(parameters: Any, executemany: bool = False) -> str:
+    """Parameter types only (values may be personal data), e.g. "(UUID, str, int)"."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {params_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+def is_explainable(statement: str) -> bool:
+    upper = " ".join(statement.split()).upper()
+    return upper.startswith("SELECT") and not any(clause in upper for clause in _LOCKING_CLAUSES)
+
+async def capture_plan(
+    query_engine: AsyncEngine,
+    sessionmaker: async_sessionmaker,
+    statement: str,
+    parameters: Any,
+    endpoint: Optional[str],
+    duration_ms: float,
+) -> None:
+    """Re-runs the statement under EXPLAIN ANALYZE (rolled back, time-boxed) and stores the plan."""
+    global _explain_in_flight
+    _explaining.set(True)
+    try:
+        async with query_engine.connect() as conn:
+            await conn.execute(text(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"))
+            result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            await conn.rollback()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        async with sessionmaker() as db:
+            db.add(SlowQueryPlan(
+                endpoint=endpoint,
+                statement=statement,
+                params_shape=params_shape(parameters),
+                duration_ms=round(duration_ms, 3),
+                plan=plan,
+            ))
+            await db.execute(delete(SlowQueryPlan).where(
+                SlowQueryPlan.captured_at < text(f"now() - interval '{int(settings.SLOW_QUERY_PLAN_RETENTION_DAYS)} days'")
+            ))
+            await db.commit()
+    except Exception as exc:
+        print(f"Slow query plan capture failed: {exc}")
+    finally:
+        _explain_in_flight = False
+
+def _schedule_capture(query_engine, sessionmaker, statement, parameters, endpoint, duration_ms) -> None:
+    global _explain_in_flight
+    _explain_in_flight = True
+    loop = asyncio.get_running_loop()
+    coro = capture_plan(query_engine, sessionmaker, statement, parameters, endpoint, duration_ms)
+    # Fresh context: the capture must not count towards the request's timings/endpoint
+    task = contextvars.Context().run(loop.create_task, coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+def instrument_engine(query_engine: AsyncEngine, sessionmaker: async_sessionmaker) -> None:
+    """Installs the slow-query listeners on query_engine; plans are stored through sessionmaker (primary)."""
+    threshold_s = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+    sample_rate = settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+
+    @event.listens_for(query_engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(query_engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._slow_query_started
+        if elapsed < threshold_s or _explaining.get():
+            return
+
+        endpoint = current_endpoint.get()
+        duration_ms = elapsed * 1000
+        record = {
+            "duration_ms": round(duration_ms, 2),
+            "endpoint": endpoint,
+            "params": params_shape(parameters, executemany),
+            "statement": " ".join(statement.split()),
+        }
+        print(f"slow_query {json.dumps(record)}")
+        if (
+            sample_rate > 0
+            and not executemany
+            and not _explain_in_flight
+            and is_explainable(statement)
+            and random.random() < sample_rate
+        ):
+            _schedule_capture(query_engine, sessionmaker, statement, parameters, endpoint, duration_ms)
@@ -0,0 +1,26 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.crud.sync import prune_sync_tombstones
+
+async def run_sync_tombstone_pruner() -> None:
+    """
+    Background loop started from the application lifespan: deletes sync tombstones older than
+    SYNC_TOMBSTONE_RETENTION_DAYS (full batches back to back). Runs in every worker; an
+    advisory lock lets only one of them prune at a time.
+    """
+    while True:
+        pruned = 0
+        try:
+            async with AsyncSessionLocal() as db:
+                pruned = await prune_sync_tombstones(db)
+            if pruned:
+                print(f"Pruned {pruned} expired sync tombstone(s).")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Tombstones stay until the next round; sync itself is unaffected
+            print(f"Sync tombstone pruning failed: {exc}")
+        if pruned < settings.SYNC_TOMBSTONE_PRUNE_BATCH_SIZE:
+            await asyncio.sleep(settings.SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS)
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import math
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+REFRESH_KEY_PREFIX = "refresh:"
+REVOKED_KEY_PREFIX = "revoked:"
+# Sorted set of revoked jti -> expiry timestamp; the source every worker rebuilds its filter from
+REVOKED_SET_KEY = "revoked_jtis"
+
+# --- Bloom Filter ---
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over string keys. No false negatives, so a miss
+    proves a token ID was never revoked without asking Redis.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        num_bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        # Kirsch-Mitzenmacher: derive k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+def _new_filter() -> BloomFilter:
+    return BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+
+_revoked_filter: Optional[BloomFilter] = None
+
+def _get_filter() -> BloomFilter:
+    global _revoked_filter
+    if _revoked_filter is None:
+        _revoked_filter = _new_filter()
+    return _revoked_filter
+
+def _ttl_seconds(expires_at: datetime) -> int:
+    return max(int(expires_at.timestamp() - time.time()), 1)
+
+# --- Refresh Tokens (rotation) ---
+
+async def store_refresh_token(jti: str, user_id: str, expires_at: datetime) -> None:
+    """Registers an issued refresh token; only registered tokens can be exchanged."""
+    await redis_client.set(f"{REFRESH_KEY_PREFIX}{jti}", str(user_id), ex=_ttl_seconds(expires_at))
+
+async def consume_refresh_token(jti: str, user_id: str) -> bool:
+    """
+    Atomically removes a refresh token. Returns False if it was already used,
+    revoked, expired, or belongs to another user, so each token rotates exactly once.
+    """
+    owner = await redis_client.getdel(f"{REFRESH_KEY_PREFIX}{jti}")
+    return owner is not None and owner == str(user_id)
+
+# --- Revocation ---
+
+async def revoke_token(jti: str, expires_at: datetime) -> None:
+    """Adds a token ID to the revocation list until the token would have expired anyway."""
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.set(f"{REVOKED_KEY_PREFIX}{jti}", "1", ex=_ttl_seconds(expires_at))
+        pipe.zadd(REVOKED_SET_KEY, {jti: expires_at.timestamp()})
+        await pipe.execute()
+    # Visible immediately on this worker; other workers pick it up on their next sync
+    _get_filter().add(jti)
+
+async def is_token_revoked(jti: Optional[str]) -> bool:
+    """
+    In-memory check for the common (not revoked) case. Only bloom-filter hits
+    are confirmed against Redis, to rule out false positives.
+    """
+    if not jti or jti not in _get_filter():
+        return False
+    try:
+        return bool(await redis_client.exists(f"{REVOKED_KEY_PREFIX}{jti}"))
+    except Exception:
+        # Fail closed: a filter hit we cannot disprove is treated as revoked
+        return True
+
+async def sync_revoked_filter() -> None:
+    """Rebuilds this worker's bloom filter from the Redis revocation set."""
+    global _revoked_filter
+    now = datetime.now(timezone.utc).timestamp()
+    await redis_client.zremrangebyscore(REVOKED_SET_KEY, "-inf", now)
+    jtis = await redis_client.zrange(REVOKED_SET_KEY, 0, -1)
+
+    fresh = _new_filter()
+    for jti in jtis:
+        fresh.add(jti)
+    # Swap in one assignment so concurrent lookups never see a half-built filter
+    _revoked_filter = fresh
+
+async def run_revocation_sync() -> None:
+    """Background loop started from the application lifespan."""
+    while True:
+        try:
+            await sync_revoked_filter()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Keep serving with the last good filter while Redis is unavailable
+            print(f"Revocation filter sync failed: {exc}")
+        await asyncio.sleep(settings.REVOCATION_SYNC_INTERVAL_SECONDS)
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Optional, Set, Tuple
+from uuid import UUID
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import cache_get_many, cache_set, redis_client
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+# Authenticated users, cached in Redis so requests answered from other caches (summary, list
+# pages, 304s) never check out a DB connection just to authenticate. Each entry records the
+# generation of its user it was loaded under; every committed write to a User row bumps that
+# generation, so an entry loaded before the write is never served afterwards, even when its
+# SET lands after the bump (a reader racing the writer).
+
+AUTH_USER_KEY_PREFIX = "authuser:"
+AUTH_USER_GENERATION_KEY_PREFIX = "authusergen:"
+
+_background_tasks: Set[asyncio.Task] = set()
+
+async def get_cached_user(user_id: str) -> Tuple[Optional[UserResponse], str]:
+    """
+    Returns (user, generation): the cached user when its entry is current, else None and the
+    generation to hand to cache_user() once the user has been loaded from the database.
+    """
+    if settings.AUTH_USER_CACHE_SECONDS <= 0:
+        return None, "0"
+
+    entry, generation = await cache_get_many(
+        [f"{AUTH_USER_KEY_PREFIX}{user_id}", f"{AUTH_USER_GENERATION_KEY_PREFIX}{user_id}"]
+    )
+    generation = generation or "0"
+    if entry is not None:
+        try:
+            cached_generation, user = orjson.loads(entry)
+            if cached_generation == generation:
+                return UserResponse.model_validate(user), generation
+        except (ValueError, TypeError):
+            pass # Entry rusak: muat ulang dari DB
+    return None, generation
+
+async def cache_user(user_id: str, generation: str, user: UserResponse) -> None:
+    if settings.AUTH_USER_CACHE_SECONDS <= 0:
+        return
+    payload = orjson.dumps([generation, user.model_dump(mode="json")])
+    await cache_set(f"{AUTH_USER_KEY_PREFIX}{user_id}", payload, ex=settings.AUTH_USER_CACHE_SECONDS)
+
+async def invalidate_cached_user(user_id: UUID) -> None:
+    """
+    Bumps the user's generation, retiring any cached entry. Called after commit for ORM writes
+    to User rows (see the session events below); bulk UPDATE/DELETE statements must call it.
+    """
+    if settings.AUTH_USER_CACHE_SECONDS <= 0:
+        return
+    key = f"{AUTH_USER_GENERATION_KEY_PREFIX}{user_id}"
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            # Outlives every entry loaded under an older generation
+            pipe.expire(key, 2 * settings.AUTH_USER_CACHE_SECONDS)
+            await pipe.execute()
+    except Exception as exc:
+        # Tanpa bump, entry lama tetap berlaku sampai TTL-nya habis
+        print(f"Failed to invalidate cached user {user_id}: {exc}")
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+# --- Session Events (invalidation) ---
+# Updated or deleted User rows (deactivation included) are collected at flush and invalidated
+# once the transaction commits. The tasks join session.info["write_marks"], so the request
+# waits for them before responding (see ReleaseSessionRoute).
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_writes(session, flush_context):
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault("user_cache_evict", set()).add(obj.user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_writes(session):
+    session.info.pop("user_cache_evict", None)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop("user_cache_evict", ()):
+        session.info.setdefault("write_marks", []).append(_spawn(invalidate_cached_user(user_id)))
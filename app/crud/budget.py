@@ -1,22 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import delete, update, func, or_
-from typing import List, Optional, Tuple
-from uuid import UUID
+from sqlalchemy import Row, delete, update, or_
+from typing import Optional, Sequence, Tuple
+from uuid import UUID, uuid4
 from datetime import date
 
 from app.models.transaction import Budget
+from app.crud import statements
+from app.crud.outbox import record_change, OP_CREATE, OP_UPDATE, OP_DELETE
 from app.schemas.budget import BudgetCreate
 
 # --- Read Operations ---
 
 async def get_budget_by_id(db: AsyncSession, budget_id: UUID, user_id: UUID) -> Optional[Budget]:
     """Retrieves a single budget by ID, owned by the specified user."""
-    result = await db.execute(
-        select(Budget)
-        .where(Budget.budget_id == budget_id)
-        .where(Budget.user_id == user_id)
-    )
+    result = await db.execute(statements.budget_by_id(budget_id, user_id))
     return result.scalars().first()
 
 async def get_all_budgets_for_user(
@@ -24,21 +21,18 @@ async def get_all_budgets_for_user(
     user_id: UUID, 
     limit: int = 10, 
     offset: int = 0
-) -> Tuple[List[Budget], int]:
+) -> Tuple[Sequence[Row], int]:
     """Retrieves all budgets for a specific user with pagination."""
     
-    base_query = select(Budget).where(Budget.user_id == user_id)
+    page_query, count_query = statements.budgets_page(user_id, limit, offset)
     
     # 1. Get Total Count
-    count_query = select(func.count()).select_from(base_query.subquery())
     total_result = await db.execute(count_query)
     total_count = total_result.scalar_one()
 
-    # 2. Apply Ordering and Pagination
-    final_query = base_query.order_by(Budget.start_date.desc()).limit(limit).offset(offset)
-    
-    result = await db.execute(final_query)
-    budgets = result.scalars().all()
+    # 2. Fetch the page (ordering and pagination are part of the cached statement)
+    result = await db.execute(page_query)
+    budgets = result.all()
     
     return budgets, total_count
 
@@ -47,6 +41,7 @@ async def get_all_budgets_for_user(
 async def create_budget(db: AsyncSession, budget_in: BudgetCreate, user_id: UUID) -> Budget:
     """Creates a new budget entry."""
     db_budget = Budget(
+        budget_id=uuid4(), # Known before flush, for the outbox event
         user_id=user_id,
         category_id=budget_in.category_id,
         amount_limit=budget_in.amount_limit,
@@ -55,6 +50,7 @@ async def create_budget(db: AsyncSession, budget_in: BudgetCreate, user_id: UUID
     )
     
     db.add(db_budget)
+    record_change(db, "budget", db_budget.budget_id, user_id, OP_CREATE)
     await db.commit()
     await db.refresh(db_budget)
     
@@ -75,9 +71,12 @@ async def update_budget(db: AsyncSession, budget_id: UUID, user_id: UUID, budget
     )
     
     result = await db.execute(stmt)
+    budget = result.scalars().first()
+    if budget:
+        record_change(db, "budget", budget_id, user_id, OP_UPDATE)
     await db.commit()
     
-    return result.scalars().first()
+    return budget
 
 async def delete_budget(db: AsyncSession, budget_id: UUID, user_id: UUID) -> bool:
     """Deletes a budget entry."""
@@ -88,6 +87,8 @@ async def delete_budget(db: AsyncSession, budget_id: UUID, user_id: UUID) -> boo
     )
     
     result = await db.execute(stmt)
+    if result.rowcount:
+        record_change(db, "budget", budget_id, user_id, OP_DELETE)
     await db.commit()
     
     return result.rowcount > 0
\ No newline at end of file
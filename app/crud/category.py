@@ -1,22 +1,104 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import delete, update, func, or_
-from typing import List, Optional, Tuple
-from uuid import UUID
+from sqlalchemy import delete, update
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+import orjson
 
-from app.models.category import Category
+from app.models.category import Category, TransactionType
+from app.crud import statements
+from app.crud.outbox import record_change, OP_CREATE, OP_UPDATE, OP_DELETE
 from app.schemas.category import CategoryCreate
+from app.core.config import settings
+from app.core.consistency import get_data_version
+from app.core.redis import cache_delete, cache_get, cache_set
+
+# --- Category Tables ---
+# Categories are read far more often than written (listing, lookups, transaction validation).
+# System categories (user_id IS NULL) are the same for every user and only change through
+# migrations: each worker loads them once into an immutable table. A user's own categories
+# are cached in Redis under the user's data version (see app.core.consistency), so the bump
+# after every committed write retires the entry; a refill racing that write (e.g. read from a
+# lagging replica before the bump) lands under the old version and is never read again.
+# Both are merged in memory, so reads never need the `user_id = ? OR user_id IS NULL` query.
+
+USER_CATEGORIES_KEY_PREFIX = "categories:"
+
+@dataclass(frozen=True)
+class CachedCategory:
+    """Read-only category row (validates into CategoryResponse like the ORM entity)."""
+    category_id: UUID
+    user_id: Optional[UUID]
+    category_name: str
+    type: TransactionType
+
+_system_categories: Optional[Mapping[UUID, CachedCategory]] = None
+
+async def load_system_categories(db: AsyncSession) -> Mapping[UUID, CachedCategory]:
+    """(Re)loads the process-wide system category table; called at startup."""
+    global _system_categories
+    result = await db.execute(statements.system_categories())
+    _system_categories = MappingProxyType({row.category_id: CachedCategory(*row) for row in result.all()})
+    return _system_categories
+
+async def get_system_categories(db: AsyncSession) -> Mapping[UUID, CachedCategory]:
+    if _system_categories is None:
+        return await load_system_categories(db)
+    return _system_categories
+
+async def get_user_categories(db: AsyncSession, user_id: UUID, refresh: bool = False) -> Tuple[CachedCategory, ...]:
+    """
+    The user's own categories, from Redis when cached (CATEGORY_CACHE_SECONDS), else the
+    database. refresh=True skips the cached entry and rewrites it from the database.
+    Without a known data version (Redis unavailable, bump pending) the cache is bypassed.
+    """
+    # Fetched before the read: rows loaded now are at least as new as this version
+    data_version = await get_data_version(str(user_id)) if settings.CATEGORY_CACHE_SECONDS > 0 else None
+    key = f"{USER_CATEGORIES_KEY_PREFIX}{user_id}:{data_version}"
+    if data_version is not None and not refresh:
+        cached = await cache_get(key)
+        if cached is not None:
+            try:
+                return tuple(
+                    CachedCategory(UUID(category_id), user_id, name, TransactionType(type_))
+                    for category_id, name, type_ in orjson.loads(cached)
+                )
+            except (ValueError, TypeError):
+                pass # Entry rusak: muat ulang dari DB
+
+    result = await db.execute(statements.user_categories(user_id))
+    categories = tuple(CachedCategory(*row) for row in result.all())
+    if data_version is not None:
+        payload = orjson.dumps([[str(c.category_id), c.category_name, c.type.value] for c in categories])
+        await cache_set(key, payload, ex=settings.CATEGORY_CACHE_SECONDS)
+    return categories
+
+async def invalidate_user_categories(user_id: UUID) -> None:
+    """
+    Drops the entry of the current data version. Committed writes need no call (their version
+    bump retires it); this is for an entry found stale without a write, see _reject_stale_category.
+    """
+    data_version = await get_data_version(str(user_id))
+    if data_version is not None:
+        await cache_delete(f"{USER_CATEGORIES_KEY_PREFIX}{user_id}:{data_version}")
 
 # --- Read Operations ---
 
-async def get_category_by_id(db: AsyncSession, category_id: UUID, user_id: UUID) -> Optional[Category]:
+def _find(categories: Sequence[CachedCategory], category_id: UUID) -> Optional[CachedCategory]:
+    return next((c for c in categories if c.category_id == category_id), None)
+
+async def get_category_by_id(db: AsyncSession, category_id: UUID, user_id: UUID) -> Optional[CachedCategory]:
     """Retrieves a single category by ID, ensuring it belongs to the user or is a system default."""
-    result = await db.execute(
-        select(Category)
-        .where(Category.category_id == category_id)
-        .where(or_(Category.user_id == user_id, Category.user_id.is_(None)))
-    )
-    return result.scalars().first()
+    system = await get_system_categories(db)
+    if category_id in system:
+        return system[category_id]
+    category = _find(await get_user_categories(db, user_id), category_id)
+    if category is None:
+        # The cached entry may predate the category (filled from a lagging replica under the
+        # current version): confirm with the database before rejecting
+        category = _find(await get_user_categories(db, user_id, refresh=True), category_id)
+    return category
 
 async def get_all_categories_for_user(
     db: AsyncSession, 
@@ -24,42 +106,35 @@ async def get_all_categories_for_user(
     q: Optional[str] = None, 
     limit: int = 10, 
     offset: int = 0
-) -> Tuple[List[Category], int]:
+) -> Tuple[Sequence[CachedCategory], int]:
     """Retrieves all categories for a specific user (including system defaults), with search and pagination."""
     
-    base_query = select(Category).where(
-        or_(Category.user_id == user_id, Category.user_id.is_(None))
-    )
-    
-    # 1. Apply Search Filter
+    # 1. Merge system and user categories in memory
+    system = await get_system_categories(db)
+    categories: List[CachedCategory] = [*system.values(), *await get_user_categories(db, user_id)]
+
+    # 2. Search filter (case-insensitive substring, like ILIKE '%q%')
     if q:
-        search_term = f"%{q}%"
-        base_query = base_query.where(Category.category_name.ilike(search_term))
-        
-    # 2. Get Total Count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total_count = total_result.scalar_one()
+        needle = q.casefold()
+        categories = [c for c in categories if needle in c.category_name.casefold()]
 
-    # 3. Apply Ordering and Pagination
-    final_query = base_query.order_by(Category.category_name).limit(limit).offset(offset)
-    
-    result = await db.execute(final_query)
-    categories = result.scalars().all()
-    
-    return categories, total_count
+    # 3. Order by name and paginate
+    categories.sort(key=lambda c: c.category_name.casefold())
+    return categories[offset:offset + limit], len(categories)
 
 # --- Write Operations ---
 
 async def create_category(db: AsyncSession, category_in: CategoryCreate, user_id: UUID) -> Category:
     """Creates a new user-defined category."""
     db_category = Category(
+        category_id=uuid4(), # Known before flush, for the outbox event
         user_id=user_id,
         category_name=category_in.category_name,
         type=category_in.type # Enum type
     )
     
     db.add(db_category)
+    record_change(db, "category", db_category.category_id, user_id, OP_CREATE)
     await db.commit()
     await db.refresh(db_category)
     
@@ -68,10 +143,8 @@ async def create_category(db: AsyncSession, category_in: CategoryCreate, user_id
 async def update_category(db: AsyncSession, category_id: UUID, user_id: UUID, category_in: CategoryCreate) -> Optional[Category]:
     """Updates a user-owned category, preventing updates to system defaults (user_id is NOT NULL)."""
     
-    existing_category = await get_category_by_id(db, category_id, user_id)
-
-    # Check if category exists AND belongs to the user (not a system default)
-    if not existing_category or existing_category.user_id is None:
+    # System defaults are never updated; ownership is enforced by the WHERE clause below
+    if category_id in await get_system_categories(db):
         return None
 
     stmt = (
@@ -86,15 +159,17 @@ async def update_category(db: AsyncSession, category_id: UUID, user_id: UUID, ca
     )
     
     result = await db.execute(stmt)
+    category = result.scalars().first()
+    if category:
+        record_change(db, "category", category_id, user_id, OP_UPDATE)
     await db.commit()
     
-    return result.scalars().first()
+    return category
 
 async def delete_category(db: AsyncSession, category_id: UUID, user_id: UUID) -> bool:
     """Deletes a user-owned category, preventing deletion of system defaults."""
     
-    existing_category = await get_category_by_id(db, category_id, user_id)
-    if not existing_category or existing_category.user_id is None:
+    if category_id in await get_system_categories(db):
         return False
         
     stmt = (
@@ -104,6 +179,8 @@ async def delete_category(db: AsyncSession, category_id: UUID, user_id: UUID) ->
     )
     
     result = await db.execute(stmt)
+    if result.rowcount:
+        record_change(db, "category", category_id, user_id, OP_DELETE)
     await db.commit()
     
     return result.rowcount > 0
\ No newline at end of file
@@ -1,21 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import delete, update, func, or_
-from typing import List, Optional, Tuple
-from uuid import UUID
+from sqlalchemy import Row, delete, update
+from typing import Optional, Sequence, Tuple
+from uuid import UUID, uuid4
 
 from app.models.debt import DebtLedger
+from app.crud import statements
+from app.crud.outbox import record_change, OP_CREATE, OP_UPDATE, OP_DELETE
 from app.schemas.debt import DebtLedgerCreate, DebtLedgerUpdate
 
 # --- Read Operations ---
 
 async def get_debt_by_id(db: AsyncSession, ledger_id: UUID, user_id: UUID) -> Optional[DebtLedger]:
     """Retrieves a single debt ledger entry by ID, owned by the specified user."""
-    result = await db.execute(
-        select(DebtLedger)
-        .where(DebtLedger.ledger_id == ledger_id)
-        .where(DebtLedger.user_id == user_id)
-    )
+    result = await db.execute(statements.debt_by_id(ledger_id, user_id))
     return result.scalars().first()
 
 async def get_all_debts_for_user(
@@ -24,31 +21,19 @@ async def get_all_debts_for_user(
     q: Optional[str] = None, 
     limit: int = 10, 
     offset: int = 0
-) -> Tuple[List[DebtLedger], int]:
+) -> Tuple[Sequence[Row], int]:
     """Retrieves all debt ledger entries for a specific user with search and pagination."""
     
-    base_query = select(DebtLedger).where(DebtLedger.user_id == user_id)
-    
-    # 1. Apply Search Filter
-    if q:
-        search_term = f"%{q}%"
-        base_query = base_query.where(
-            or_(
-                DebtLedger.contact_name.ilike(search_term),
-                DebtLedger.phone_number.ilike(search_term),
-            )
-        )
-        
+    # 1. Search filter, ordering and pagination are part of the cached statements
+    page_query, count_query = statements.debts_page(user_id, q, limit, offset)
+
     # 2. Get Total Count
-    count_query = select(func.count()).select_from(base_query.subquery())
     total_result = await db.execute(count_query)
     total_count = total_result.scalar_one()
 
-    # 3. Apply Ordering and Pagination
-    final_query = base_query.order_by(DebtLedger.due_date).limit(limit).offset(offset)
-    
-    result = await db.execute(final_query)
-    debts = result.scalars().all()
+    # 3. Fetch the page
+    result = await db.execute(page_query)
+    debts = result.all()
     
     return debts, total_count
 
@@ -57,6 +42,7 @@ async def get_all_debts_for_user(
 async def create_debt(db: AsyncSession, debt_in: DebtLedgerCreate, user_id: UUID) -> DebtLedger:
     """Creates a new debt ledger entry."""
     db_debt = DebtLedger(
+        ledger_id=uuid4(), # Known before flush, for the outbox event
         user_id=user_id,
         contact_name=debt_in.contact_name,
         total_amount=debt_in.total_amount,
@@ -68,6 +54,7 @@ async def create_debt(db: AsyncSession, debt_in: DebtLedgerCreate, user_id: UUID
     )
     
     db.add(db_debt)
+    record_change(db, "debt", db_debt.ledger_id, user_id, OP_CREATE)
     await db.commit()
     await db.refresh(db_debt)
     
@@ -108,9 +95,12 @@ async def update_debt(db: AsyncSession, ledger_id: UUID, user_id: UUID, debt_in:
     )
     
     result = await db.execute(stmt)
+    debt = result.scalars().first()
+    if debt:
+        record_change(db, "debt", ledger_id, user_id, OP_UPDATE)
     await db.commit()
     
-    return result.scalars().first()
+    return debt
 
 async def delete_debt(db: AsyncSession, ledger_id: UUID, user_id: UUID) -> bool:
     """Deletes a debt ledger entry."""
@@ -121,6 +111,8 @@ async def delete_debt(db: AsyncSession, ledger_id: UUID, user_id: UUID) -> bool:
     )
     
     result = await db.execute(stmt)
+    if result.rowcount:
+        record_change(db, "debt", ledger_id, user_id, OP_DELETE)
     await db.commit()
     
     return result.rowcount > 0
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from uuid import UUID
+
+from app.models.outbox import OutboxEvent
+
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+def record_change(db: AsyncSession, entity: str, entity_id: UUID, user_id: Optional[UUID], op: str) -> None:
+    """
+    Appends a change event to the outbox. Call before the CRUD function commits: the
+    event is flushed with the change itself, so it exists if and only if the change does.
+    """
+    db.add(OutboxEvent(entity=entity, entity_id=entity_id, user_id=user_id, op=op))
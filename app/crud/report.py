@@ -1,18 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import func, case, and_
+from sqlalchemy import and_
 from typing import Dict, Any, List
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 from app.models.transaction import Transaction, Budget
-from app.models.wallet import Wallet
 from app.models.category import TransactionType
 from app.schemas.transaction import TransactionResponse
+from app.crud import statements
+from app.crud.outbox import record_change, OP_CREATE
+from app.crud.wallet import adjust_balance
+from app.core.config import settings
+from app.core.retry import retry_on_conflict
 
 # --- 1. Transaction Logic (for Atomic Transfer) ---
 
+@retry_on_conflict
 async def perform_atomic_transfer(
     db: AsyncSession,
     user_id: UUID,
@@ -26,9 +30,11 @@ async def perform_atomic_transfer(
     within a single database session and transaction.
     """
     
-    # CRITICAL: Pastikan kedua wallet dimiliki oleh user yang sama
-    wallet_check = select(Wallet.wallet_id).where(Wallet.user_id == user_id, 
-                                                 Wallet.wallet_id.in_([source_wallet_id, target_wallet_id]))
+    # CRITICAL: Pastikan kedua wallet dimiliki oleh user yang sama, dan kunci keduanya
+    # dalam urutan wallet_id (bukan urutan request) agar transfer berlawanan arah tidak deadlock
+    wallet_check = statements.lock_owned_wallets(
+        user_id, [source_wallet_id, target_wallet_id], exclusive=not settings.WALLET_BALANCE_DELTAS
+    )
     
     owned_wallets = (await db.execute(wallet_check)).scalars().all()
     if len(owned_wallets) != 2:
@@ -41,6 +47,7 @@ async def perform_atomic_transfer(
     
     # 1. Transaction OUT (Expense from Source)
     txn_out = Transaction(
+        transaction_id=uuid4(),
         wallet_id=source_wallet_id,
         # Menggunakan ID Category Expense dummy. Idealnya, ini adalah 'Transfer Out'
         category_id=UUID('ffffffff-0000-0000-0000-000000000002'), 
@@ -52,6 +59,7 @@ async def perform_atomic_transfer(
 
     # 2. Transaction IN (Income to Target)
     txn_in = Transaction(
+        transaction_id=uuid4(),
         wallet_id=target_wallet_id,
         # Menggunakan ID Category Income dummy. Idealnya, ini adalah 'Transfer In'
         category_id=UUID('ffffffff-0000-0000-0000-000000000001'), 
@@ -62,21 +70,15 @@ async def perform_atomic_transfer(
     )
 
     db.add_all([txn_out, txn_in])
+    record_change(db, "transaction", txn_out.transaction_id, user_id, OP_CREATE)
+    record_change(db, "transaction", txn_in.transaction_id, user_id, OP_CREATE)
     
     # 3. Update Wallet Balances (menggunakan logic dari crud/transaction.py)
     # Reverse EXPENSE logic (Subtract from source)
-    await db.execute(
-        update(Wallet)
-        .where(Wallet.wallet_id == source_wallet_id)
-        .values(current_balance=Wallet.current_balance - amount)
-    )
+    await adjust_balance(db, source_wallet_id, -amount, user_id)
 
     # Apply INCOME logic (Add to target)
-    await db.execute(
-        update(Wallet)
-        .where(Wallet.wallet_id == target_wallet_id)
-        .values(current_balance=Wallet.current_balance + amount)
-    )
+    await adjust_balance(db, target_wallet_id, amount, user_id)
 
     # Commit both transactions and balance updates atomically
     await db.commit()
@@ -93,19 +95,8 @@ async def get_financial_summary(db: AsyncSession, user_id: UUID) -> Dict[str, An
     for the user across all transactions.
     """
     
-    # 1. Filter transaksi hanya untuk wallet yang dimiliki user
-    wallet_check = select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()
-    
-    # 2. Hitung total Income dan Expense
-    income_case = case((Transaction.transaction_type == TransactionType.INCOME, Transaction.amount), else_=0)
-    expense_case = case((Transaction.transaction_type == TransactionType.EXPENSE, Transaction.amount), else_=0)
-    
-    query = select(
-        func.sum(income_case).label('total_income'),
-        func.sum(expense_case).label('total_expense')
-    ).where(Transaction.wallet_id.in_(wallet_check))
-    
-    result = await db.execute(query)
+    # Total Income dan Expense, hanya untuk wallet yang dimiliki user
+    result = await db.execute(statements.financial_summary(user_id))
     summary = result.one_or_none()
     
     total_income = summary.total_income or Decimal(0)
@@ -0,0 +1,288 @@
+"""
+Hot-path statements built with `lambda_stmt`.
+
+A lambda statement is constructed and compiled once per call site; later calls only
+extract the closure values as bound parameters and hit the compiled cache directly,
+instead of rebuilding the `select(...)` tree and regenerating its cache key.
+Because the rendered SQL is identical on every call, asyncpg also reuses its
+per-connection prepared statement (see DB_STATEMENT_CACHE_SIZE).
+
+Rules for adding statements here: only reference mapped classes, module constants
+and the function's own arguments inside the lambdas, and keep conditional parts
+(e.g. optional search) as separate `+= lambda s: ...` steps so each shape is cached.
+"""
+from typing import Optional, Sequence, Tuple
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import BigInteger, StatementLambdaElement, case, func, insert, lambda_stmt, or_, select, tuple_, type_coerce, update
+
+from app.models.category import Category, TransactionType
+from app.models.debt import DebtLedger
+from app.models.sync import SyncTombstone
+from app.models.transaction import Budget, Transaction
+from app.models.user import User
+from app.models.wallet import Wallet, WalletBalanceDelta
+
+PageStatements = Tuple[StatementLambdaElement, StatementLambdaElement]
+
+# Core table (not the ORM entity) for balance updates: skips ORM bulk-update synchronization
+wallets_table = Wallet.__table__
+deltas_table = WalletBalanceDelta.__table__
+
+# --- Lean list projections ---
+# List pages select exactly the columns of the response schema and return plain Rows
+# (no identity map, no instrumented instances); the API validates a page in one
+# TypeAdapter call. Keep these in sync with the *Response schemas.
+
+WALLET_LIST_SELECT = select(Wallet.wallet_id, Wallet.user_id, Wallet.wallet_name, Wallet.currency, Wallet.current_balance)
+# WALLET_BALANCE_DELTAS mode: stored balance plus the not yet compacted deltas, in the same
+# statement (one snapshot: a concurrent compaction is seen either entirely or not at all)
+WALLET_BALANCE_WITH_PENDING = (Wallet.current_balance + func.coalesce(
+    select(func.sum(WalletBalanceDelta.amount))
+    .where(WalletBalanceDelta.wallet_id == Wallet.wallet_id)
+    .correlate(Wallet)
+    .scalar_subquery(),
+    0,
+)).label("current_balance")
+WALLET_LIST_SELECT_WITH_PENDING = select(
+    Wallet.wallet_id, Wallet.user_id, Wallet.wallet_name, Wallet.currency, WALLET_BALANCE_WITH_PENDING,
+)
+TRANSACTION_LIST_SELECT = select(
+    Transaction.transaction_id, Transaction.wallet_id, Transaction.category_id, Transaction.transaction_type,
+    Transaction.amount, Transaction.description, Transaction.transaction_date,
+)
+DEBT_LIST_SELECT = select(
+    DebtLedger.ledger_id, DebtLedger.user_id, DebtLedger.contact_name, DebtLedger.phone_number,
+    DebtLedger.is_debt_to_user, DebtLedger.total_amount, DebtLedger.amount_paid, DebtLedger.due_date,
+    DebtLedger.is_settled,
+)
+BUDGET_LIST_SELECT = select(
+    Budget.budget_id, Budget.user_id, Budget.category_id, Budget.amount_limit, Budget.start_date, Budget.end_date,
+)
+
+TOTAL_INCOME = func.sum(
+    case((Transaction.transaction_type == TransactionType.INCOME, Transaction.amount), else_=0)
+).label('total_income')
+TOTAL_EXPENSE = func.sum(
+    case((Transaction.transaction_type == TransactionType.EXPENSE, Transaction.amount), else_=0)
+).label('total_expense')
+
+# --- Users ---
+
+def user_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.email == email))
+
+# --- Wallets ---
+
+def wallet_by_id(wallet_id: UUID, user_id: UUID, include_pending: bool = False) -> StatementLambdaElement:
+    """include_pending: rows are (Wallet, balance including pending deltas)."""
+    if include_pending:
+        stmt = lambda_stmt(lambda: select(Wallet, WALLET_BALANCE_WITH_PENDING))
+    else:
+        stmt = lambda_stmt(lambda: select(Wallet))
+    stmt += lambda s: s.where(Wallet.wallet_id == wallet_id).where(Wallet.user_id == user_id)
+    return stmt
+
+def lock_owned_wallets(user_id: UUID, wallet_ids: Sequence[UUID], exclusive: bool = True) -> StatementLambdaElement:
+    """
+    Ownership check that also row-locks the owned wallets, always in wallet_id order.
+    Every multi-wallet write locks through here first, so two writers touching the same
+    wallets acquire the locks in the same order and cannot deadlock each other.
+    FOR NO KEY UPDATE (key_share) is enough for balance updates and does not block
+    concurrent inserts of transactions referencing these wallets. With exclusive=False
+    (balance deltas mode) a shared FOR KEY SHARE lock only keeps the wallets from being
+    deleted, so writers to the same wallet no longer queue behind each other.
+    """
+    wallet_ids = sorted(set(wallet_ids))
+    stmt = lambda_stmt(
+        lambda: select(Wallet.wallet_id)
+        .where(Wallet.user_id == user_id)
+        .where(Wallet.wallet_id.in_(wallet_ids))
+        .order_by(Wallet.wallet_id)
+    )
+    if exclusive:
+        stmt += lambda s: s.with_for_update(key_share=True)
+    else:
+        stmt += lambda s: s.with_for_update(read=True, key_share=True)
+    return stmt
+
+def wallets_page(user_id: UUID, q: Optional[str], limit: int, offset: int, include_pending: bool = False) -> PageStatements:
+    if include_pending:
+        page = lambda_stmt(lambda: WALLET_LIST_SELECT_WITH_PENDING.where(Wallet.user_id == user_id))
+    else:
+        page = lambda_stmt(lambda: WALLET_LIST_SELECT.where(Wallet.user_id == user_id))
+    count = lambda_stmt(lambda: select(func.count()).select_from(Wallet).where(Wallet.user_id == user_id))
+    if q:
+        search_term = f"%{q}%"
+        page += lambda s: s.where(or_(Wallet.wallet_name.ilike(search_term), Wallet.currency.ilike(search_term)))
+        count += lambda s: s.where(or_(Wallet.wallet_name.ilike(search_term), Wallet.currency.ilike(search_term)))
+    page += lambda s: s.order_by(Wallet.wallet_name).limit(limit).offset(offset)
+    return page, count
+
+def adjust_wallet_balance(wallet_id: UUID, adjustment: Decimal) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: update(wallets_table)
+        .where(wallets_table.c.wallet_id == wallet_id)
+        .values(current_balance=wallets_table.c.current_balance + adjustment)
+    )
+
+def append_balance_delta(wallet_id: UUID, adjustment: Decimal) -> StatementLambdaElement:
+    return lambda_stmt(lambda: insert(deltas_table).values(wallet_id=wallet_id, amount=adjustment))
+
+# --- Categories ---
+
+# Rows held by the in-memory category tables (see app.crud.category)
+CATEGORY_CACHE_SELECT = select(Category.category_id, Category.user_id, Category.category_name, Category.type)
+
+def system_categories() -> StatementLambdaElement:
+    return lambda_stmt(lambda: CATEGORY_CACHE_SELECT.where(Category.user_id.is_(None)))
+
+def user_categories(user_id: UUID) -> StatementLambdaElement:
+    """The user's own categories only: a plain equality on the indexed user_id."""
+    return lambda_stmt(lambda: CATEGORY_CACHE_SELECT.where(Category.user_id == user_id))
+
+# --- Transactions ---
+
+def transaction_by_id(transaction_id: UUID, user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Transaction)
+        .where(Transaction.transaction_id == transaction_id)
+        .where(Transaction.wallet_id.in_(select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()))
+    )
+
+def transaction_for_update(transaction_id: UUID, user_id: UUID) -> StatementLambdaElement:
+    """transaction_by_id that also locks the row, so concurrent updates/deletes see its latest amount and wallet."""
+    return lambda_stmt(
+        lambda: select(Transaction)
+        .where(Transaction.transaction_id == transaction_id)
+        .where(Transaction.wallet_id.in_(select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()))
+        .with_for_update(of=Transaction)
+        .execution_options(populate_existing=True)
+    )
+
+def transactions_page(user_id: UUID, q: Optional[str], limit: int, offset: int) -> PageStatements:
+    page = lambda_stmt(
+        lambda: TRANSACTION_LIST_SELECT
+        .where(Transaction.wallet_id.in_(select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()))
+    )
+    count = lambda_stmt(
+        lambda: select(func.count()).select_from(Transaction)
+        .where(Transaction.wallet_id.in_(select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()))
+    )
+    if q:
+        search_term = f"%{q}%"
+        page += lambda s: s.where(Transaction.description.ilike(search_term))
+        count += lambda s: s.where(Transaction.description.ilike(search_term))
+    page += lambda s: s.order_by(Transaction.transaction_date.desc()).limit(limit).offset(offset)
+    return page, count
+
+def financial_summary(user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(TOTAL_INCOME, TOTAL_EXPENSE)
+        .where(Transaction.wallet_id.in_(select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()))
+    )
+
+# --- Debts ---
+
+def debt_by_id(ledger_id: UUID, user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(DebtLedger).where(DebtLedger.ledger_id == ledger_id).where(DebtLedger.user_id == user_id)
+    )
+
+def debts_page(user_id: UUID, q: Optional[str], limit: int, offset: int) -> PageStatements:
+    page = lambda_stmt(lambda: DEBT_LIST_SELECT.where(DebtLedger.user_id == user_id))
+    count = lambda_stmt(lambda: select(func.count()).select_from(DebtLedger).where(DebtLedger.user_id == user_id))
+    if q:
+        search_term = f"%{q}%"
+        page += lambda s: s.where(or_(DebtLedger.contact_name.ilike(search_term), DebtLedger.phone_number.ilike(search_term)))
+        count += lambda s: s.where(or_(DebtLedger.contact_name.ilike(search_term), DebtLedger.phone_number.ilike(search_term)))
+    page += lambda s: s.order_by(DebtLedger.due_date).limit(limit).offset(offset)
+    return page, count
+
+# --- Budgets ---
+
+def budget_by_id(budget_id: UUID, user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Budget).where(Budget.budget_id == budget_id).where(Budget.user_id == user_id)
+    )
+
+def budgets_page(user_id: UUID, limit: int, offset: int) -> PageStatements:
+    page = lambda_stmt(
+        lambda: BUDGET_LIST_SELECT.where(Budget.user_id == user_id).order_by(Budget.start_date.desc()).limit(limit).offset(offset)
+    )
+    count = lambda_stmt(lambda: select(func.count()).select_from(Budget).where(Budget.user_id == user_id))
+    return page, count
+
+# --- Delta Sync ---
+# Per-entity scans in (row_xid, row_version) order: changes after the client's cursor whose
+# writer transaction is below `watermark`, i.e. finished (see app.crud.sync), oldest first.
+# Each is served by an (owner, row_xid, row_version) index. Cursor values are typed BIGINT
+# explicitly (asyncpg would otherwise bind them as INTEGER).
+
+def wallets_changed(
+    user_id: UUID, since_xid: int, since_version: int, watermark: int, limit: int, include_pending: bool = False
+) -> StatementLambdaElement:
+    """include_pending: rows are (Wallet, balance including pending deltas)."""
+    if include_pending:
+        stmt = lambda_stmt(lambda: select(Wallet, WALLET_BALANCE_WITH_PENDING))
+    else:
+        stmt = lambda_stmt(lambda: select(Wallet))
+    stmt += (
+        lambda s: s.where(Wallet.user_id == user_id)
+        .where(tuple_(Wallet.row_xid, Wallet.row_version) > tuple_(type_coerce(since_xid, BigInteger), type_coerce(since_version, BigInteger)))
+        .where(Wallet.row_xid < watermark)
+        .order_by(Wallet.row_xid, Wallet.row_version)
+        .limit(limit)
+    )
+    return stmt
+
+def categories_changed(user_id: UUID, since_xid: int, since_version: int, watermark: int, limit: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Category)
+        .where(or_(Category.user_id == user_id, Category.user_id.is_(None)))
+        .where(tuple_(Category.row_xid, Category.row_version) > tuple_(type_coerce(since_xid, BigInteger), type_coerce(since_version, BigInteger)))
+        .where(Category.row_xid < watermark)
+        .order_by(Category.row_xid, Category.row_version)
+        .limit(limit)
+    )
+
+def transactions_changed(user_id: UUID, since_xid: int, since_version: int, watermark: int, limit: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Transaction)
+        .where(Transaction.wallet_id.in_(select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()))
+        .where(tuple_(Transaction.row_xid, Transaction.row_version) > tuple_(type_coerce(since_xid, BigInteger), type_coerce(since_version, BigInteger)))
+        .where(Transaction.row_xid < watermark)
+        .order_by(Transaction.row_xid, Transaction.row_version)
+        .limit(limit)
+    )
+
+def budgets_changed(user_id: UUID, since_xid: int, since_version: int, watermark: int, limit: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Budget)
+        .where(Budget.user_id == user_id)
+        .where(tuple_(Budget.row_xid, Budget.row_version) > tuple_(type_coerce(since_xid, BigInteger), type_coerce(since_version, BigInteger)))
+        .where(Budget.row_xid < watermark)
+        .order_by(Budget.row_xid, Budget.row_version)
+        .limit(limit)
+    )
+
+def debts_changed(user_id: UUID, since_xid: int, since_version: int, watermark: int, limit: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(DebtLedger)
+        .where(DebtLedger.user_id == user_id)
+        .where(tuple_(DebtLedger.row_xid, DebtLedger.row_version) > tuple_(type_coerce(since_xid, BigInteger), type_coerce(since_version, BigInteger)))
+        .where(DebtLedger.row_xid < watermark)
+        .order_by(DebtLedger.row_xid, DebtLedger.row_version)
+        .limit(limit)
+    )
+
+def tombstones_since(user_id: UUID, since_xid: int, since_version: int, watermark: int, limit: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(SyncTombstone)
+        .where(SyncTombstone.user_id == user_id)
+        .where(tuple_(SyncTombstone.row_xid, SyncTombstone.row_version) > tuple_(type_coerce(since_xid, BigInteger), type_coerce(since_version, BigInteger)))
+        .where(SyncTombstone.row_xid < watermark)
+        .order_by(SyncTombstone.row_xid, SyncTombstone.row_version)
+        .limit(limit)
+    )
@@ -0,0 +1,123 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from app.crud import statements
+from app.crud.wallet import with_exact_balances
+from app.core.config import settings
+from app.schemas.budget import BudgetResponse
+from app.schemas.category import CategoryResponse
+from app.schemas.debt import DebtLedgerResponse
+from app.schemas.sync import SyncChange
+from app.schemas.transaction import TransactionResponse
+from app.schemas.wallet import WalletResponse
+
+# entity name -> (version scan, primary key attribute, response schema)
+SYNCED_ENTITIES = {
+    "wallet": (statements.wallets_changed, "wallet_id", WalletResponse),
+    "category": (statements.categories_changed, "category_id", CategoryResponse),
+    "transaction": (statements.transactions_changed, "transaction_id", TransactionResponse),
+    "budget": (statements.budgets_changed, "budget_id", BudgetResponse),
+    "debt": (statements.debts_changed, "ledger_id", DebtLedgerResponse),
+}
+
+TOMBSTONE_PRUNER_LOCK_KEY = 4_726_371_004
+
+# Row versions are drawn at write time, and writers commit in any order, so a version cursor
+# alone would skip a change that becomes visible after higher versions were served. Changes are
+# therefore paged by (writer transaction id, row version), and only changes of transactions
+# older than the oldest still running are served: those can no longer commit, so nothing can
+# appear behind a cursor later. A long-running writer delays (never loses) other changes.
+SYNC_WATERMARK_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+PRUNED_XID_SQL = text("SELECT pruned_xid FROM sync_horizon WHERE id = 1")
+
+# Retention: old tombstones are deleted in batches; sync_horizon remembers the newest deleted
+# one, and cursors at or below it are told to resync from scratch (they may have missed it)
+PRUNE_TOMBSTONES_SQL = text("""
+WITH pruned AS (
+    DELETE FROM sync_tombstones
+    WHERE row_version IN (
+        SELECT row_version FROM sync_tombstones
+        WHERE updated_at < now() - make_interval(days => :retention_days)
+        LIMIT :batch_size
+    )
+    RETURNING row_xid
+), horizon AS (
+    UPDATE sync_horizon SET pruned_xid = greatest(pruned_xid, (SELECT max(row_xid) FROM pruned))
+    WHERE id = 1
+)
+SELECT count(*) FROM pruned
+""")
+
+# (row_xid, row_version) of the last change a client received
+SyncCursor = Tuple[int, int]
+START_CURSOR: SyncCursor = (0, 0)
+
+def parse_cursor(cursor: Optional[str]) -> Optional[SyncCursor]:
+    """Cursor from a previous page ("<xid>.<version>"); empty or "0" starts a full sync. None if malformed."""
+    if not cursor or cursor == "0":
+        return START_CURSOR
+    xid, _, version = cursor.partition(".")
+    if not (xid.isdigit() and version.isdigit()):
+        return None
+    return int(xid), int(version)
+
+def format_cursor(cursor: SyncCursor) -> str:
+    return f"{cursor[0]}.{cursor[1]}"
+
+async def get_changes_since(
+    db: AsyncSession, user_id: UUID, since: SyncCursor, limit: int
+) -> Optional[Tuple[List[SyncChange], SyncCursor, bool]]:
+    """
+    Returns (changes, next_cursor, has_more): the `limit` oldest changes after `since`, across
+    all synced entities and deletions. Each entity is scanned for at most `limit` rows, so the
+    merged first `limit` are exactly the global oldest. Returns None when `since` is older than
+    the tombstone retention: deletions may have been missed, the client must sync from scratch.
+    """
+    watermark = (await db.execute(SYNC_WATERMARK_SQL)).scalar_one()
+    since_xid, since_version = since
+    changes: List[Tuple[SyncCursor, SyncChange]] = []
+
+    for entity, (changed, pk, schema) in SYNCED_ENTITIES.items():
+        if entity == "wallet" and settings.WALLET_BALANCE_DELTAS:
+            stmt = changed(user_id, since_xid, since_version, watermark, limit + 1, include_pending=True)
+            rows = with_exact_balances((await db.execute(stmt)).all())
+        else:
+            rows = (await db.execute(changed(user_id, since_xid, since_version, watermark, limit + 1))).scalars().all()
+        changes.extend(
+            ((row.row_xid, row.row_version),
+             SyncChange(entity=entity, op="upsert", id=getattr(row, pk), version=row.row_version, data=schema.model_validate(row)))
+            for row in rows
+        )
+
+    stmt = statements.tombstones_since(user_id, since_xid, since_version, watermark, limit + 1)
+    tombstones = (await db.execute(stmt)).scalars().all()
+    changes.extend(
+        ((t.row_xid, t.row_version), SyncChange(entity=t.entity, op="delete", id=t.entity_id, version=t.row_version))
+        for t in tombstones
+    )
+
+    # Checked after the scans: a tombstone pruned meanwhile has already advanced the horizon
+    if since != START_CURSOR and since_xid <= (await db.execute(PRUNED_XID_SQL)).scalar_one():
+        return None
+
+    changes.sort(key=lambda item: item[0])
+    has_more = len(changes) > limit
+    page = changes[:limit]
+    next_cursor = page[-1][0] if page else since
+    return [change for _, change in page], next_cursor, has_more
+
+async def prune_sync_tombstones(db: AsyncSession) -> int:
+    """Deletes up to SYNC_TOMBSTONE_PRUNE_BATCH_SIZE expired tombstones; returns how many."""
+    got_lock = (await db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": TOMBSTONE_PRUNER_LOCK_KEY})).scalar()
+    if not got_lock:
+        await db.rollback()
+        return 0
+    result = await db.execute(PRUNE_TOMBSTONES_SQL, {
+        "retention_days": settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+        "batch_size": settings.SYNC_TOMBSTONE_PRUNE_BATCH_SIZE,
+    })
+    pruned = result.scalar_one()
+    await db.commit()
+    return pruned
@@ -1,18 +1,23 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import delete, update, func, or_
-from typing import List, Optional, Tuple
+from sqlalchemy import Row, delete, update, func, or_
+from sqlalchemy.exc import DBAPIError
+from typing import Optional, Sequence, Tuple
 from decimal import Decimal
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from app.models.transaction import Transaction
-from app.models.wallet import Wallet
 from app.models.category import TransactionType
 from app.schemas.transaction import TransactionCreate
+from app.crud import statements
+from app.crud.outbox import record_change, OP_CREATE, OP_UPDATE, OP_DELETE
+from app.crud.wallet import adjust_balance
+from app.crud.category import get_category_by_id, invalidate_user_categories
+from app.core.config import settings
+from app.core.retry import is_foreign_key_violation, retry_on_conflict
 
 # --- Helper Function for Balance Update ---
 
-async def _update_wallet_balance(db: AsyncSession, wallet_id: UUID, amount: Decimal, type: TransactionType, is_reversal: bool = False):
+async def _update_wallet_balance(db: AsyncSession, wallet_id: UUID, amount: Decimal, type: TransactionType, user_id: UUID, is_reversal: bool = False):
     """Adjusts the Wallet balance based on transaction amount and type."""
     
     sign = 1 if type == TransactionType.INCOME else -1
@@ -22,29 +27,32 @@ async def _update_wallet_balance(db: AsyncSession, wallet_id: UUID, amount: Deci
     
     adjustment = sign * amount
 
-    # 2. Construct the update statement (rest is correct)
-    stmt = (
-        update(Wallet)
-        .where(Wallet.wallet_id == wallet_id)
-        .values(
-            current_balance=Wallet.current_balance + adjustment
-        )
-    )
-    
-    await db.execute(stmt)
+    # 2. Relative update of the wallet row, or an appended delta in WALLET_BALANCE_DELTAS mode
+    await adjust_balance(db, wallet_id, adjustment, user_id)
+
+async def _reject_stale_category(db: AsyncSession, user_id: UUID, exc: DBAPIError) -> bool:
+    """
+    True (transaction rolled back) when exc is the category foreign key failing: the category
+    was deleted after it was cached. Drops the stale entry so the next lookup reloads it.
+    """
+    if not is_foreign_key_violation(exc):
+        return False
+    await db.rollback()
+    await invalidate_user_categories(user_id)
+    return True
+
+async def _lock_owned_wallets(db: AsyncSession, user_id: UUID, *wallet_ids: UUID) -> bool:
+    """Locks the given wallets in canonical (wallet_id) order; False if any is not owned by the user."""
+    stmt = statements.lock_owned_wallets(user_id, wallet_ids, exclusive=not settings.WALLET_BALANCE_DELTAS)
+    locked = (await db.execute(stmt)).scalars().all()
+    return len(locked) == len(set(wallet_ids))
     
 # --- Read Operations ---
 
 async def get_transaction_by_id(db: AsyncSession, transaction_id: UUID, user_id: UUID) -> Optional[Transaction]:
     """Retrieves a single transaction by ID, ensuring user owns the related wallet."""
-    # Subquery to check for user ownership of the wallet
-    wallet_check = select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()
-    
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.transaction_id == transaction_id)
-        .where(Transaction.wallet_id.in_(wallet_check))
-    )
+    # Ownership is checked via a subquery on the user's wallets
+    result = await db.execute(statements.transaction_by_id(transaction_id, user_id))
     return result.scalars().first()
 
 async def get_all_transactions_for_user(
@@ -53,43 +61,40 @@ async def get_all_transactions_for_user(
     q: Optional[str] = None, 
     limit: int = 10, 
     offset: int = 0
-) -> Tuple[List[Transaction], int]:
+) -> Tuple[Sequence[Row], int]:
     """Retrieves transactions for a specific user with search, pagination, and total count."""
     
-    # 1. Base query: Filter by transactions whose wallet is owned by the user.
-    wallet_check = select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()
-    base_query = select(Transaction).where(Transaction.wallet_id.in_(wallet_check))
-    
-    # 2. Apply Search Filter
-    if q:
-        search_term = f"%{q}%"
-        base_query = base_query.where(Transaction.description.ilike(search_term))
+    # 1. Transactions whose wallet is owned by the user; search filter, ordering
+    # and pagination are part of the cached statements.
+    page_query, count_query = statements.transactions_page(user_id, q, limit, offset)
         
-    # 3. Get Total Count
-    count_query = select(func.count()).select_from(base_query.subquery())
+    # 2. Get Total Count
     total_result = await db.execute(count_query)
     total_count = total_result.scalar_one()
 
-    # 4. Apply Ordering and Pagination
-    final_query = base_query.order_by(Transaction.transaction_date.desc()).limit(limit).offset(offset)
-    
-    result = await db.execute(final_query)
-    transactions = result.scalars().all()
+    # 3. Fetch the page
+    result = await db.execute(page_query)
+    transactions = result.all()
     
     return transactions, total_count
 
 # --- Write Operations ---
 
+@retry_on_conflict
 async def create_transaction(db: AsyncSession, transaction_in: TransactionCreate, user_id: UUID) -> Optional[Transaction]:
     """Creates a new transaction, validates user ownership of wallet, and updates the wallet balance."""
     
-    # CRITICAL VALIDATION: Ensure user owns the wallet
-    wallet_check = select(Wallet).where(Wallet.wallet_id == transaction_in.wallet_id).where(Wallet.user_id == user_id)
-    if not (await db.execute(wallet_check)).scalar_one_or_none():
+    # The category must be a system default or the user's own (in-memory lookup, see crud.category)
+    if await get_category_by_id(db, transaction_in.category_id, user_id) is None:
+        return None
+
+    # CRITICAL VALIDATION: Ensure user owns the wallet (and lock it for the balance update)
+    if not await _lock_owned_wallets(db, user_id, transaction_in.wallet_id):
         return None # Wallet not found or not owned by user
 
     # 1. Create the database model instance
     db_transaction = Transaction(
+        transaction_id=uuid4(), # Known before flush, for the outbox event
         wallet_id=transaction_in.wallet_id,
         category_id=transaction_in.category_id,
         transaction_type=transaction_in.transaction_type,
@@ -99,6 +104,12 @@ async def create_transaction(db: AsyncSession, transaction_in: TransactionCreate
     )
     
     db.add(db_transaction)
+    try:
+        await db.flush() # Category FK checked here (wallet ownership is already locked in)
+    except DBAPIError as exc:
+        if not await _reject_stale_category(db, user_id, exc):
+            raise
+        return None
     
     # 2. Update the Wallet balance
     await _update_wallet_balance(
@@ -106,28 +117,42 @@ async def create_transaction(db: AsyncSession, transaction_in: TransactionCreate
         wallet_id=db_transaction.wallet_id, 
         amount=db_transaction.amount, 
         type=db_transaction.transaction_type,
+        user_id=user_id,
         is_reversal=False
     )
     
+    record_change(db, "transaction", db_transaction.transaction_id, user_id, OP_CREATE)
     await db.commit()
     await db.refresh(db_transaction)
     
     return db_transaction
 
+@retry_on_conflict
 async def update_transaction(db: AsyncSession, transaction_id: UUID, user_id: UUID, transaction_in: TransactionCreate) -> Optional[Transaction]:
     """Updates an existing transaction, reverting the old balance change and applying the new one."""
     
-    # 1. Retrieve old transaction and ensure ownership
-    old_transaction = await get_transaction_by_id(db, transaction_id, user_id)
+    if await get_category_by_id(db, transaction_in.category_id, user_id) is None:
+        return None
+
+    # 1. Retrieve (and lock) old transaction and ensure ownership
+    old_transaction = (await db.execute(statements.transaction_for_update(transaction_id, user_id))).scalars().first()
     if not old_transaction:
         return None
 
+    # Lock the old and new wallet in canonical order before touching either balance;
+    # this also rejects moving the transaction into a wallet the user does not own.
+    new_wallet_id = transaction_in.wallet_id or old_transaction.wallet_id
+    if not await _lock_owned_wallets(db, user_id, old_transaction.wallet_id, new_wallet_id):
+        await db.rollback()
+        return None
+
     # 2. Reverse the effect of the old transaction on its wallet
     await _update_wallet_balance(
         db, 
         wallet_id=old_transaction.wallet_id, 
         amount=old_transaction.amount, 
         type=old_transaction.transaction_type,
+        user_id=user_id,
         is_reversal=True
     )
     
@@ -141,7 +166,12 @@ async def update_transaction(db: AsyncSession, transaction_id: UUID, user_id: UU
         .returning(Transaction)
     )
     
-    updated_transaction_result = await db.execute(stmt)
+    try:
+        updated_transaction_result = await db.execute(stmt)
+    except DBAPIError as exc:
+        if not await _reject_stale_category(db, user_id, exc):
+            raise
+        return None
     updated_transaction = updated_transaction_result.scalars().first()
     
     # 4. Apply the effect of the new transaction on its (potentially new) wallet
@@ -151,18 +181,22 @@ async def update_transaction(db: AsyncSession, transaction_id: UUID, user_id: UU
             wallet_id=updated_transaction.wallet_id,
             amount=updated_transaction.amount,
             type=updated_transaction.transaction_type,
+            user_id=user_id,
             is_reversal=False
         )
+        record_change(db, "transaction", transaction_id, user_id, OP_UPDATE)
     
     await db.commit()
     
     return updated_transaction
 
+@retry_on_conflict
 async def delete_transaction(db: AsyncSession, transaction_id: UUID, user_id: UUID) -> bool:
     """Deletes a transaction and reverts the change to the associated wallet balance."""
     
-    # 1. Retrieve transaction and ensure ownership
-    transaction_to_delete = await get_transaction_by_id(db, transaction_id, user_id)
+    # 1. Retrieve (and lock) transaction and ensure ownership; a concurrent delete
+    # waits here and then finds nothing, so the balance is only reversed once
+    transaction_to_delete = (await db.execute(statements.transaction_for_update(transaction_id, user_id))).scalars().first()
     if not transaction_to_delete:
         return False
     
@@ -172,6 +206,7 @@ async def delete_transaction(db: AsyncSession, transaction_id: UUID, user_id: UU
         wallet_id=transaction_to_delete.wallet_id,
         amount=transaction_to_delete.amount,
         type=transaction_to_delete.transaction_type,
+        user_id=user_id,
         is_reversal=True
     )
     
@@ -182,6 +217,8 @@ async def delete_transaction(db: AsyncSession, transaction_id: UUID, user_id: UU
     )
     
     result = await db.execute(stmt)
+    if result.rowcount:
+        record_change(db, "transaction", transaction_id, user_id, OP_DELETE)
     await db.commit()
     
     return result.rowcount > 0
\ No newline at end of file
@@ -1,31 +1,39 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.crud import statements
+from app.crud.outbox import record_change, OP_CREATE, OP_UPDATE
 import uuid
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],
-    deprecated="auto",
-)
-
-def get_password_hash(password: str) -> str:
-    """Securely hashes the provided password."""
-    truncated_password = password.encode('utf-8')[:72]
-    return pwd_context.hash(truncated_password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifies a plain password against the stored hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+# Pooled async hashing (the sync helpers in app.core.hashing are for scripts only)
+from app.core.hashing import hash_password, check_password
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """Retrieves a user object by email address."""
-    result = await db.execute(
-        select(User).where(User.email == email)
-    )
+    result = await db.execute(statements.user_by_email(email))
     return result.scalars().first()
 
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
+    """
+    Returns the user if the credentials are valid, otherwise None.
+    Verification runs in the hashing pool; if the stored hash was created with an
+    outdated cost, it is transparently replaced with one using the current settings.
+    """
+    user = await get_user_by_email(db, email=email)
+    if not user:
+        return None
+
+    is_valid, new_hash = await check_password(password, user.password_hash)
+    if not is_valid:
+        return None
+
+    if new_hash:
+        user.password_hash = new_hash
+        db.add(user)
+        record_change(db, "user", user.user_id, user.user_id, OP_UPDATE)
+        await db.commit()
+
+    return user
+
 
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User | None:
     """
@@ -37,7 +45,7 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User | None:
         return None 
 
     # Hash the password for secure storage
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await hash_password(user_in.password)
     
     # Create the database model instance
     db_user = User(
@@ -51,6 +59,7 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User | None:
     
     # Add to session and commit
     db.add(db_user)
+    record_change(db, "user", db_user.user_id, db_user.user_id, OP_CREATE)
     await db.commit()
     await db.refresh(db_user)
     
@@ -1,19 +1,80 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import delete, update, func, or_
-from typing import List, Optional, Tuple
-from uuid import UUID
+from sqlalchemy import Row, delete, update, text
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Iterable, List, Optional, Sequence, Tuple
+from decimal import Decimal
+from uuid import UUID, uuid4
 
 from app.models.wallet import Wallet
+from app.crud import statements
+from app.crud.outbox import record_change, OP_CREATE, OP_UPDATE, OP_DELETE
+from app.core.config import settings
 from app.schemas.wallet import WalletCreate, WalletBase
 
+# --- Balance Deltas (WALLET_BALANCE_DELTAS mode) ---
+
+# Folds one batch of deltas into their wallets in a single statement, so any reader sees
+# either the deltas or the updated balance, never both. SKIP LOCKED leaves deltas of
+# still-open writer transactions for the next round.
+COMPACT_DELTAS_SQL = text("""
+WITH moved AS (
+    DELETE FROM wallet_balance_deltas
+    WHERE delta_id IN (
+        SELECT delta_id FROM wallet_balance_deltas
+        ORDER BY delta_id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING wallet_id, amount
+), totals AS (
+    SELECT wallet_id, sum(amount) AS amount FROM moved GROUP BY wallet_id
+)
+UPDATE wallets SET current_balance = wallets.current_balance + totals.amount
+FROM totals
+WHERE wallets.wallet_id = totals.wallet_id
+""")
+
+# Single compactor cluster-wide, so compactors never contend for the same wallet rows
+COMPACTOR_LOCK_KEY = 4_726_371_002
+
+async def adjust_balance(db: AsyncSession, wallet_id: UUID, adjustment: Decimal, user_id: UUID) -> None:
+    """Applies a balance change: a pending delta row in deltas mode, otherwise an in-place update."""
+    if settings.WALLET_BALANCE_DELTAS:
+        await db.execute(statements.append_balance_delta(wallet_id, adjustment))
+    else:
+        await db.execute(statements.adjust_wallet_balance(wallet_id, adjustment))
+    record_change(db, "wallet", wallet_id, user_id, OP_UPDATE)
+
+def with_exact_balances(rows: Iterable[Row]) -> List[Wallet]:
+    """
+    (Wallet, balance including pending deltas) rows, read in one statement, to wallets carrying
+    that balance. Committed value: the session must never flush it back as the stored balance.
+    """
+    wallets = []
+    for wallet, balance in rows:
+        set_committed_value(wallet, "current_balance", balance)
+        wallets.append(wallet)
+    return wallets
+
+async def compact_balance_deltas(db: AsyncSession) -> int:
+    """Folds up to BALANCE_COMPACT_BATCH_SIZE pending deltas into wallets; returns the number of wallets updated."""
+    got_lock = (await db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": COMPACTOR_LOCK_KEY})).scalar()
+    if not got_lock:
+        await db.rollback()
+        return 0
+    result = await db.execute(COMPACT_DELTAS_SQL, {"batch_size": settings.BALANCE_COMPACT_BATCH_SIZE})
+    await db.commit()
+    return result.rowcount
+
+# --- Read Operations ---
+
 async def get_wallet_by_id(db: AsyncSession, wallet_id: UUID, user_id: UUID) -> Optional[Wallet]:
     """Retrieves a single wallet by ID, owned by the specified user."""
-    result = await db.execute(
-        select(Wallet)
-        .where(Wallet.wallet_id == wallet_id)
-        .where(Wallet.user_id == user_id)
-    )
+    if settings.WALLET_BALANCE_DELTAS:
+        result = await db.execute(statements.wallet_by_id(wallet_id, user_id, include_pending=True))
+        wallets = with_exact_balances(result.all())
+        return wallets[0] if wallets else None
+    result = await db.execute(statements.wallet_by_id(wallet_id, user_id))
     return result.scalars().first()
 
 async def get_all_wallets_for_user(
@@ -22,30 +83,22 @@ async def get_all_wallets_for_user(
     q: Optional[str] = None, 
     limit: int = 10, 
     offset: int = 0
-) -> Tuple[List[Wallet], int]:
+) -> Tuple[Sequence[Row], int]:
     """
     Retrieves all wallets for a specific user with search, pagination, 
     and returns the list and total count.
+    Rows carry only the WalletResponse columns (no ORM instances); in WALLET_BALANCE_DELTAS
+    mode current_balance already includes the pending deltas.
     """
-    base_query = select(Wallet).where(Wallet.user_id == user_id)
-    
-    if q:
-        search_term = f"%{q}%"
-        base_query = base_query.where(
-            or_(
-                Wallet.wallet_name.ilike(search_term),
-                Wallet.currency.ilike(search_term),
-            )
-        )
-        
-    count_query = select(func.count()).select_from(base_query.subquery())
+    page_query, count_query = statements.wallets_page(
+        user_id, q, limit, offset, include_pending=settings.WALLET_BALANCE_DELTAS
+    )
+
     total_result = await db.execute(count_query)
     total_count = total_result.scalar_one()
 
-    final_query = base_query.order_by(Wallet.wallet_name).limit(limit).offset(offset)
-    
-    result = await db.execute(final_query)
-    wallets = result.scalars().all()
+    result = await db.execute(page_query)
+    wallets = result.all()
     
     return wallets, total_count
 
@@ -54,6 +107,7 @@ async def get_all_wallets_for_user(
 async def create_wallet(db: AsyncSession, wallet_in: WalletCreate, user_id: UUID) -> Wallet:
     """Creates a new wallet for the specified user."""
     db_wallet = Wallet(
+        wallet_id=uuid4(), # Known before flush, for the outbox event
         user_id=user_id,
         wallet_name=wallet_in.wallet_name,
         currency=wallet_in.currency,
@@ -61,6 +115,7 @@ async def create_wallet(db: AsyncSession, wallet_in: WalletCreate, user_id: UUID
     )
     
     db.add(db_wallet)
+    record_change(db, "wallet", db_wallet.wallet_id, user_id, OP_CREATE)
     await db.commit()
     await db.refresh(db_wallet)
     
@@ -80,9 +135,15 @@ async def update_wallet(db: AsyncSession, wallet_id: UUID, user_id: UUID, wallet
     )
     
     result = await db.execute(stmt)
+    wallet = result.scalars().first()
+    if wallet:
+        record_change(db, "wallet", wallet_id, user_id, OP_UPDATE)
     await db.commit()
+    if wallet and settings.WALLET_BALANCE_DELTAS:
+        # RETURNING carries the stored balance only; re-read it with the pending deltas
+        return await get_wallet_by_id(db, wallet_id, user_id)
     
-    return result.scalars().first()
+    return wallet
 
 async def delete_wallet(db: AsyncSession, wallet_id: UUID, user_id: UUID) -> bool:
     """Deletes a wallet owned by the specified user."""
@@ -93,6 +154,8 @@ async def delete_wallet(db: AsyncSession, wallet_id: UUID, user_id: UUID) -> boo
     )
     
     result = await db.execute(stmt)
+    if result.rowcount:
+        record_change(db, "wallet", wallet_id, user_id, OP_DELETE)
     await db.commit()
     
     return result.rowcount > 0
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+One-off database bootstrap: applies schema migrations (including system categories) and seeds the mock user.
+
+Run once per deploy (e.g. as a release/pre-start command), not in every worker:
+    python -m app.initial_data
+"""
+import asyncio
+
+from app.core.db import engine, init_db
+from app.core.hashing import shutdown_hash_pool
+
+async def main():
+    try:
+        await init_db()
+    finally:
+        shutdown_hash_pool()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
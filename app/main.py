@@ -1,24 +1,78 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from app.core.db import init_db
+import asyncio
+import time
+from app.core.config import settings
+from app.core.db import engine, read_engine, AsyncSessionLocal, init_db, warm_up_pool
+from app.core.redis import redis_client
+from app.core.migrations import run_migrations
+from app.core.hashing import PasswordHashPoolSaturated, shutdown_hash_pool
+from app.core.token_store import run_revocation_sync
+from app.core.balance_compactor import run_balance_compactor
+from app.core.outbox_relay import run_outbox_relay
+from app.core.sync_retention import run_sync_tombstone_pruner
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.responses import FastJSONResponse
+from app.core import request_timing
+from app.core import metrics
+from app.core import slow_queries
+from app.core import profiling
+from prometheus_client import CONTENT_TYPE_LATEST
 from app.api.v1.endpoints import router as api_router
+from app.api.v1.dependencies import require_internal_key
+from app.crud.category import load_system_categories
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
-    print("Application startup complete.")
+    started = time.perf_counter()
+    if settings.DB_INIT_ON_STARTUP:
+        await init_db()
+    elif settings.DB_MIGRATE_ON_STARTUP:
+        await run_migrations(engine)
+    await warm_up_pool()
+    # Tabel kategori sistem (immutable) dimuat sekali per worker
+    async with AsyncSessionLocal() as db:
+        await load_system_categories(db)
+    revocation_sync = asyncio.create_task(run_revocation_sync())
+    balance_compactor = asyncio.create_task(run_balance_compactor()) if settings.BALANCE_COMPACTOR_ENABLED else None
+    outbox_relay = asyncio.create_task(run_outbox_relay()) if settings.OUTBOX_RELAY_ENABLED else None
+    tombstone_pruner = asyncio.create_task(run_sync_tombstone_pruner())
+    loop_lag_monitor = asyncio.create_task(metrics.run_loop_lag_monitor()) if settings.METRICS_ENABLED else None
+    print(f"Application startup complete in {(time.perf_counter() - started) * 1000:.1f} ms.")
     yield
+    revocation_sync.cancel()
+    if balance_compactor:
+        balance_compactor.cancel()
+    if outbox_relay:
+        outbox_relay.cancel()
+    tombstone_pruner.cancel()
+    if loop_lag_monitor:
+        loop_lag_monitor.cancel()
+    shutdown_hash_pool()
     print("Application shutdown complete.")
 
 app = FastAPI(
     title="Finanzio Backend API",
     version="1.0.0",
     description="Backend services for the multiplatform personal finance and SME bookkeeping application.",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 # ---------------------------------
 
+# 0a. Kompresi gzip/brotli (paling dalam: hanya membungkus respons aplikasi)
+app.add_middleware(CompressionMiddleware)
+
+# 0b. Rate limiting (ditambahkan sebelum CORS agar respons 429 tetap membawa header CORS)
+app.add_middleware(RateLimitMiddleware)
+
+# 0c. Alamat klien asli dari proxy tepercaya (di luar rate limiting, yang membaca scope["client"])
+app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.FORWARDED_ALLOW_IPS)
+
 # 1. Tentukan origins yang diizinkan. Gunakan "*" untuk development agar 
 # bisa diakses dari port localhost manapun (e.g., Flutter web development server).
 origins = [
@@ -37,11 +91,54 @@ app.add_middleware(
     allow_headers=["*"], # Mengizinkan semua header (termasuk Content-Type yang dibutuhkan Dio)
 )
 
+# 3. Server-Timing (membungkus rate limiting dan CORS, agar waktunya ikut terhitung; Metrics dan
+# Profiler di bawah ditambahkan setelahnya, jadi berada di luarnya dan tidak termasuk dalam total)
+if settings.SERVER_TIMING_ENABLED:
+    request_timing.instrument_engine(engine)
+    if read_engine is not engine:
+        request_timing.instrument_engine(read_engine)
+    request_timing.instrument_redis(redis_client)
+    app.add_middleware(request_timing.ServerTimingMiddleware)
+
+# 4. Prometheus metrics per route template
+if settings.METRICS_ENABLED:
+    metrics.instrument_pool(engine, "primary")
+    if read_engine is not engine:
+        metrics.instrument_pool(read_engine, "replica")
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# 5. Slow-query log (plans disimpan lewat primary, juga untuk query di replica)
+if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+    slow_queries.instrument_engine(engine, AsyncSessionLocal)
+    if read_engine is not engine:
+        slow_queries.instrument_engine(read_engine, AsyncSessionLocal)
+
+# 6. Profiling on demand (header admin atau sampling), tanpa redeploy
+if profiling.is_available() and (settings.INTERNAL_API_KEY or settings.PROFILE_SAMPLE_RATE > 0):
+    app.add_middleware(profiling.ProfilerMiddleware)
+
 # ---------------------------------
 
+# Login/register bursts: shed load instead of queueing unbounded hashing work
+@app.exception_handler(PasswordHashPoolSaturated)
+async def password_hash_saturated_handler(request: Request, exc: PasswordHashPoolSaturated):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication service is busy. Please retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/")
 def read_root():
-    return {"message": "Finanzio API is running! Go to /docs for endpoints."}
\ No newline at end of file
+    return {"message": "Finanzio API is running! Go to /docs for endpoints."}
+
+if settings.METRICS_ENABLED:
+    # Route names, pool state and traffic volumes are internal: the scraper must send
+    # X-Internal-Key (Prometheus scrape_config `http_headers`), like /api/v1/internal/*
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_internal_key)])
+    def read_metrics():
+        # Sync endpoint: reading the multiprocess files runs in the threadpool, off the event loop
+        return Response(metrics.render_latest(), media_type=CONTENT_TYPE_LATEST)
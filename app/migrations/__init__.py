@@ -0,0 +1,11 @@
+"""
+Ordered schema migrations, applied by app.core.migrations.run_migrations().
+
+Each module is named vNNNN_<description>.py and defines:
+    VERSION: int           -- strictly increasing, no gaps
+    DESCRIPTION: str
+    async def upgrade(conn: AsyncConnection) -> None
+
+Migrations are frozen once released: never edit one, add a new version instead.
+They run inside a single transaction holding the migration advisory lock.
+"""
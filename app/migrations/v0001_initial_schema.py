@@ -0,0 +1,81 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 1
+DESCRIPTION = "Initial schema (users, wallets, categories, transactions, budgets, debt ledgers)"
+
+# IF NOT EXISTS everywhere: databases previously bootstrapped with create_all() are adopted as-is.
+STATEMENTS = [
+    """
+    DO $$ BEGIN
+        CREATE TYPE transactiontype AS ENUM ('INCOME', 'EXPENSE');
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id UUID PRIMARY KEY,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        first_name VARCHAR(100),
+        last_name VARCHAR(100),
+        is_active BOOLEAN,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS wallets (
+        wallet_id UUID PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users (user_id),
+        wallet_name VARCHAR(100) NOT NULL,
+        currency VARCHAR(10) NOT NULL,
+        current_balance NUMERIC(18, 2) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS categories (
+        category_id UUID PRIMARY KEY,
+        user_id UUID REFERENCES users (user_id),
+        category_name VARCHAR(50) NOT NULL,
+        type transactiontype NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS transactions (
+        transaction_id UUID PRIMARY KEY,
+        wallet_id UUID NOT NULL REFERENCES wallets (wallet_id),
+        category_id UUID NOT NULL REFERENCES categories (category_id),
+        transaction_type transactiontype NOT NULL,
+        amount NUMERIC(18, 2) NOT NULL,
+        description VARCHAR(255),
+        transaction_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS budgets (
+        budget_id UUID PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users (user_id),
+        category_id UUID NOT NULL REFERENCES categories (category_id),
+        amount_limit NUMERIC(18, 2) NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS debt_ledgers (
+        ledger_id UUID PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users (user_id),
+        contact_name VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(20),
+        is_debt_to_user BOOLEAN NOT NULL,
+        total_amount NUMERIC(18, 2) NOT NULL,
+        amount_paid NUMERIC(18, 2) NOT NULL,
+        due_date DATE,
+        is_settled BOOLEAN
+    )
+    """,
+]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
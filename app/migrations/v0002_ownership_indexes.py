@@ -0,0 +1,19 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 2
+DESCRIPTION = "Indexes for per-user ownership filters and list ordering"
+
+# Not CONCURRENTLY: migrations run inside a transaction. For very large existing tables,
+# create these CONCURRENTLY by hand first; IF NOT EXISTS then makes this a no-op.
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_wallets_user_id ON wallets (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_categories_user_id ON categories (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_transactions_wallet_id_transaction_date ON transactions (wallet_id, transaction_date DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_budgets_user_id_start_date ON budgets (user_id, start_date DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_debt_ledgers_user_id_due_date ON debt_ledgers (user_id, due_date)",
+]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 3
+DESCRIPTION = "Seed system transfer categories"
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # One bulk statement; rows that already exist (seeded by older init_db) are skipped
+    await conn.execute(text(
+        """
+        INSERT INTO categories (category_id, user_id, category_name, type) VALUES
+            ('ffffffff-0000-0000-0000-000000000001', NULL, 'Transfer In', 'INCOME'),
+            ('ffffffff-0000-0000-0000-000000000002', NULL, 'Transfer Out', 'EXPENSE')
+        ON CONFLICT (category_id) DO NOTHING
+        """
+    ))
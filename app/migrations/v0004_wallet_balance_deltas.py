@@ -0,0 +1,21 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 4
+DESCRIPTION = "Append-only wallet balance deltas (WALLET_BALANCE_DELTAS mode)"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS wallet_balance_deltas (
+        delta_id BIGSERIAL PRIMARY KEY,
+        wallet_id UUID NOT NULL REFERENCES wallets (wallet_id) ON DELETE CASCADE,
+        amount NUMERIC(18, 2) NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_wallet_balance_deltas_wallet_id ON wallet_balance_deltas (wallet_id)",
+]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,24 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 5
+DESCRIPTION = "Transactional outbox for the change feed"
+
+STATEMENTS = [
+    # Global, monotonically increasing change version (shared by everything that records changes)
+    "CREATE SEQUENCE IF NOT EXISTS change_version_seq",
+    """
+    CREATE TABLE IF NOT EXISTS outbox_events (
+        version BIGINT PRIMARY KEY DEFAULT nextval('change_version_seq'),
+        entity VARCHAR(32) NOT NULL,
+        entity_id UUID NOT NULL,
+        user_id UUID,
+        op VARCHAR(16) NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+    )
+    """,
+]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,73 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 6
+DESCRIPTION = "Row versions, updated_at and tombstones for delta sync"
+
+# (table, entity name, primary key column, index columns for the per-owner version scan)
+SYNCED_TABLES = [
+    ("wallets", "wallet", "wallet_id", "user_id, row_version"),
+    ("categories", "category", "category_id", "user_id, row_version"),
+    ("transactions", "transaction", "transaction_id", "wallet_id, row_version"),
+    ("budgets", "budget", "budget_id", "user_id, row_version"),
+    ("debt_ledgers", "debt", "ledger_id", "user_id, row_version"),
+]
+
+STATEMENTS = [
+    # Versions come from the same global sequence as outbox events. clock_timestamp() (not now())
+    # keeps updated_at in step with the version order, which the sync settle window relies on.
+    """
+    CREATE OR REPLACE FUNCTION bump_row_version() RETURNS trigger AS $$
+    BEGIN
+        NEW.row_version := nextval('change_version_seq');
+        NEW.updated_at := clock_timestamp();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sync_tombstones (
+        row_version BIGINT PRIMARY KEY DEFAULT nextval('change_version_seq'),
+        entity VARCHAR(32) NOT NULL,
+        entity_id UUID NOT NULL,
+        user_id UUID,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT clock_timestamp()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_sync_tombstones_user_id_row_version ON sync_tombstones (user_id, row_version)",
+    # TG_ARGV: entity name, primary key column. Transactions are owned through their wallet.
+    """
+    CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+    DECLARE
+        old_row jsonb := to_jsonb(OLD);
+        owner uuid;
+    BEGIN
+        IF TG_TABLE_NAME = 'transactions' THEN
+            SELECT user_id INTO owner FROM wallets WHERE wallet_id = (old_row ->> 'wallet_id')::uuid;
+        ELSE
+            owner := (old_row ->> 'user_id')::uuid;
+        END IF;
+        INSERT INTO sync_tombstones (entity, entity_id, user_id)
+        VALUES (TG_ARGV[0], (old_row ->> TG_ARGV[1])::uuid, owner);
+        RETURN OLD;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+for table, entity, pk, index_columns in SYNCED_TABLES:
+    STATEMENTS += [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT nextval('change_version_seq')",
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT clock_timestamp()",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{index_columns.split(',')[0]}_row_version ON {table} ({index_columns})",
+        f"DROP TRIGGER IF EXISTS {table}_row_version ON {table}",
+        f"CREATE TRIGGER {table}_row_version BEFORE INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION bump_row_version()",
+        f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}",
+        f"CREATE TRIGGER {table}_tombstone AFTER DELETE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION record_tombstone('{entity}', '{pk}')",
+    ]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,24 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 7
+DESCRIPTION = "Captured EXPLAIN plans of sampled slow queries"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS slow_query_plans (
+        id BIGSERIAL PRIMARY KEY,
+        captured_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+        endpoint VARCHAR(255),
+        statement TEXT NOT NULL,
+        params_shape TEXT NOT NULL,
+        duration_ms DOUBLE PRECISION NOT NULL,
+        plan JSONB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_slow_query_plans_captured_at ON slow_query_plans (captured_at)",
+]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSION = 8
+DESCRIPTION = "Change feed versions assigned by the outbox relay"
+
+STATEMENTS = [
+    # Stream versions are taken when the relay picks an event up (already committed), so they
+    # increase in publish order even when writers commit out of change-version order
+    "CREATE SEQUENCE IF NOT EXISTS outbox_relay_seq",
+    "ALTER TABLE outbox_events ADD COLUMN IF NOT EXISTS relay_version BIGINT UNIQUE",
+]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,53 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.migrations.v0006_sync_versions import SYNCED_TABLES
+
+VERSION = 9
+DESCRIPTION = "Writer transaction ids for a commit-safe sync watermark; tombstone retention horizon"
+
+# row_version is drawn when a row is written, not when its transaction commits, so versions
+# become visible out of order. Each change now also records its writer's transaction id:
+# GET /sync pages through (row_xid, row_version) and only returns changes of transactions
+# older than the oldest one still running (pg_snapshot_xmin), which can no longer commit.
+# The id is taken as BIGINT (xid8 is epoch-extended, so it never wraps).
+CURRENT_XID = "pg_current_xact_id()::text::bigint"
+
+STATEMENTS = [
+    f"""
+    CREATE OR REPLACE FUNCTION bump_row_version() RETURNS trigger AS $$
+    BEGIN
+        NEW.row_xid := {CURRENT_XID};
+        NEW.row_version := nextval('change_version_seq');
+        NEW.updated_at := clock_timestamp();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # Existing rows were all committed long ago: 0 sorts them before any live transaction
+    "ALTER TABLE sync_tombstones ADD COLUMN IF NOT EXISTS row_xid BIGINT NOT NULL DEFAULT 0",
+    f"ALTER TABLE sync_tombstones ALTER COLUMN row_xid SET DEFAULT {CURRENT_XID}",
+    "CREATE INDEX IF NOT EXISTS ix_sync_tombstones_user_id_row_xid ON sync_tombstones (user_id, row_xid, row_version)",
+    "DROP INDEX IF EXISTS ix_sync_tombstones_user_id_row_version",
+    "CREATE INDEX IF NOT EXISTS ix_sync_tombstones_updated_at ON sync_tombstones (updated_at)",
+    # Retention job: newest (row_xid) tombstone pruned so far; older cursors must resync fully
+    """
+    CREATE TABLE IF NOT EXISTS sync_horizon (
+        id SMALLINT PRIMARY KEY CHECK (id = 1),
+        pruned_xid BIGINT NOT NULL
+    )
+    """,
+    "INSERT INTO sync_horizon (id, pruned_xid) VALUES (1, 0) ON CONFLICT (id) DO NOTHING",
+]
+
+for table, entity, pk, index_columns in SYNCED_TABLES:
+    owner = index_columns.split(',')[0]
+    STATEMENTS += [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS row_xid BIGINT NOT NULL DEFAULT 0",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{owner}_row_xid ON {table} ({owner}, row_xid, row_version)",
+        f"DROP INDEX IF EXISTS ix_{table}_{owner}_row_version",
+    ]
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
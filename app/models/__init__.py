@@ -1,5 +1,8 @@
 from .user import User
-from .wallet import Wallet
+from .wallet import Wallet, WalletBalanceDelta
 from .category import Category
 from .transaction import Transaction, Budget
 from .debt import DebtLedger
+from .outbox import OutboxEvent
+from .sync import SyncTombstone
+from .diagnostics import SlowQueryPlan
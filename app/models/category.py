@@ -1,6 +1,6 @@
 from sqlalchemy import Column, UUID, String, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from app.core.base import Base
+from app.core.base import Base, SyncVersioned
 import enum
 import uuid
 
@@ -9,11 +9,11 @@ class TransactionType(enum.Enum):
     EXPENSE = "EXPENSE"
 
 # Categories for grouping transactions (Food, Transport, Salary)
-class Category(Base):
+class Category(SyncVersioned, Base):
     __tablename__ = "categories"
     
     category_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=True) # Nullable for default system categories
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=True, index=True) # Nullable for default system categories
     category_name = Column(String(50), nullable=False)
     type = Column(SQLEnum(TransactionType), nullable=False)
     
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, UUID, String, Numeric, ForeignKey, Date, Boolean
+from sqlalchemy import Column, UUID, String, Numeric, ForeignKey, Date, Boolean, Index
 from sqlalchemy.orm import relationship
-from app.core.base import Base
+from app.core.base import Base, SyncVersioned
 import uuid
 
-class DebtLedger(Base):
+class DebtLedger(SyncVersioned, Base):
     __tablename__ = "debt_ledgers"
     
     ledger_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -22,3 +22,7 @@ class DebtLedger(Base):
     
     # Relationships
     user = relationship("User", back_populates="debts")
+
+    __table_args__ = (
+        Index("ix_debt_ledgers_user_id_due_date", "user_id", "due_date"),
+    )
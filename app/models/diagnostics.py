@@ -0,0 +1,16 @@
+from sqlalchemy import Column, BigInteger, String, Text, Float, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.base import Base
+
+# EXPLAIN (ANALYZE, BUFFERS) output of sampled slow queries (see app.core.slow_queries)
+class SlowQueryPlan(Base):
+    __tablename__ = "slow_query_plans"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    captured_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+    endpoint = Column(String(255), nullable=True)   # "GET /api/v1/transactions/", None outside requests
+    statement = Column(Text, nullable=False)
+    params_shape = Column(Text, nullable=False)     # parameter types only, never values
+    duration_ms = Column(Float, nullable=False)
+    plan = Column(JSONB, nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, UUID, String, BigInteger, DateTime, Sequence
+from sqlalchemy.sql import func
+from app.core.base import Base
+
+# Global change version; outbox events (and anything else that versions changes) draw from it
+change_version_seq = Sequence("change_version_seq")
+
+# Change events written in the same transaction as the change itself, then
+# published to Redis Streams by the outbox relay and deleted.
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    version = Column(BigInteger, change_version_seq, primary_key=True, server_default=change_version_seq.next_value())
+    entity = Column(String(32), nullable=False)      # wallet, category, transaction, budget, debt, user
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    op = Column(String(16), nullable=False)          # create, update, delete
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Position in the change feed (outbox_relay_seq), stamped by the relay before publishing
+    relay_version = Column(BigInteger, nullable=True, unique=True)
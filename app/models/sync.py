@@ -0,0 +1,18 @@
+from sqlalchemy import Column, UUID, String, BigInteger, DateTime, FetchedValue, Index
+from app.core.base import Base
+
+# Written by the record_tombstone trigger (migration v0006) whenever a synced row is deleted
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+
+    row_version = Column(BigInteger, primary_key=True, server_default=FetchedValue())
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=FetchedValue())
+    row_xid = Column(BigInteger, nullable=False, server_default=FetchedValue())  # deleting transaction
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_row_xid", "user_id", "row_xid", "row_version"),
+        Index("ix_sync_tombstones_updated_at", "updated_at"),  # retention (app.crud.sync)
+    )
@@ -1,12 +1,12 @@
-from sqlalchemy import Column, UUID, String, Numeric, ForeignKey, DateTime, Date, Enum as SQLEnum, CheckConstraint
+from sqlalchemy import Column, UUID, String, Numeric, ForeignKey, DateTime, Date, Enum as SQLEnum, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.base import Base
+from app.core.base import Base, SyncVersioned
 import uuid
 from app.models.category import TransactionType # Import Enum
 
 # Core Transaction Ledger
-class Transaction(Base):
+class Transaction(SyncVersioned, Base):
     __tablename__ = "transactions"
     
     transaction_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -24,9 +24,14 @@ class Transaction(Base):
     # Relationships
     wallet = relationship("Wallet", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
+
+    # Schema changes go through app/migrations; keep these in sync with v0002
+    __table_args__ = (
+        Index("ix_transactions_wallet_id_transaction_date", "wallet_id", transaction_date.desc()),
+    )
     
 # Budget Limits (Spendee style)
-class Budget(Base):
+class Budget(SyncVersioned, Base):
     __tablename__ = "budgets"
 
     budget_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -40,3 +45,7 @@ class Budget(Base):
     # Relationships
     user = relationship("User", back_populates="budgets")
     category = relationship("Category")
+
+    __table_args__ = (
+        Index("ix_budgets_user_id_start_date", "user_id", start_date.desc()),
+    )
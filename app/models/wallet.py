@@ -1,14 +1,15 @@
-from sqlalchemy import Column, UUID, String, Numeric, ForeignKey, Boolean
+from sqlalchemy import Column, UUID, String, Numeric, ForeignKey, Boolean, BigInteger, DateTime
 from sqlalchemy.orm import relationship
-from app.core.base import Base
+from sqlalchemy.sql import func
+from app.core.base import Base, SyncVersioned
 import uuid
 
 # Wallets represent cash, bank accounts, or credit cards
-class Wallet(Base):
+class Wallet(SyncVersioned, Base):
     __tablename__ = "wallets"
     
     wallet_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False, index=True)
     wallet_name = Column(String(100), nullable=False)
     currency = Column(String(10), nullable=False, default="IDR")
     
@@ -18,3 +19,13 @@ class Wallet(Base):
     # Relationships
     user = relationship("User", back_populates="wallets")
     transactions = relationship("Transaction", back_populates="wallet")
+
+# Pending balance changes (WALLET_BALANCE_DELTAS mode): appended by transaction writes instead of
+# updating the wallet row, then folded into current_balance by the compactor.
+class WalletBalanceDelta(Base):
+    __tablename__ = "wallet_balance_deltas"
+
+    delta_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    wallet_id = Column(UUID(as_uuid=True), ForeignKey("wallets.wallet_id", ondelete="CASCADE"), nullable=False, index=True)
+    amount = Column(Numeric(18, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, condecimal
+from pydantic import BaseModel, TypeAdapter, Field, condecimal
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 class BudgetBase(BaseModel):
@@ -17,4 +17,6 @@ class BudgetResponse(BudgetBase):
     user_id: uuid.UUID
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+BudgetListAdapter = TypeAdapter(List[BudgetResponse])
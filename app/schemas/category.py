@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, constr
-from typing import Optional
+from pydantic import BaseModel, TypeAdapter, Field, constr
+from typing import List, Optional
 import uuid
 import enum
 
@@ -19,3 +19,5 @@ class CategoryResponse(CategoryBase):
     
     class Config:
         from_attributes = True
+
+CategoryListAdapter = TypeAdapter(List[CategoryResponse])
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, constr, condecimal
+from pydantic import BaseModel, TypeAdapter, Field, constr, condecimal
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 class DebtLedgerCreate(BaseModel):
@@ -23,3 +23,5 @@ class DebtLedgerResponse(DebtLedgerCreate):
 
     class Config:
         from_attributes = True
+
+DebtLedgerListAdapter = TypeAdapter(List[DebtLedgerResponse])
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal
+import uuid
+
+class SyncChange(BaseModel):
+    entity: Literal["wallet", "category", "transaction", "budget", "debt"]
+    op: Literal["upsert", "delete"]
+    id: uuid.UUID
+    version: int = Field(..., description="Row version; increases with every change of the entity.")
+    data: Any = Field(None, description="The entity in its regular response shape; null for deletes.")
+
+class SyncPage(BaseModel):
+    changes: List[SyncChange] = Field(..., description="Changes in ascending version order.")
+    next_cursor: str = Field(..., description="Opaque; pass as `since` on the next call.")
+    has_more: bool = Field(..., description="True if more changes are available right away.")
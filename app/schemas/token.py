@@ -4,8 +4,13 @@ from typing import Optional
 class Token(BaseModel):
     """Token returned upon successful login."""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     
 class TokenData(BaseModel):
     """Payload data embedded in the token."""
     user_id: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    """Body for exchanging (or revoking, on logout) a refresh token."""
+    refresh_token: str
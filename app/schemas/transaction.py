@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, constr, condecimal
+from pydantic import BaseModel, TypeAdapter, Field, constr, condecimal
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 # Note: Assumes TransactionType Enum is available, either by importing or defining here.
@@ -23,3 +23,6 @@ class TransactionResponse(TransactionCreate):
 
     class Config:
         from_attributes = True
+
+# Validates a whole page of list rows (Row tuples from the CRUD list queries) in one call
+TransactionListAdapter = TypeAdapter(List[TransactionResponse])
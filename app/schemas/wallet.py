@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, constr, condecimal
-from typing import Optional
+from pydantic import BaseModel, TypeAdapter, Field, constr, condecimal
+from typing import List, Optional
 import uuid
 from datetime import datetime
 
@@ -17,3 +17,5 @@ class WalletResponse(WalletBase):
     
     class Config:
         from_attributes = True
+
+WalletListAdapter = TypeAdapter(List[WalletResponse])
@@ -3,9 +3,10 @@ from fastapi.testclient import TestClient
 from app.main import app 
 
 # Import dependencies and models
+from app.core.config import settings
 from app.core.db import AsyncSessionLocal, get_db
 from app.models.user import User # Import the User model
-from app.api.v1.dependencies import get_current_user 
+from app.api.v1.dependencies import get_current_user, get_token_subject
 from app.schemas.user import UserResponse
 from datetime import datetime
 from typing import AsyncGenerator
@@ -83,7 +84,15 @@ async def override_get_db() -> AsyncGenerator:
 @pytest.fixture(scope="session")
 def client(): 
     app.dependency_overrides[get_current_user] = mock_get_current_user
+    # ETag checks read the user id straight from the token
+    app.dependency_overrides[get_token_subject] = lambda: str(TEST_USER_A_ID)
     app.dependency_overrides[get_db] = override_get_db
+    # Workers skip DDL/seeding by default; the test database is bootstrapped here.
+    settings.DB_INIT_ON_STARTUP = True
+    # Functional tests fire requests back-to-back from a single client IP.
+    settings.RATE_LIMIT_ENABLED = False
+    # Tests compact balance deltas explicitly; a background compactor would race them.
+    settings.BALANCE_COMPACTOR_ENABLED = False
     
     with TestClient(app) as client:
         yield client
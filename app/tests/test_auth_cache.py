@@ -0,0 +1,133 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import dependencies
+from app.api.v1.dependencies import CurrentUser, ReleaseSessionRoute
+from app.core import user_cache
+from app.core.db import LazySession, get_db
+from app.core.security import create_access_token
+from app.schemas.user import UserResponse
+
+USER_ID = uuid.uuid4()
+DB_USER = SimpleNamespace(
+    user_id=USER_ID, email="cached@test.com", first_name=None, last_name=None,
+    is_active=True, created_at="2024-01-01T00:00:00Z",
+)
+
+class FakeResult:
+    def scalars(self):
+        return self
+
+    def first(self):
+        return DB_USER
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+
+    async def execute(self, stmt):
+        return FakeResult()
+
+    async def close(self):
+        pass
+
+class CountingFactory:
+    def __init__(self):
+        self.sessions = []
+
+    def __call__(self):
+        session = FakeSession()
+        self.sessions.append(session)
+        return session
+
+class FakePipeline:
+    def __init__(self, store):
+        self.store = store
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, "0")) + 1)
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        pass
+
+def _fake_redis(monkeypatch):
+    store = {}
+
+    async def cache_get_many(keys):
+        return [store.get(key) for key in keys]
+
+    async def cache_set(key, value, ex):
+        store[key] = value.decode()
+
+    async def not_revoked(jti):
+        return False
+
+    monkeypatch.setattr(user_cache, "cache_get_many", cache_get_many)
+    monkeypatch.setattr(user_cache, "cache_set", cache_set)
+    monkeypatch.setattr(user_cache.redis_client, "pipeline", lambda transaction=True: FakePipeline(store))
+    monkeypatch.setattr(dependencies, "is_token_revoked", not_revoked)
+    return store
+
+def _app(factory) -> TestClient:
+    router = APIRouter(route_class=ReleaseSessionRoute)
+
+    @router.get("/me")
+    async def me(current_user: CurrentUser):
+        return {"user_id": str(current_user.user_id)}
+
+    async def lazy_db():
+        session = LazySession(factory)
+        try:
+            yield session
+        finally:
+            await session.release()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lazy_db
+    return TestClient(app)
+
+class TestAuthUserCache:
+
+    def test_1_cache_hit_request_makes_no_pool_checkout(self, monkeypatch):
+        _fake_redis(monkeypatch)
+        factory = CountingFactory()
+        client = _app(factory)
+        headers = {"Authorization": f"Bearer {create_access_token(subject=USER_ID)}"}
+
+        assert client.get("/me", headers=headers).status_code == 200
+        assert len(factory.sessions) == 1 # Miss: loaded from the database once
+
+        response = client.get("/me", headers=headers)
+        assert response.json() == {"user_id": str(USER_ID)}
+        assert len(factory.sessions) == 1 # Hit: no session, hence no checkout
+
+    def test_2_user_write_retires_cached_entry(self, monkeypatch):
+        _fake_redis(monkeypatch)
+        user = UserResponse.model_validate(DB_USER)
+
+        async def scenario():
+            _, generation = await user_cache.get_cached_user(str(USER_ID))
+            await user_cache.cache_user(str(USER_ID), generation, user)
+            hit, _ = await user_cache.get_cached_user(str(USER_ID))
+            # e.g. a deactivation committed; a reader that loaded the old row may still SET it
+            await user_cache.invalidate_cached_user(USER_ID)
+            await user_cache.cache_user(str(USER_ID), generation, user)
+            return hit, await user_cache.get_cached_user(str(USER_ID))
+
+        hit, (after, generation) = asyncio.run(scenario())
+        assert hit == user
+        assert after is None and generation == "1"
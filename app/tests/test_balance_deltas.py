@@ -0,0 +1,87 @@
+import asyncio
+import uuid
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.crud import report as crud_report
+from app.crud import wallet as crud_wallet
+from app.models.user import User
+from app.models.wallet import Wallet, WalletBalanceDelta
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.added = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+class TestBalanceDeltas:
+
+    def test_1_mode_selects_append_or_update(self, monkeypatch):
+        db = RecordingSession()
+        monkeypatch.setattr(settings, "WALLET_BALANCE_DELTAS", True)
+        asyncio.run(crud_wallet.adjust_balance(db, uuid.uuid4(), Decimal("5.00"), uuid.uuid4()))
+        monkeypatch.setattr(settings, "WALLET_BALANCE_DELTAS", False)
+        asyncio.run(crud_wallet.adjust_balance(db, uuid.uuid4(), Decimal("5.00"), uuid.uuid4()))
+
+        appended, updated = (str(stmt) for stmt in db.statements)
+        assert "INSERT INTO wallet_balance_deltas" in appended
+        assert "UPDATE wallets" in updated
+
+    def test_2_reads_stay_exact_before_and_after_compaction(self, client, monkeypatch):
+        # `client` only bootstraps the schema; its lifespan runs no compactor (see conftest)
+        assert not settings.BALANCE_COMPACTOR_ENABLED
+        monkeypatch.setattr(settings, "WALLET_BALANCE_DELTAS", True)
+        start_balance = Decimal("500.00")
+
+        async def scenario():
+            engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+            sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+            user_id, wallet_a, wallet_b = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+            try:
+                async with sessions() as db:
+                    db.add(User(user_id=user_id, email=f"deltas_{user_id}@test.com", password_hash="x", is_active=True))
+                    await db.flush()
+                    db.add_all([
+                        Wallet(wallet_id=wallet_a, user_id=user_id, wallet_name="Kas", currency="IDR", current_balance=start_balance),
+                        Wallet(wallet_id=wallet_b, user_id=user_id, wallet_name="Bank", currency="IDR", current_balance=start_balance),
+                    ])
+                    await db.commit()
+
+                async def transfer():
+                    async with sessions() as db:
+                        await crud_report.perform_atomic_transfer(db, user_id, wallet_a, wallet_b, Decimal("10.00"), "pos")
+
+                await asyncio.gather(*(transfer() for _ in range(20)))
+
+                async with sessions() as db:
+                    stored = (await db.execute(select(Wallet.current_balance).where(Wallet.wallet_id == wallet_a))).scalar_one()
+                async with sessions() as db:
+                    before = (await crud_wallet.get_wallet_by_id(db, wallet_a, user_id)).current_balance
+
+                async with sessions() as db:
+                    while await crud_wallet.compact_balance_deltas(db):
+                        pass
+
+                async with sessions() as db:
+                    after = (await crud_wallet.get_wallet_by_id(db, wallet_a, user_id)).current_balance
+                    pending = (await db.execute(
+                        select(WalletBalanceDelta).where(WalletBalanceDelta.wallet_id.in_([wallet_a, wallet_b]))
+                    )).scalars().all()
+                return stored, before, after, pending
+            finally:
+                await engine.dispose()
+
+        stored, before, after, pending = asyncio.run(scenario())
+
+        assert stored == start_balance  # the hot row was never updated by writers
+        assert before == after == start_balance - Decimal("200.00")
+        assert pending == []
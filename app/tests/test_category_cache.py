@@ -0,0 +1,119 @@
+import asyncio
+import uuid
+from types import MappingProxyType
+
+from app.core.config import settings
+from app.crud import category as crud_category
+from app.crud.category import CachedCategory
+from app.models.category import TransactionType
+from app.schemas.category import CategoryListAdapter
+
+USER_ID = uuid.uuid4()
+TRANSFER_IN = CachedCategory(uuid.uuid4(), None, "Transfer In", TransactionType.INCOME)
+TRANSFER_OUT = CachedCategory(uuid.uuid4(), None, "Transfer Out", TransactionType.EXPENSE)
+FOOD = CachedCategory(uuid.uuid4(), USER_ID, "food", TransactionType.EXPENSE)
+SALARY = CachedCategory(uuid.uuid4(), USER_ID, "Salary", TransactionType.INCOME)
+
+def _tables(monkeypatch, store=None):
+    system = MappingProxyType({c.category_id: c for c in (TRANSFER_IN, TRANSFER_OUT)})
+    monkeypatch.setattr(crud_category, "_system_categories", system)
+
+    async def user_categories(db, user_id, refresh=False):
+        return (FOOD, SALARY) if user_id == USER_ID else ()
+    monkeypatch.setattr(crud_category, "get_user_categories", user_categories)
+
+class TestCategoryCache:
+
+    def test_1_list_merges_sorts_and_paginates(self, monkeypatch):
+        _tables(monkeypatch)
+        page, total = asyncio.run(crud_category.get_all_categories_for_user(None, USER_ID, limit=3, offset=0))
+        assert total == 4
+        assert [c.category_name for c in page] == ["food", "Salary", "Transfer In"]
+        assert CategoryListAdapter.validate_python(page, from_attributes=True)[0].category_id == FOOD.category_id
+
+    def test_2_search_is_case_insensitive(self, monkeypatch):
+        _tables(monkeypatch)
+        page, total = asyncio.run(crud_category.get_all_categories_for_user(None, USER_ID, q="TRANSFER"))
+        assert total == 2 and {c.category_id for c in page} == {TRANSFER_IN.category_id, TRANSFER_OUT.category_id}
+
+    def test_3_lookup_allows_system_and_own_categories_only(self, monkeypatch):
+        _tables(monkeypatch)
+        lookup = lambda category_id, user_id: asyncio.run(crud_category.get_category_by_id(None, category_id, user_id))
+        assert lookup(TRANSFER_IN.category_id, USER_ID) is TRANSFER_IN
+        assert lookup(FOOD.category_id, USER_ID) is FOOD
+        assert lookup(FOOD.category_id, uuid.uuid4()) is None
+
+    def test_4_cache_miss_is_confirmed_with_the_database(self, monkeypatch):
+        _tables(monkeypatch)
+        fresh = CachedCategory(uuid.uuid4(), USER_ID, "Fresh", TransactionType.EXPENSE)
+
+        async def user_categories(db, user_id, refresh=False):
+            # Stale entry without the new category; the database has it
+            return (FOOD, fresh) if refresh else (FOOD,)
+        monkeypatch.setattr(crud_category, "get_user_categories", user_categories)
+        assert asyncio.run(crud_category.get_category_by_id(None, fresh.category_id, USER_ID)) is fresh
+
+    def test_5_user_categories_round_trip_through_redis(self, monkeypatch):
+        store = {}
+        versions = {str(USER_ID): "e.1"}
+
+        async def get_data_version(user_id):
+            return versions.get(user_id)
+
+        async def cache_get(key):
+            return store.get(key)
+
+        async def cache_set(key, value, ex):
+            store[key] = value.decode()
+
+        class DB:
+            calls = 0
+            async def execute(self, stmt):
+                DB.calls += 1
+                return type("Result", (), {"all": lambda self: [(FOOD.category_id, USER_ID, "food", TransactionType.EXPENSE)]})()
+
+        monkeypatch.setattr(settings, "CATEGORY_CACHE_SECONDS", 600)
+        monkeypatch.setattr(crud_category, "cache_get", cache_get)
+        monkeypatch.setattr(crud_category, "cache_set", cache_set)
+        monkeypatch.setattr(crud_category, "get_data_version", get_data_version)
+        first = asyncio.run(crud_category.get_user_categories(DB(), USER_ID))
+        second = asyncio.run(crud_category.get_user_categories(DB(), USER_ID))
+        assert first == second == (FOOD,)
+        assert DB.calls == 1
+
+    def test_6_entry_is_retired_by_the_data_version(self, monkeypatch):
+        store = {}
+        versions = {str(USER_ID): "e.1"}
+        rows = [(FOOD.category_id, USER_ID, "food", TransactionType.EXPENSE)]
+
+        async def get_data_version(user_id):
+            return versions.get(user_id)
+
+        async def cache_get(key):
+            return store.get(key)
+
+        async def cache_set(key, value, ex):
+            store[key] = value.decode()
+
+        class DB:
+            calls = 0
+            async def execute(self, stmt):
+                DB.calls += 1
+                return type("Result", (), {"all": lambda self: list(rows)})()
+
+        monkeypatch.setattr(settings, "CATEGORY_CACHE_SECONDS", 600)
+        monkeypatch.setattr(crud_category, "cache_get", cache_get)
+        monkeypatch.setattr(crud_category, "cache_set", cache_set)
+        monkeypatch.setattr(crud_category, "get_data_version", get_data_version)
+        get = lambda: asyncio.run(crud_category.get_user_categories(DB(), USER_ID))
+
+        assert get() == (FOOD,)
+        # A write commits and bumps the version; the old entry is never read again (no DEL)
+        rows.append((SALARY.category_id, USER_ID, "Salary", TransactionType.INCOME))
+        versions[str(USER_ID)] = "e.2"
+        assert get() == (FOOD, SALARY) and DB.calls == 2
+
+        # Version unknown (Redis down or bump pending): straight to the database, nothing cached
+        del versions[str(USER_ID)]
+        assert get() == (FOOD, SALARY) and DB.calls == 3
+        assert len(store) == 2
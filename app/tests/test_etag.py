@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.v1 import dependencies
+from app.api.v1.dependencies import CurrentUser, ReleaseSessionRoute, ETAG
+from app.core import consistency
+from app.core.db import LazySession, get_db
+from app.core.security import create_access_token
+from app.schemas.user import UserResponse
+
+USER = UserResponse(user_id=uuid.uuid4(), email="etag@test.com", is_active=True, created_at="2024-01-01T00:00:00Z")
+
+def _request(query: bytes) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/api/v1/wallets/", "query_string": query, "headers": []})
+
+def _check(monkeypatch, version, if_none_match=None, query=b"limit=10&offset=0"):
+    async def data_version(user_id):
+        return version
+    monkeypatch.setattr(dependencies, "get_data_version", data_version)
+    response = Response()
+    asyncio.run(dependencies.check_etag(_request(query), response, str(USER.user_id), if_none_match))
+    return response
+
+class TestConditionalGet:
+
+    def test_1_etag_ignores_query_order_but_not_values(self):
+        a = dependencies.compute_etag(USER.user_id, 3, _request(b"limit=10&offset=0"))
+        b = dependencies.compute_etag(USER.user_id, 3, _request(b"offset=0&limit=10"))
+        c = dependencies.compute_etag(USER.user_id, 3, _request(b"offset=10&limit=10"))
+        assert a == b != c
+
+    def test_2_matching_etag_short_circuits_with_304(self, monkeypatch):
+        etag = _check(monkeypatch, 5).headers["ETag"]
+        with pytest.raises(HTTPException) as exc:
+            _check(monkeypatch, 5, if_none_match=etag)
+        assert exc.value.status_code == 304
+        assert exc.value.headers["ETag"] == etag
+
+    def test_3_write_bumps_version_and_invalidates_etag(self, monkeypatch):
+        etag = _check(monkeypatch, 5).headers["ETag"]
+        response = _check(monkeypatch, 6, if_none_match=etag)
+        assert response.headers["ETag"] != etag
+
+    def test_4_no_etag_without_redis(self, monkeypatch):
+        assert "ETag" not in _check(monkeypatch, None).headers
+
+    def test_5_failed_bump_withholds_version_until_published(self, monkeypatch):
+        class DownPipeline:
+            async def __aenter__(self):
+                return self
+            async def __aexit__(self, *exc):
+                return False
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: None
+            async def execute(self):
+                raise ConnectionError("redis down")
+
+        async def retry_bump(user_id):
+            pass
+
+        user_id = str(uuid.uuid4())
+        monkeypatch.setattr(consistency.redis_client, "pipeline", lambda transaction=True: DownPipeline())
+        monkeypatch.setattr(consistency, "_retry_bump", retry_bump)
+        asyncio.run(consistency._publish_write_mark(user_id))
+        assert asyncio.run(consistency.get_data_version(user_id)) is None
+        consistency._pending_bumps.discard(user_id)
+
+    def test_6_not_modified_runs_no_statement(self, monkeypatch):
+        sessions = []
+
+        async def data_version(user_id):
+            return "e1.5"
+
+        async def not_revoked(jti):
+            return False
+
+        async def lazy_db():
+            session = LazySession(lambda: sessions.append(1))
+            try:
+                yield session
+            finally:
+                await session.release()
+
+        monkeypatch.setattr(dependencies, "get_data_version", data_version)
+        monkeypatch.setattr(dependencies, "is_token_revoked", not_revoked)
+        router = APIRouter(route_class=ReleaseSessionRoute)
+
+        @router.get("/wallets/", dependencies=[ETAG])
+        async def read_wallets(current_user: CurrentUser, db=Depends(get_db)):
+            await db.execute("SELECT 1")
+            return []
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        app.dependency_overrides[get_db] = lazy_db
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token(subject=USER.user_id)}"}
+
+        etag = dependencies.compute_etag(str(USER.user_id), "e1.5", _request(b"limit=10&offset=0"))
+        response = client.get("/api/v1/wallets/?offset=0&limit=10", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        # Neither authentication nor the endpoint ran: no session was even created
+        assert sessions == []
@@ -0,0 +1,54 @@
+import asyncio
+
+from app.core.db import LazySession
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+        self.closed = False
+
+    async def execute(self, stmt):
+        return stmt
+
+    async def close(self):
+        self.closed = True
+
+class CountingFactory:
+    def __init__(self):
+        self.sessions = []
+
+    def __call__(self):
+        session = FakeSession()
+        self.sessions.append(session)
+        return session
+
+class TestLazySession:
+
+    def test_1_unused_session_is_never_created(self):
+        factory = CountingFactory()
+        lazy = LazySession(factory)
+        lazy.info["user_id"] = "u1"
+
+        asyncio.run(lazy.release())
+        assert factory.sessions == []
+
+    def test_2_first_use_creates_session_with_info(self):
+        factory = CountingFactory()
+        lazy = LazySession(factory)
+        lazy.info["user_id"] = "u1"
+
+        assert asyncio.run(lazy.execute("SELECT 1")) == "SELECT 1"
+        assert len(factory.sessions) == 1
+        assert factory.sessions[0].info["user_id"] == "u1"
+
+    def test_3_release_closes_and_reuse_reopens(self):
+        factory = CountingFactory()
+        lazy = LazySession(factory)
+
+        asyncio.run(lazy.execute("SELECT 1"))
+        asyncio.run(lazy.release())
+        assert factory.sessions[0].closed is True
+        assert lazy.is_open is False
+
+        asyncio.run(lazy.execute("SELECT 1"))
+        assert len(factory.sessions) == 2
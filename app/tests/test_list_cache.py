@@ -0,0 +1,72 @@
+import asyncio
+import uuid
+
+from fastapi import Response
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from app.core import list_cache
+from app.core.config import settings
+
+USER_ID = uuid.uuid4()
+
+class Page(BaseModel):
+    items: list
+    total_count: int
+
+def _request(data_version) -> Request:
+    request = Request({"type": "http", "method": "GET", "path": "/api/v1/wallets/", "query_string": b"", "headers": []})
+    request.state.data_version = data_version
+    return request
+
+def _serve(monkeypatch, store, data_version, name="wallets", **params):
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return Page(items=[1, 2], total_count=2)
+
+    async def cache_get(key):
+        return store.get(key)
+
+    async def cache_set(key, value, ex):
+        store[key] = value.decode() if isinstance(value, bytes) else value
+
+    monkeypatch.setattr(settings, "LIST_CACHE_ENABLED", True)
+    monkeypatch.setattr(list_cache, "cache_get", cache_get)
+    monkeypatch.setattr(list_cache, "cache_set", cache_set)
+    response = Response()
+    response.headers["ETag"] = '"tag"'
+    result = asyncio.run(list_cache.cached_list(_request(data_version), response, USER_ID, name, load, **params))
+    return result, len(loads)
+
+class TestListCache:
+
+    def test_1_key_normalizes_param_order(self):
+        a = list_cache.cache_key(USER_ID, 1, "wallets", {"q": None, "limit": 10, "offset": 0})
+        b = list_cache.cache_key(USER_ID, 1, "wallets", {"offset": 0, "limit": 10, "q": None})
+        c = list_cache.cache_key(USER_ID, 1, "wallets", {"offset": 10, "limit": 10, "q": None})
+        assert a == b != c
+
+    def test_2_second_call_is_served_from_cache(self, monkeypatch):
+        store = {}
+        first, loads = _serve(monkeypatch, store, 3, limit=10, offset=0)
+        assert loads == 1
+        second, loads = _serve(monkeypatch, store, 3, limit=10, offset=0)
+        assert loads == 0
+        assert second.body == first.body == b'{"items":[1,2],"total_count":2}'
+        assert second.headers["ETag"] == '"tag"'
+
+    def test_3_data_version_bump_misses(self, monkeypatch):
+        store = {}
+        _serve(monkeypatch, store, 3, limit=10, offset=0)
+        _, loads = _serve(monkeypatch, store, 4, limit=10, offset=0)
+        assert loads == 1
+
+    def test_4_bypassed_without_version_or_past_offset_cap(self, monkeypatch):
+        store = {}
+        result, loads = _serve(monkeypatch, store, None, limit=10, offset=0)
+        assert loads == 1 and isinstance(result, Page)
+        monkeypatch.setitem(settings.LIST_CACHE_POLICIES, "transactions", (60, 40))
+        result, _ = _serve(monkeypatch, store, 3, name="transactions", limit=10, offset=50)
+        assert isinstance(result, Page) and not store
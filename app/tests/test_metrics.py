@@ -0,0 +1,53 @@
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.metrics import route_template
+from app.core.pool_stats import PoolStats
+
+def _scrape(client, monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_KEY", "scrape-key")
+    return client.get("/metrics", headers={"X-Internal-Key": "scrape-key"}).text
+
+class TestMetrics:
+
+    def test_1_metrics_endpoint_reports_route_templates(self, client, monkeypatch):
+        client.get("/")
+        body = _scrape(client, monkeypatch)
+        assert 'http_requests_total{method="GET",route="/",status="200"}' in body
+        assert "http_request_duration_seconds_bucket" in body
+        assert "event_loop_lag_seconds" in body
+
+    def test_2_unmatched_paths_share_one_label(self, client, monkeypatch):
+        client.get("/does-not-exist/123")
+        body = _scrape(client, monkeypatch)
+        assert 'route="unmatched",status="404"' in body
+        assert "/does-not-exist/123" not in body
+
+    def test_3_pool_stats_forward_to_exporters(self):
+        waits, timeouts = [], []
+        stats = PoolStats()
+        stats.on_wait = waits.append
+        stats.on_timeout = lambda: timeouts.append(1)
+        stats.record_wait(0.002)
+        stats.record_timeout()
+        assert waits == [0.002] and timeouts == [1]
+        assert stats.checkouts == 1 and stats.timeouts == 1
+
+    def test_4_metrics_require_internal_key(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "INTERNAL_API_KEY", "scrape-key")
+        assert client.get("/metrics").status_code == 404
+        assert client.get("/metrics", headers={"X-Internal-Key": "wrong"}).status_code == 404
+
+    def test_5_route_template_includes_router_and_root_prefixes(self):
+        router = APIRouter(prefix="/wallets")
+
+        @router.get("/{wallet_id}/history/{page:int}")
+        async def history(wallet_id: str, page: int, request: Request):
+            return {"route": route_template(request.scope)}
+
+        app = FastAPI(root_path="/finanzio")
+        app.include_router(router, prefix="/api/v1")
+        response = TestClient(app).get("/api/v1/wallets/abc/history/2")
+        assert response.json() == {"route": "/finanzio/api/v1/wallets/{wallet_id}/history/{page:int}"}
+        assert route_template({"path": "/nope"}) == "unmatched"
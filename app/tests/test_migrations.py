@@ -0,0 +1,60 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.core import migrations
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.engine.statements.append(sql)
+        if "max(version)" in sql:
+            return FakeResult(self.engine.version)
+        if "INSERT INTO schema_version" in sql:
+            self.engine.version = params["version"]
+        return FakeResult(None)
+
+class FakeEngine:
+    def __init__(self, version):
+        self.version = version
+        self.statements = []
+
+    @asynccontextmanager
+    async def connect(self):
+        yield FakeConnection(self)
+
+    begin = connect
+
+class TestMigrations:
+
+    def test_1_versions_are_contiguous(self):
+        versions = [m.VERSION for m in migrations.load_migrations()]
+        assert versions == list(range(1, migrations.LATEST_VERSION + 1))
+
+    def test_2_current_schema_costs_one_query(self):
+        engine = FakeEngine(migrations.LATEST_VERSION)
+        assert asyncio.run(migrations.run_migrations(engine)) == migrations.LATEST_VERSION
+        assert len(engine.statements) == 1
+
+    def test_3_pending_migrations_run_under_advisory_lock(self, monkeypatch):
+        applied = []
+        for migration in migrations.MIGRATIONS:
+            async def upgrade(conn, version=migration.VERSION):
+                applied.append(version)
+            monkeypatch.setattr(migration, "upgrade", upgrade)
+
+        engine = FakeEngine(1)
+        asyncio.run(migrations.run_migrations(engine))
+
+        assert any("pg_advisory_xact_lock" in sql for sql in engine.statements)
+        assert applied == list(range(2, migrations.LATEST_VERSION + 1))
+        assert engine.version == migrations.LATEST_VERSION
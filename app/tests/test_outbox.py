@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core import outbox_relay
+from app.core.config import settings
+from app.crud.outbox import OP_CREATE, record_change
+from app.models.outbox import OutboxEvent
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.value
+
+class FakeSession:
+    def __init__(self, lock_granted, *results):
+        self.results = [FakeResult(lock_granted), *(FakeResult(r) for r in results), FakeResult(None)]
+        self.executed = []
+        self.added = []
+        self.committed = False
+
+    async def execute(self, stmt, params=None):
+        self.executed.append(str(stmt))
+        return self.results.pop(0) if self.results else FakeResult(None)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+class FakePipeline:
+    def __init__(self, sink, fail=False):
+        self.sink = sink
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xadd(self, stream, fields, maxlen=None, approximate=None):
+        self.sink.append((stream, fields))
+
+    async def execute(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+
+class FakeRedis:
+    def __init__(self, fail=False):
+        self.entries = []
+        self.fail = fail
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.entries, self.fail)
+
+def _event(version, relay_version=None):
+    return OutboxEvent(
+        version=version, relay_version=relay_version, entity="wallet", entity_id=uuid.uuid4(), user_id=None, op=OP_CREATE
+    )
+
+class TestOutbox:
+
+    def test_1_record_change_joins_the_session(self):
+        db = FakeSession(True)
+        wallet_id, user_id = uuid.uuid4(), uuid.uuid4()
+        record_change(db, "wallet", wallet_id, user_id, OP_CREATE)
+
+        (event,) = db.added
+        assert (event.entity, event.entity_id, event.user_id, event.op) == ("wallet", wallet_id, user_id, "create")
+
+    def test_2_relay_stamps_publishes_in_order_then_deletes(self, monkeypatch):
+        fake_redis = FakeRedis()
+        monkeypatch.setattr(outbox_relay, "redis_client", fake_redis)
+        # Nothing stamped yet -> stamp; change version 9 committed before 7 and was stamped first
+        db = FakeSession(True, [], None, [_event(9, relay_version=3), _event(7, relay_version=4)])
+
+        assert asyncio.run(outbox_relay.relay_outbox_batch(db)) == 2
+        assert any("SET relay_version = base.value + numbered.n" in stmt for stmt in db.executed)
+        assert [fields["version"] for _, fields in fake_redis.entries] == [3, 4]
+        assert all(stream == settings.OUTBOX_STREAM_KEY for stream, _ in fake_redis.entries)
+        assert db.executed[-2].startswith("DELETE FROM outbox_events")
+        # Session-level lock, held through the publish and released at the end
+        assert "pg_try_advisory_lock" in db.executed[0]
+        assert "pg_advisory_unlock" in db.executed[-1]
+        assert db.committed
+
+    def test_3_relay_skips_when_another_worker_holds_the_lock(self, monkeypatch):
+        fake_redis = FakeRedis()
+        monkeypatch.setattr(outbox_relay, "redis_client", fake_redis)
+        db = FakeSession(False, [_event(1, relay_version=1)])
+
+        assert asyncio.run(outbox_relay.relay_outbox_batch(db)) == 0
+        assert fake_redis.entries == []
+
+    def test_4_unfinished_batch_is_republished_before_stamping(self, monkeypatch):
+        fake_redis = FakeRedis()
+        monkeypatch.setattr(outbox_relay, "redis_client", fake_redis)
+        db = FakeSession(True, [_event(5, relay_version=2)])
+
+        assert asyncio.run(outbox_relay.relay_outbox_batch(db)) == 1
+        assert [fields["version"] for _, fields in fake_redis.entries] == [2]
+        assert not any("SET relay_version" in stmt for stmt in db.executed)
+
+    def test_5_lock_is_released_when_publishing_fails(self, monkeypatch):
+        monkeypatch.setattr(outbox_relay, "redis_client", FakeRedis(fail=True))
+        db = FakeSession(True, [_event(5, relay_version=2)])
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(outbox_relay.relay_outbox_batch(db))
+        assert not any(stmt.startswith("DELETE FROM outbox_events") for stmt in db.executed)
+        assert "pg_advisory_unlock" in db.executed[-1]
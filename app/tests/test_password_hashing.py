@@ -0,0 +1,36 @@
+import asyncio
+import pytest
+from passlib.context import CryptContext
+
+from app.core import hashing
+from app.core.config import settings
+
+class TestPasswordHashing:
+
+    def test_1_hash_and_verify_in_pool(self):
+        hashed = asyncio.run(hashing.hash_password("testpassword123"))
+
+        is_valid, new_hash = asyncio.run(hashing.check_password("testpassword123", hashed))
+        assert is_valid is True
+        assert new_hash is None
+
+        is_valid, _ = asyncio.run(hashing.check_password("wrong-password", hashed))
+        assert is_valid is False
+
+    def test_2_outdated_cost_is_rehashed(self):
+        old_context = CryptContext(
+            schemes=["pbkdf2_sha256"],
+            pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS + 1000,
+        )
+        old_hash = old_context.hash(b"testpassword123")
+
+        is_valid, new_hash = asyncio.run(hashing.check_password("testpassword123", old_hash))
+        assert is_valid is True
+        assert new_hash is not None
+        assert f"${settings.PASSWORD_HASH_ROUNDS}$" in new_hash
+
+    def test_3_saturated_pool_raises(self, monkeypatch):
+        monkeypatch.setattr(hashing, "_pending_jobs", settings.PASSWORD_HASH_MAX_PENDING)
+
+        with pytest.raises(hashing.PasswordHashPoolSaturated):
+            asyncio.run(hashing.hash_password("testpassword123"))
@@ -0,0 +1,28 @@
+from app.core.pool_stats import PoolStats
+from app.core.config import settings
+from app.core import db
+
+class TestPoolStats:
+
+    def test_1_wait_histogram_is_cumulative(self):
+        stats = PoolStats()
+        for seconds in (0.0005, 0.003, 0.003, 0.2, 7.0):
+            stats.record_wait(seconds)
+
+        data = stats.as_dict()
+        assert data["checkouts_total"] == 5
+        assert data["wait_ms_buckets"]["1"] == 1
+        assert data["wait_ms_buckets"]["5"] == 3
+        assert data["wait_ms_buckets"]["250"] == 4
+        assert data["wait_ms_buckets"]["+Inf"] == 5
+        assert data["wait_ms_max"] == 7000.0
+
+    def test_2_pool_sizing_splits_budget_across_workers(self, monkeypatch):
+        monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+        monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 60)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", None)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", None)
+
+        pool_size, max_overflow = db.pool_sizing()
+        assert (pool_size, max_overflow) == (10, 5)
+        assert (pool_size + max_overflow) * 4 <= 60
@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from app.core import profiling
+from app.core.config import settings
+
+def frame(function, time, children=()):
+    return SimpleNamespace(function=function, file_path_short="app/x.py", line_no=1, time=time, children=list(children))
+
+class TestProfiling:
+
+    def test_1_collapsed_stacks_use_self_time(self):
+        root = frame("handler", 0.010, [frame("query", 0.006), frame("render", 0.001)])
+        lines = profiling.collapsed_stacks(root)
+        assert lines[0] == "handler (app/x.py:1) 3000"
+        assert lines[1] == "handler (app/x.py:1);query (app/x.py:1) 6000"
+
+    def test_2_filename_carries_route_and_duration(self):
+        name = profiling.profile_filename("GET", "/api/v1/transactions/{transaction_id}", 123.4, "speedscope")
+        assert name.endswith("_GET_api_v1_transactions_transaction_id_123ms.speedscope.json")
+
+    def test_3_header_requires_internal_key(self, monkeypatch):
+        monkeypatch.setattr(settings, "INTERNAL_API_KEY", "secret")
+        scope = {"headers": [(b"x-profile", b"1"), (b"x-internal-key", b"secret")]}
+        assert profiling.ProfilerMiddleware._requested(scope)
+        scope = {"headers": [(b"x-profile", b"1"), (b"x-internal-key", b"wrong")]}
+        assert not profiling.ProfilerMiddleware._requested(scope)
+        assert not profiling.ProfilerMiddleware._requested({"headers": [(b"x-profile", b"1")]})
@@ -0,0 +1,63 @@
+import asyncio
+
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.core.config import settings
+from app.core.rate_limit import LocalTokenBuckets, RateLimitMiddleware, _load_policies
+
+class TestRateLimit:
+
+    def test_1_local_bucket_allows_burst_then_blocks(self):
+        buckets = LocalTokenBuckets(max_keys=10)
+
+        results = [buckets.take("ip:1.2.3.4", capacity=3, rate=0.001)[0] for _ in range(4)]
+        assert results == [True, True, True, False]
+
+    def test_2_local_bucket_evicts_oldest_keys(self):
+        buckets = LocalTokenBuckets(max_keys=2)
+        for key in ("a", "b", "c"):
+            buckets.take(key, capacity=1, rate=1.0)
+
+        assert list(buckets._buckets) == ["b", "c"]
+
+    def test_3_most_specific_policy_wins(self, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_POLICIES", {
+            "/api/v1/": (120, 20.0),
+            "POST /api/v1/token": (5, 0.1),
+            "/api/v1/token": (50, 1.0),
+            "/api/v1/transactions": (60, 10.0),
+        })
+        middleware = RateLimitMiddleware(app=None)
+        middleware.policies = _load_policies()
+
+        assert middleware._match("POST", "/api/v1/token").name == "POST /api/v1/token"
+        assert middleware._match("GET", "/api/v1/token").name == "/api/v1/token"
+        assert middleware._match("GET", "/api/v1/transactions/").name == "/api/v1/transactions"
+        assert middleware._match("GET", "/api/v1/wallets/").name == "/api/v1/"
+        assert middleware._match("GET", "/docs") is None
+
+    def test_4_anonymous_identity_uses_forwarded_client_from_trusted_proxy(self):
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(RateLimitMiddleware._identity(scope))
+
+        proxied = ProxyHeadersMiddleware(app, trusted_hosts="10.0.0.1")
+        for peer in ("10.0.0.1", "198.51.100.9"):
+            scope = {
+                "type": "http", "scheme": "http", "client": (peer, 5000),
+                "headers": [(b"x-forwarded-for", b"203.0.113.7")],
+            }
+            asyncio.run(proxied(scope, None, None))
+        # Spoofed header from an untrusted peer is ignored
+        assert seen == ["ip:203.0.113.7", "ip:198.51.100.9"]
+
+    def test_5_token_refresh_does_not_share_the_login_bucket(self):
+        middleware = RateLimitMiddleware(app=None)
+        middleware.policies = _load_policies() # Default RATE_LIMIT_POLICIES
+
+        login = middleware._match("POST", "/api/v1/token")
+        refresh = middleware._match("POST", "/api/v1/token/refresh")
+        assert login.name == "POST /api/v1/token"
+        assert refresh.name == "POST /api/v1/token/refresh"
+        assert refresh.capacity > login.capacity
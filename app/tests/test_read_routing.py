@@ -0,0 +1,44 @@
+import asyncio
+import uuid
+
+from app.core import consistency
+from app.core.config import settings
+
+class TestReadYourWrites:
+
+    def test_1_local_write_mark_routes_to_primary_without_redis(self, monkeypatch):
+        async def fail(*args, **kwargs):
+            raise AssertionError("Redis must not be queried while a local mark is active")
+
+        async def scenario():
+            user_id = uuid.uuid4()
+            consistency.note_user_write(user_id)
+            monkeypatch.setattr(consistency.redis_client, "exists", fail)
+            return await consistency.recently_wrote(str(user_id))
+
+        monkeypatch.setattr(consistency, "_publish_write_mark", lambda user_id: asyncio.sleep(0))
+        assert asyncio.run(scenario()) is True
+
+    def test_2_redis_outage_falls_back_to_primary(self, monkeypatch):
+        async def unavailable(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(consistency.redis_client, "exists", unavailable)
+        assert asyncio.run(consistency.recently_wrote(str(uuid.uuid4()))) is True
+
+    def test_3_expired_local_marks_are_pruned_on_write(self, monkeypatch):
+        monkeypatch.setattr(consistency, "_local_marks", consistency.OrderedDict())
+        monkeypatch.setattr(consistency, "_publish_write_mark", lambda user_id: asyncio.sleep(0))
+
+        async def scenario():
+            # Marks that have already expired, never looked up again by a read
+            monkeypatch.setattr(settings, "REPLICA_READ_YOUR_WRITES_SECONDS", -1.0)
+            for _ in range(100):
+                consistency.note_user_write(uuid.uuid4())
+            monkeypatch.setattr(settings, "REPLICA_READ_YOUR_WRITES_SECONDS", 5.0)
+            latest = uuid.uuid4()
+            consistency.note_user_write(latest)
+            return latest
+
+        latest = asyncio.run(scenario())
+        assert list(consistency._local_marks) == [str(latest)]
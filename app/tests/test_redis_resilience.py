@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
+
+from app.core import redis as redis_core
+from app.core.redis import CircuitBreaker
+
+class TestRedisResilience:
+
+    def test_1_breaker_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == "closed" and breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+    def test_2_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        assert breaker.allow()  # single probe
+        assert breaker.state == "half-open"
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.failures == 0
+
+    def test_3_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+    def test_4_cache_helpers_degrade_to_miss(self, monkeypatch):
+        async def down(*args, **kwargs):
+            raise RedisConnectionError("connection refused")
+
+        monkeypatch.setattr(redis_core.redis_client, "get", down)
+        monkeypatch.setattr(redis_core.redis_client, "delete", down)
+        assert asyncio.run(redis_core.cache_get("summary:x")) is None
+        assert asyncio.run(redis_core.cache_delete("summary:x")) is None
+
+    def test_5_open_breaker_fails_fast_without_io(self, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+        breaker.record_failure()
+        monkeypatch.setattr(redis_core.redis_client, "breaker", breaker)
+        assert asyncio.run(redis_core.cache_get_many(["a", "b"])) == [None, None]
+
+    def test_6_probe_never_stays_in_flight(self):
+        async def reply_error():
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        async def healthy():
+            return "PONG"
+
+        # A ResponseError is still a reply: the probe closes the breaker
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        with pytest.raises(ResponseError):
+            asyncio.run(redis_core._guarded(breaker, reply_error))
+        assert breaker.state == "closed"
+        assert asyncio.run(redis_core._guarded(breaker, healthy)) == "PONG"
+
+        # A cancelled probe re-opens it, and the next call may probe again
+        breaker.record_failure()
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(redis_core._guarded(breaker, cancelled))
+        assert breaker.state == "open"
+        assert asyncio.run(redis_core._guarded(breaker, healthy)) == "PONG"
+        assert breaker.state == "closed"
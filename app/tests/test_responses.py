@@ -0,0 +1,80 @@
+import asyncio
+import gzip
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.core import compression
+from app.core.responses import FastJSONResponse
+from app.crud import statements
+from app.schemas.budget import BudgetResponse
+from app.schemas.category import CategoryResponse
+from app.schemas.common import APIResponse
+from app.schemas.debt import DebtLedgerResponse
+from app.schemas.transaction import TransactionListAdapter, TransactionResponse
+from app.schemas.wallet import WalletResponse
+
+class TestResponses:
+
+    def test_1_fast_json_handles_decimal_uuid_datetime(self):
+        wallet_id = uuid.uuid4()
+        body = FastJSONResponse({
+            "id": wallet_id, "balance": Decimal("10.50"), "at": datetime(2024, 1, 1, tzinfo=timezone.utc)
+        }).body
+        assert body == f'{{"id":"{wallet_id}","balance":"10.50","at":"2024-01-01T00:00:00+00:00"}}'.encode()
+
+    def test_2_models_render_like_fastapi(self):
+        model = APIResponse[WalletResponse](data=WalletResponse(
+            wallet_id=uuid.uuid4(), user_id=uuid.uuid4(), wallet_name="Kas", currency="IDR", current_balance=Decimal("5.00")
+        ))
+        assert FastJSONResponse(model).body == FastJSONResponse(model.model_dump(mode="json")).body
+
+    def test_3_negotiation_honours_q_values(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", object())
+        assert compression.negotiate_encoding("gzip, deflate, br") == "br"
+        assert compression.negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+        assert compression.negotiate_encoding("identity") is None
+        monkeypatch.setattr(compression, "brotli", None)
+        assert compression.negotiate_encoding("br, gzip") == "gzip"
+
+    def test_4_large_json_is_gzipped_and_etag_weakened(self, client):
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+
+        sent = []
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", b"application/json"), (b"etag", b'"abc"')]})
+            await send({"type": "http.response.body", "body": b"[" + b"1," * 2000 + b"1]"})
+        async def capture(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(compression.CompressionMiddleware(app)(scope, None, capture))
+        headers = dict(sent[0]["headers"])
+        assert headers[b"etag"] == b'W/"abc"'
+        assert gzip.decompress(sent[1]["body"]).startswith(b"[1,1")
+
+    def test_5_list_projections_cover_response_fields(self):
+        pairs = [
+            (statements.WALLET_LIST_SELECT, WalletResponse),
+            (statements.WALLET_LIST_SELECT_WITH_PENDING, WalletResponse),
+            (statements.TRANSACTION_LIST_SELECT, TransactionResponse),
+            (statements.DEBT_LIST_SELECT, DebtLedgerResponse),
+            (statements.BUDGET_LIST_SELECT, BudgetResponse),
+        ]
+        for stmt, schema in pairs:
+            assert set(stmt.selected_columns.keys()) == set(schema.model_fields)
+        # Categories are listed from the cached tables (app.crud.category), loaded with user_id too
+        assert set(CategoryResponse.model_fields) <= set(statements.CATEGORY_CACHE_SELECT.selected_columns.keys())
+
+    def test_6_list_adapter_validates_rows(self):
+        Row = namedtuple("Row", list(TransactionResponse.model_fields))
+        row = Row(
+            transaction_id=uuid.uuid4(), wallet_id=uuid.uuid4(), category_id=uuid.uuid4(), transaction_type="EXPENSE",
+            amount=Decimal("12.00"), description="kopi", transaction_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        [validated] = TransactionListAdapter.validate_python([row], from_attributes=True)
+        assert validated.transaction_id == row.transaction_id and validated.amount == Decimal("12.00")
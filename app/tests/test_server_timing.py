@@ -0,0 +1,54 @@
+import asyncio
+
+from app.core import request_timing
+from app.core.responses import FastJSONResponse
+
+class FakePipeline:
+    async def execute(self):
+        await asyncio.sleep(0.01)
+        return [1]
+
+class FakeRedis:
+    async def execute_command(self, *args, **options):
+        await asyncio.sleep(0.01)
+        return "1"
+
+    def pipeline(self, transaction=True):
+        return FakePipeline()
+
+class TestServerTiming:
+
+    def test_1_header_format(self):
+        header = request_timing.server_timing_header([("db", 12.345, "3 queries"), ("total", 20.0, None)])
+        assert header == 'db;dur=12.35;desc="3 queries", total;dur=20.00'
+
+    def test_2_marks_are_noops_outside_a_request(self):
+        assert request_timing.current() is None
+        request_timing.mark_endpoint_done()
+        FastJSONResponse({"ok": True})
+
+    def test_3_middleware_adds_header_with_serialize_and_redis(self):
+        client = FakeRedis()
+        request_timing.instrument_redis(client)
+
+        async def app(scope, receive, send):
+            await client.execute_command("GET", "x")
+            await client.pipeline().execute()
+            request_timing.mark_endpoint_done()
+            response = FastJSONResponse({"ok": True})
+            await response(scope, receive, send)
+
+        sent = []
+
+        async def capture(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/x", "headers": []}
+        asyncio.run(request_timing.ServerTimingMiddleware(app)(scope, None, capture))
+
+        header = dict(sent[0]["headers"])[b"server-timing"].decode()
+        entries = {part.split(";")[0]: float(part.split("dur=")[1].split(";")[0]) for part in header.split(", ")}
+        assert set(entries) == {"auth", "db", "redis", "serialize", "total"}
+        assert entries["redis"] >= 20
+        assert 'desc="0 queries"' in header
+        assert request_timing.current() is None
@@ -0,0 +1,34 @@
+import uuid
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.dependencies import ReleaseSessionRoute
+from app.core import slow_queries
+
+class TestSlowQueries:
+
+    def test_1_params_shape_hides_values(self):
+        shape = slow_queries.params_shape((uuid.uuid4(), "%kopi%", 10))
+        assert shape == "(UUID, str, int)"
+        assert slow_queries.params_shape({"user_id": uuid.uuid4()}) == "{user_id: UUID}"
+        assert slow_queries.params_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+
+    def test_2_only_plain_selects_are_explained(self):
+        assert slow_queries.is_explainable("SELECT transactions.amount FROM transactions WHERE wallet_id IN (SELECT 1)")
+        assert not slow_queries.is_explainable("SELECT wallets.wallet_id FROM wallets\nFOR NO KEY UPDATE")
+        assert not slow_queries.is_explainable("UPDATE wallets SET current_balance = 0")
+        assert not slow_queries.is_explainable("WITH moved AS (DELETE FROM wallet_balance_deltas RETURNING *) SELECT 1")
+
+    def test_3_route_handler_sets_endpoint_label(self):
+        router = APIRouter(prefix="/items", route_class=ReleaseSessionRoute)
+
+        @router.get("/{item_id}")
+        async def read_item(item_id: int):
+            return {"endpoint": slow_queries.current_endpoint.get()}
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        response = TestClient(app).get("/api/v1/items/7")
+        assert response.json() == {"endpoint": "GET /api/v1/items/{item_id}"}
+        assert slow_queries.current_endpoint.get() is None
@@ -0,0 +1,102 @@
+import asyncio
+import uuid
+
+from httpx import Client
+
+from app.crud import sync as crud_sync
+
+def _sync(client: Client, since: str, limit: int = 1000):
+    response = client.get("/api/v1/sync/", params={"since": since, "limit": limit})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+def _drain(client: Client, since: str):
+    changes = []
+    while True:
+        page = _sync(client, since, limit=2)
+        changes += page["changes"]
+        since = page["next_cursor"]
+        if not page["has_more"]:
+            return changes, since
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.value
+
+class FakeSession:
+    """Answers the watermark query, then every scan with no rows, then the pruned horizon."""
+    def __init__(self, watermark, pruned_xid):
+        self.watermark = watermark
+        self.pruned_xid = pruned_xid
+        self.executed = []
+
+    async def execute(self, stmt, params=None):
+        self.executed.append(stmt)
+        if stmt is crud_sync.SYNC_WATERMARK_SQL:
+            return FakeResult(self.watermark)
+        if stmt is crud_sync.PRUNED_XID_SQL:
+            return FakeResult(self.pruned_xid)
+        return FakeResult([])
+
+class TestSyncEndpoint:
+
+    def test_1_changes_since_cursor_include_upserts_and_deletes(self, client: Client):
+        _, cursor = _drain(client, "")
+
+        created = client.post("/api/v1/wallets/", json={"wallet_name": "Sync Wallet", "currency": "IDR", "initial_balance": 10})
+        wallet_id = created.json()["data"]["wallet_id"]
+        client.put(f"/api/v1/wallets/{wallet_id}", json={"wallet_name": "Sync Wallet Renamed", "currency": "IDR"})
+
+        changes, cursor = _drain(client, cursor)
+        upserts = [c for c in changes if c["id"] == wallet_id]
+        assert [c["op"] for c in upserts] == ["upsert"]  # only the latest row version is returned
+        assert upserts[0]["data"]["wallet_name"] == "Sync Wallet Renamed"
+
+        client.delete(f"/api/v1/wallets/{wallet_id}")
+        changes, _ = _drain(client, cursor)
+        assert [(c["entity"], c["op"]) for c in changes if c["id"] == wallet_id] == [("wallet", "delete")]
+
+    def test_2_pages_are_ordered_and_bounded(self, client: Client):
+        for i in range(3):
+            client.post("/api/v1/categories/", json={"category_name": f"Sync Cat {i}", "type": "EXPENSE"})
+
+        page = _sync(client, "", limit=2)
+        assert len(page["changes"]) == 2
+        assert page["has_more"] is True
+        assert page["next_cursor"].endswith(f".{page['changes'][-1]['version']}")
+
+        # The next page continues after the cursor, without repeating a change
+        rest, _ = _drain(client, page["next_cursor"])
+        assert not {c["id"] for c in page["changes"]} & {c["id"] for c in rest}
+
+    def test_3_cursor_round_trip(self):
+        assert crud_sync.parse_cursor(None) == crud_sync.START_CURSOR
+        assert crud_sync.parse_cursor("0") == crud_sync.START_CURSOR
+        assert crud_sync.parse_cursor(crud_sync.format_cursor((812, 4051))) == (812, 4051)
+        assert crud_sync.parse_cursor("812") is None
+        assert crud_sync.parse_cursor("-1.5") is None
+
+    def test_4_changes_are_bounded_by_the_commit_watermark(self):
+        db = FakeSession(watermark=900, pruned_xid=0)
+        changes, cursor, has_more = asyncio.run(crud_sync.get_changes_since(db, uuid.uuid4(), (812, 4051), 10))
+        assert (changes, cursor, has_more) == ([], (812, 4051), False)
+        # Every scan excludes transactions at or above the watermark
+        scans = [stmt for stmt in db.executed if stmt not in (crud_sync.SYNC_WATERMARK_SQL, crud_sync.PRUNED_XID_SQL)]
+        assert len(scans) == len(crud_sync.SYNCED_ENTITIES) + 1
+        assert all("row_xid <" in str(stmt) for stmt in scans)
+
+    def test_5_cursor_older_than_pruned_tombstones_must_resync(self):
+        db = FakeSession(watermark=900, pruned_xid=812)
+        assert asyncio.run(crud_sync.get_changes_since(db, uuid.uuid4(), (812, 4051), 10)) is None
+        # A full sync is never refused
+        db = FakeSession(watermark=900, pruned_xid=812)
+        assert asyncio.run(crud_sync.get_changes_since(db, uuid.uuid4(), crud_sync.START_CURSOR, 10)) is not None
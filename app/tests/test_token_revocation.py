@@ -0,0 +1,38 @@
+import asyncio
+import uuid
+
+from app.core import token_store
+from app.core.security import create_access_token, create_refresh_token, decode_token, REFRESH_TOKEN_TYPE
+
+class TestTokenRevocation:
+
+    def test_1_bloom_filter_has_no_false_negatives(self):
+        bloom = token_store.BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [uuid.uuid4().hex for _ in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+
+    def test_2_bloom_filter_false_positive_rate_is_bounded(self):
+        bloom = token_store.BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom.add(uuid.uuid4().hex)
+
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        assert false_positives < 300 # ~1% expected; generous bound to avoid flakiness
+
+    def test_3_unrevoked_token_skips_redis(self, monkeypatch):
+        async def fail_exists(*args):
+            raise AssertionError("Redis must not be queried for a bloom-filter miss")
+
+        monkeypatch.setattr(token_store.redis_client, "exists", fail_exists)
+        assert asyncio.run(token_store.is_token_revoked(uuid.uuid4().hex)) is False
+
+    def test_4_refresh_token_is_not_accepted_as_access_token(self):
+        refresh_token, _, _ = create_refresh_token(subject=uuid.uuid4())
+        access_token = create_access_token(subject=uuid.uuid4())
+
+        assert decode_token(refresh_token) is None
+        assert decode_token(refresh_token, expected_type=REFRESH_TOKEN_TYPE) is not None
+        assert decode_token(access_token)["jti"]
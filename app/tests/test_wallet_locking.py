@@ -0,0 +1,99 @@
+import asyncio
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.retry import DEADLOCK_DETECTED, retry_on_conflict
+from app.crud import report as crud_report
+from app.models.user import User
+from app.models.wallet import Wallet
+
+class FakeDriverError(Exception):
+    def __init__(self, sqlstate):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+class TestWalletLocking:
+
+    def test_1_retries_deadlocks_then_succeeds(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_CONFLICT_RETRY_BASE_DELAY", 0)
+        calls = []
+
+        @retry_on_conflict
+        async def flaky(db):
+            calls.append(1)
+            if len(calls) < 3:
+                raise DBAPIError("UPDATE wallets", None, FakeDriverError(DEADLOCK_DETECTED))
+            return "ok"
+
+        db = FakeSession()
+        assert asyncio.run(flaky(db)) == "ok"
+        assert len(calls) == 3
+        assert db.rollbacks == 2
+
+    def test_2_other_errors_are_not_retried(self):
+        calls = []
+
+        @retry_on_conflict
+        async def broken(db):
+            calls.append(1)
+            raise DBAPIError("INSERT", None, FakeDriverError("23505"))
+
+        with pytest.raises(DBAPIError):
+            asyncio.run(broken(FakeSession()))
+        assert len(calls) == 1
+
+    def test_3_opposite_transfers_do_not_deadlock(self, client):
+        """Stress: many concurrent transfers in both directions between one pair of wallets."""
+        transfers, start_balance = 40, Decimal("1000.00")
+
+        async def scenario():
+            engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+            sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+            user_id, wallet_a, wallet_b = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+            try:
+                async with sessions() as db:
+                    db.add(User(user_id=user_id, email=f"stress_{user_id}@test.com", password_hash="x", is_active=True))
+                    await db.flush()
+                    db.add_all([
+                        Wallet(wallet_id=wallet_a, user_id=user_id, wallet_name="A", currency="IDR", current_balance=start_balance),
+                        Wallet(wallet_id=wallet_b, user_id=user_id, wallet_name="B", currency="IDR", current_balance=start_balance),
+                    ])
+                    await db.commit()
+
+                async def transfer(i):
+                    source, target = (wallet_a, wallet_b) if i % 2 else (wallet_b, wallet_a)
+                    async with sessions() as db:
+                        return await crud_report.perform_atomic_transfer(
+                            db, user_id, source, target, Decimal(str(i % 7 + 1)), f"stress {i}"
+                        )
+
+                results = await asyncio.gather(*(transfer(i) for i in range(transfers)))
+
+                async with sessions() as db:
+                    balances = dict((await db.execute(
+                        select(Wallet.wallet_id, Wallet.current_balance).where(Wallet.user_id == user_id)
+                    )).all())
+                return results, balances, wallet_a, wallet_b
+            finally:
+                await engine.dispose()
+
+        results, balances, wallet_a, wallet_b = asyncio.run(scenario())
+
+        assert all(len(pair) == 2 for pair in results)
+        moved_to_b = sum(Decimal(str(i % 7 + 1)) * (1 if i % 2 else -1) for i in range(transfers))
+        assert balances[wallet_a] == start_balance - moved_to_b
+        assert balances[wallet_b] == start_balance + moved_to_b
@@ -0,0 +1,129 @@
+"""
+Microbenchmark: per-call Python overhead of the hot CRUD statements, comparing the
+previous per-call `select(...)` construction ("before") with the cached lambda
+statements in app/crud/statements.py ("after").
+
+Both variants execute against the same tiny in-memory SQLite database, so the
+database work is identical and negligible; the difference is statement construction,
+cache-key generation and compiled-cache lookup on the Python side.
+
+Usage:
+    python -m benchmarks.crud_statements [--calls 20000] [--json out.json]
+"""
+import argparse
+import json
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import case, create_engine, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.base import Base
+from app.crud import statements
+from app.models import Category, Transaction, User, Wallet
+from app.models.category import TransactionType
+
+# --- "Before": statements rebuilt on every call, as the CRUD layer used to do ---
+
+def before_wallet_by_id(wallet_id, user_id):
+    return select(Wallet).where(Wallet.wallet_id == wallet_id).where(Wallet.user_id == user_id)
+
+def before_transactions_page(user_id, q, limit, offset):
+    wallet_check = select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()
+    base_query = select(Transaction).where(Transaction.wallet_id.in_(wallet_check))
+    if q:
+        base_query = base_query.where(Transaction.description.ilike(f"%{q}%"))
+    count_query = select(func.count()).select_from(base_query.subquery())
+    page_query = base_query.order_by(Transaction.transaction_date.desc()).limit(limit).offset(offset)
+    return page_query, count_query
+
+def before_financial_summary(user_id):
+    wallet_check = select(Wallet.wallet_id).where(Wallet.user_id == user_id).scalar_subquery()
+    income_case = case((Transaction.transaction_type == TransactionType.INCOME, Transaction.amount), else_=0)
+    expense_case = case((Transaction.transaction_type == TransactionType.EXPENSE, Transaction.amount), else_=0)
+    return select(
+        func.sum(income_case).label('total_income'),
+        func.sum(expense_case).label('total_expense')
+    ).where(Transaction.wallet_id.in_(wallet_check))
+
+def before_adjust_wallet_balance(wallet_id, adjustment):
+    return update(Wallet).where(Wallet.wallet_id == wallet_id).values(current_balance=Wallet.current_balance + adjustment)
+
+# --- Harness ---
+
+def _seed(session: Session):
+    user = User(user_id=uuid.uuid4(), email="bench@finanzio.id", password_hash="x")
+    wallet = Wallet(wallet_id=uuid.uuid4(), user_id=user.user_id, wallet_name="Cash", currency="IDR", current_balance=0)
+    category = Category(category_id=uuid.uuid4(), user_id=user.user_id, category_name="Food", type=TransactionType.EXPENSE)
+    session.add_all([user, wallet, category])
+    session.flush()
+    session.add_all([
+        Transaction(wallet_id=wallet.wallet_id, category_id=category.category_id, transaction_type=TransactionType.EXPENSE,
+                    amount=Decimal("1.00"), description=f"coffee {i}")
+        for i in range(20)
+    ])
+    session.commit()
+    return user.user_id, wallet.wallet_id
+
+def _run(session: Session, stmts) -> None:
+    for stmt in stmts:
+        result = session.execute(stmt)
+        if stmt.is_select:
+            result.all()
+
+def _time(session: Session, calls: int, build) -> float:
+    """Microseconds per call; a fresh uuid per call mirrors distinct request parameters."""
+    _run(session, build(uuid.uuid4()))  # warm the compiled cache
+    started = time.perf_counter()
+    for _ in range(calls):
+        _run(session, build(uuid.uuid4()))
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file.")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    # Only the benchmarked tables: others (outbox, sync) use Postgres-only sequences
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in (User, Wallet, Category, Transaction)])
+
+    with Session(engine) as session:
+        _, wallet_id = _seed(session)
+
+        cases = {
+            "wallet_by_id": (
+                lambda uid: [before_wallet_by_id(wallet_id, uid)],
+                lambda uid: [statements.wallet_by_id(wallet_id, uid)],
+            ),
+            "transactions_page": (
+                lambda uid: before_transactions_page(uid, "coffee", 10, 0),
+                lambda uid: statements.transactions_page(uid, "coffee", 10, 0),
+            ),
+            "financial_summary": (
+                lambda uid: [before_financial_summary(uid)],
+                lambda uid: [statements.financial_summary(uid)],
+            ),
+            "adjust_wallet_balance": (
+                lambda uid: [before_adjust_wallet_balance(wallet_id, Decimal("1.00"))],
+                lambda uid: [statements.adjust_wallet_balance(wallet_id, Decimal("1.00"))],
+            ),
+        }
+
+        results = {}
+        for name, (before, after) in cases.items():
+            before_us = _time(session, args.calls, before)
+            after_us = _time(session, args.calls, after)
+            session.rollback()
+            results[name] = {"before_us": round(before_us, 2), "after_us": round(after_us, 2)}
+            print(f"{name:<24} before={before_us:>8.2f} us/call  after={after_us:>8.2f} us/call  "
+                  f"speedup={before_us / after_us:>5.2f}x")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Synthetic dataset generator: loads production-like volumes into the configured PostgreSQL
+database, deterministically from --seed (same arguments, same rows, same UUIDs).
+
+Shape of the data:
+  * a few SME users (--sme-users) own --sme-share of all transactions, with many wallets,
+    custom categories and debts; the remaining users are light, Pareto-skewed ledgers;
+  * transactions follow seasonal month weights (Lebaran, school year, December), busier
+    weekends and post-payday spending, over --months ending at --end-date;
+  * wallets in IDR (mostly), USD and SGD; monthly budgets; receivables/payables;
+  * wallet current_balance is consistent with the generated transactions.
+
+Rows are built from the models' table definitions and bulk-loaded with COPY, one process
+(and connection) per --workers, each loading its own slice of users in one transaction.
+The change feed is bypassed (no outbox events); row versions come from the usual triggers.
+
+Usage:
+    python -m app.initial_data      # once: migrations + system categories + mock user
+    python -m benchmarks.generate_dataset [--users 5000] [--transactions 2000000]
+        [--sme-users 20] [--sme-share 0.4] [--mock-user-transactions 50000]
+        [--seed 42] [--workers 4] [--reset]
+
+Generated users are user<N>@bench.finanzio.id (password "benchpassword"); --reset deletes
+them (and the mock user's generated rows) before loading.
+"""
+import argparse
+import asyncio
+import calendar
+import math
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings, MOCK_USER_A_ID
+from app.core.hashing import get_password_hash
+from app.models import Budget, Category, DebtLedger, Transaction, User, Wallet
+
+EMAIL_DOMAIN = "bench.finanzio.id"
+BENCH_WALLET_PREFIX = "Bench "
+PASSWORD = "benchpassword"
+
+# Month -> relative activity (Indonesian calendar: Lebaran around Mar/Apr, new school year in July)
+MONTH_WEIGHTS = {1: 0.85, 2: 0.85, 3: 1.15, 4: 1.25, 5: 0.95, 6: 1.0, 7: 1.15, 8: 0.95, 9: 0.9, 10: 0.95, 11: 1.0, 12: 1.35}
+CURRENCIES = (("IDR", 1), ("USD", 15_000), ("SGD", 11_000))   # (code, IDR per unit)
+WALLET_NAMES = ("Cash", "BCA", "Mandiri", "BRI", "GoPay", "OVO", "Kartu Kredit", "Kas Toko", "Rekening Usaha")
+SME_CATEGORIES = (("Penjualan", "INCOME"), ("Bahan Baku", "EXPENSE"), ("Gaji Karyawan", "EXPENSE"),
+                  ("Sewa Tempat", "EXPENSE"), ("Ongkos Kirim", "EXPENSE"))
+DESCRIPTIONS = {
+    "INCOME": ("gaji", "penjualan", "transfer masuk", "bonus", "pembayaran invoice"),
+    "EXPENSE": ("kopi", "makan siang", "bensin", "listrik", "belanja bulanan", "pulsa", "parkir", "ojek", "bahan baku"),
+}
+CONTACTS = ("Budi", "Siti", "Agus", "Dewi", "Rina", "Joko", "Toko Maju", "CV Sejahtera", "PT Sumber Rezeki")
+
+def columns(model) -> List[str]:
+    """Insertable columns of the model's table (row_version/row_xid/updated_at are filled by triggers)."""
+    return [c.name for c in model.__table__.columns if c.name not in ("row_version", "row_xid", "updated_at")]
+
+def new_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+def money(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+# --- Plan (cheap, sequential, deterministic) ---
+
+def plan_users(args) -> List[Tuple[int, bool, int]]:
+    """(index, is_sme, transaction_count) per user; index -1 is the mock user."""
+    rng = random.Random(f"{args.seed}:plan")
+    sme = min(args.sme_users, args.users)
+    light = args.users - sme
+    remaining = max(args.transactions - args.mock_user_transactions, 0)
+
+    def split(total: int, n: int, alpha: float) -> List[int]:
+        weights = [rng.paretovariate(alpha) for _ in range(n)]
+        scale = total / sum(weights) if weights else 0
+        return [int(w * scale) for w in weights]
+
+    sme_counts = split(int(remaining * args.sme_share), sme, 3.0)
+    light_counts = split(remaining - sum(sme_counts), light, 1.3)
+    plan = [(i, True, c) for i, c in enumerate(sme_counts)]
+    plan += [(sme + i, False, c) for i, c in enumerate(light_counts)]
+    if args.mock_user_transactions:
+        plan.append((-1, True, args.mock_user_transactions))
+    return plan
+
+def day_weights(end: date, months: int) -> Tuple[List[date], List[float]]:
+    """Every day in the window with cumulative weights (season x weekday x payday cycle)."""
+    start = (end.replace(day=1) - timedelta(days=1)).replace(day=1)
+    for _ in range(months - 2):
+        start = (start - timedelta(days=1)).replace(day=1)
+    days, cumulative, total = [], [], 0.0
+    day = start
+    while day <= end:
+        weight = MONTH_WEIGHTS[day.month] * (1.3 if day.weekday() >= 5 else 1.0)
+        # Spending peaks right after the 25th (payday) and fades towards mid-month
+        since_payday = (day.day - 25) % calendar.monthrange(day.year, day.month)[1]
+        weight *= 1.0 + 0.6 * math.exp(-since_payday / 6)
+        total += weight
+        days.append(day)
+        cumulative.append(total)
+        day += timedelta(days=1)
+    return days, cumulative
+
+# --- Row generation (per user, in worker processes) ---
+
+def generate_user(index: int, is_sme: bool, tx_count: int, args, system_categories: Dict[str, List[uuid.UUID]],
+                  days: List[date], cum_weights: List[float], password_hash: str) -> Dict[str, list]:
+    rng = random.Random(f"{args.seed}:user:{index}")
+    rows: Dict[str, list] = {"users": [], "categories": [], "wallets": [], "transactions": [], "budgets": [], "debt_ledgers": []}
+    created = datetime.combine(days[0], datetime.min.time(), tzinfo=timezone.utc)
+
+    # The mock user only gets wallets and transactions, so --reset can find every generated row
+    own_profile = index >= 0
+    if not own_profile:
+        user_id = MOCK_USER_A_ID
+    else:
+        user_id = new_uuid(rng)
+        rows["users"].append((user_id, f"user{index}@{EMAIL_DOMAIN}", password_hash, f"Bench{index}", "User", True, created))
+
+    categories = {kind: list(ids) for kind, ids in system_categories.items()}
+    if is_sme and own_profile:
+        for name, kind in SME_CATEGORIES:
+            category_id = new_uuid(rng)
+            rows["categories"].append((category_id, user_id, name, kind))
+            categories[kind].append(category_id)
+
+    wallets = []   # [wallet_id, name, currency, idr_per_unit, balance_cents]
+    for w in range(rng.randint(3, 8) if is_sme else rng.randint(1, 3)):
+        currency, rate = CURRENCIES[0] if w == 0 or rng.random() < 0.85 else rng.choice(CURRENCIES[1:])
+        opening = int(rng.lognormvariate(math.log(5_000_000 if is_sme else 1_000_000), 1.0) / rate * 100)
+        wallets.append([new_uuid(rng), f"{BENCH_WALLET_PREFIX}{rng.choice(WALLET_NAMES)} {w + 1}", currency, rate, opening])
+    # The first wallet carries most of the activity
+    wallet_weights = [1.0 / (w + 1) for w in range(len(wallets))]
+
+    income_share = 0.45 if is_sme else 0.15
+    median_idr = 400_000 if is_sme else 60_000
+    dates = rng.choices(days, cum_weights=cum_weights, k=tx_count)
+    for day in dates:
+        kind = "INCOME" if rng.random() < income_share else "EXPENSE"
+        wallet = rng.choices(wallets, weights=wallet_weights)[0]
+        amount_idr = rng.lognormvariate(math.log(median_idr * (4 if kind == "INCOME" else 1)), 0.9)
+        cents = max(int(amount_idr / wallet[3] * 100), 1)
+        wallet[4] += cents if kind == "INCOME" else -cents
+        at = datetime(day.year, day.month, day.day, rng.randint(6, 22), rng.randint(0, 59), rng.randint(0, 59), tzinfo=timezone.utc)
+        rows["transactions"].append((
+            new_uuid(rng), wallet[0], rng.choice(categories[kind]), kind, money(cents),
+            f"{rng.choice(DESCRIPTIONS[kind])} {rng.randint(1, 999)}", at,
+        ))
+
+    for wallet_id, name, currency, _, balance in wallets:
+        rows["wallets"].append((wallet_id, user_id, name, currency, money(balance)))
+
+    if not own_profile:
+        return rows
+
+    month = days[0].replace(day=1)
+    while month <= days[-1]:
+        last_day = month.replace(day=calendar.monthrange(month.year, month.month)[1])
+        for category_id in rng.sample(categories["EXPENSE"], min(len(categories["EXPENSE"]), 3 if is_sme else 1)):
+            limit = int(rng.lognormvariate(math.log(median_idr * 20), 0.5)) * 100
+            rows["budgets"].append((new_uuid(rng), user_id, category_id, money(limit), month, last_day))
+        month = last_day + timedelta(days=1)
+
+    for _ in range(rng.randint(10, 60) if is_sme else rng.randint(0, 3)):
+        total = int(rng.lognormvariate(math.log(median_idr * 10), 1.0)) * 100
+        settled = rng.random() < 0.4
+        paid = total if settled else int(total * rng.random())
+        due = rng.choice(days) + timedelta(days=rng.randint(7, 60))
+        rows["debt_ledgers"].append((
+            new_uuid(rng), user_id, rng.choice(CONTACTS), f"08{rng.randint(100_000_000, 9_999_999_999)}",
+            rng.random() < 0.5, money(total), money(paid), due, settled,
+        ))
+    return rows
+
+# Table -> model, in FK order
+LOAD_ORDER = (("users", User), ("categories", Category), ("wallets", Wallet),
+              ("transactions", Transaction), ("budgets", Budget), ("debt_ledgers", DebtLedger))
+
+def asyncpg_dsn() -> str:
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+async def _load_slice(plan_slice, args, system_categories, password_hash) -> Dict[str, int]:
+    days, cum_weights = day_weights(date.fromisoformat(args.end_date), args.months)
+    batches: Dict[str, list] = {table: [] for table, _ in LOAD_ORDER}
+    for index, is_sme, tx_count in plan_slice:
+        for table, rows in generate_user(index, is_sme, tx_count, args, system_categories, days, cum_weights, password_hash).items():
+            batches[table].extend(rows)
+
+    conn = await asyncpg.connect(asyncpg_dsn())
+    try:
+        async with conn.transaction():
+            for table, model in LOAD_ORDER:
+                if batches[table]:
+                    await conn.copy_records_to_table(table, records=batches[table], columns=columns(model))
+    finally:
+        await conn.close()
+    return {table: len(rows) for table, rows in batches.items()}
+
+def load_slice(plan_slice, args, system_categories, password_hash) -> Dict[str, int]:
+    """Worker process entry point: generates and COPYs one slice of users."""
+    return asyncio.run(_load_slice(plan_slice, args, system_categories, password_hash))
+
+# --- Setup / reset ---
+
+async def fetch_system_categories() -> Dict[str, List[uuid.UUID]]:
+    conn = await asyncpg.connect(asyncpg_dsn())
+    try:
+        rows = await conn.fetch("SELECT category_id, type::text AS type FROM categories WHERE user_id IS NULL ORDER BY category_id")
+    finally:
+        await conn.close()
+    categories = {"INCOME": [], "EXPENSE": []}
+    for row in rows:
+        categories[row["type"]].append(row["category_id"])
+    if not categories["INCOME"] or not categories["EXPENSE"]:
+        raise SystemExit("System categories missing; run `python -m app.initial_data` first.")
+    return categories
+
+async def reset() -> None:
+    conn = await asyncpg.connect(asyncpg_dsn())
+    bench_users = f"SELECT user_id FROM users WHERE email LIKE '%@{EMAIL_DOMAIN}'"
+    # The mock user's generated wallets are the ones carrying the bench prefix
+    wallets = (
+        f"SELECT wallet_id FROM wallets WHERE user_id IN ({bench_users}) "
+        f"OR (user_id = '{MOCK_USER_A_ID}' AND wallet_name LIKE '{BENCH_WALLET_PREFIX}%')"
+    )
+    try:
+        async with conn.transaction():
+            await conn.execute(f"DELETE FROM transactions WHERE wallet_id IN ({wallets})")
+            await conn.execute(f"DELETE FROM wallets WHERE wallet_id IN ({wallets})")
+            for table in ("budgets", "debt_ledgers", "categories", "users"):
+                await conn.execute(f"DELETE FROM {table} WHERE user_id IN ({bench_users})")
+    finally:
+        await conn.close()
+
+async def analyze() -> None:
+    conn = await asyncpg.connect(asyncpg_dsn())
+    try:
+        for table, _ in LOAD_ORDER:
+            await conn.execute(f"ANALYZE {table}")
+    finally:
+        await conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--transactions", type=int, default=2_000_000, help="Total, including the mock user's.")
+    parser.add_argument("--sme-users", type=int, default=20)
+    parser.add_argument("--sme-share", type=float, default=0.4, help="Fraction of transactions owned by SME users.")
+    parser.add_argument("--mock-user-transactions", type=int, default=50_000,
+                        help="Ledger size of the mock user (the account load_test drives).")
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--end-date", default="2025-06-30", help="Fixed, so a seed always yields the same rows.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=4, help="Parallel generator processes / COPY connections.")
+    parser.add_argument("--users-per-slice", type=int, default=250)
+    parser.add_argument("--reset", action="store_true", help="Delete previously generated rows first.")
+    args = parser.parse_args()
+
+    if args.reset:
+        asyncio.run(reset())
+        print("Previously generated rows deleted.")
+
+    system_categories = asyncio.run(fetch_system_categories())
+    password_hash = get_password_hash(PASSWORD)
+    plan = plan_users(args)
+    # Heavy users get their own slices so one slow slice doesn't dominate the wall time
+    slices = [[entry] for entry in plan if entry[1]]
+    light = [entry for entry in plan if not entry[1]]
+    slices += [light[i:i + args.users_per_slice] for i in range(0, len(light), args.users_per_slice)]
+
+    started = time.perf_counter()
+    totals: Dict[str, int] = {table: 0 for table, _ in LOAD_ORDER}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(load_slice, s, args, system_categories, password_hash) for s in slices]
+        for done, future in enumerate(futures, 1):
+            for table, count in future.result().items():
+                totals[table] += count
+            if done % 10 == 0 or done == len(futures):
+                print(f"{done}/{len(futures)} slices loaded ({totals['transactions']:,} transactions)")
+
+    asyncio.run(analyze())
+    elapsed = time.perf_counter() - started
+    print(", ".join(f"{table}={count:,}" for table, count in totals.items()))
+    print(f"Loaded in {elapsed:.1f} s ({totals['transactions'] / elapsed:,.0f} transactions/s).")
+
+if __name__ == "__main__":
+    main()
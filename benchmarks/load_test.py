@@ -0,0 +1,325 @@
+"""
+End-to-end load benchmark: boots the API (uvicorn subprocess) against the configured
+PostgreSQL + Redis, seeds wallets and transactions through the API, then drives a weighted
+mix of endpoints at fixed concurrency with an async HTTP client.
+
+Per endpoint it reports requests, errors, RPS, p50/p95/p99 latency and DB queries per
+request (read from the Server-Timing header, so the server runs with SERVER_TIMING_ENABLED).
+Results are saved as JSON together with the git commit, and can be compared to a previous run.
+
+Usage:
+    python -m app.initial_data      # once: migrations + mock user
+    python -m benchmarks.load_test [--duration 30] [--concurrency 32] [--workers 2]
+        [--mix login=1,list=30,search=10,create=10,transfer=3,summary=20]
+        [--seed-transactions 2000] [--json out.json] [--compare baseline.json]
+
+With --base-url an already running server is used instead (start it with
+SERVER_TIMING_ENABLED=true and RATE_LIMIT_ENABLED=false for comparable numbers).
+For production-scale data, load it first with `python -m benchmarks.generate_dataset`
+(the mock user gets a large ledger) and pass --seed-transactions 0.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+API = "/api/v1"
+SEARCH_TERMS = ("kopi", "makan", "bensin", "gaji", "listrik", "belanja", "pulsa", "parkir")
+DB_QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+# --- Server ---
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        SERVER_TIMING_ENABLED="true",
+        SERVER_TIMING_LOG_MIN_MS="1e9",   # header only, no per-request log lines
+        RATE_LIMIT_ENABLED="false",
+        WEB_CONCURRENCY=str(workers),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env=env, stdout=subprocess.DEVNULL,
+    )
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("Server did not become ready in time.")
+
+# --- Dataset ---
+
+class Fixture:
+    """IDs the workload picks from (all owned by the mock user)."""
+
+    def __init__(self):
+        self.wallet_ids: List[str] = []
+        self.categories: Dict[str, List[str]] = {"INCOME": [], "EXPENSE": []}
+
+async def login(client: httpx.AsyncClient) -> httpx.Response:
+    return await client.post(f"{API}/token", data={
+        "username": settings.MOCK_USER_A_EMAIL, "password": settings.MOCK_USER_A_PASSWORD,
+    })
+
+async def seed(client: httpx.AsyncClient, rng: random.Random, wallets: int, transactions: int, concurrency: int) -> Fixture:
+    fixture = Fixture()
+    existing = (await client.get(f"{API}/wallets/", params={"limit": 100})).json()["data"]
+    fixture.wallet_ids = [w["wallet_id"] for w in existing]
+    for i in range(len(fixture.wallet_ids), wallets):
+        created = await client.post(f"{API}/wallets/", json={
+            "wallet_name": f"Bench {i}", "currency": "IDR", "initial_balance": "1000000000.00",
+        })
+        created.raise_for_status()
+        fixture.wallet_ids.append(created.json()["data"]["wallet_id"])
+
+    for category in (await client.get(f"{API}/categories/", params={"limit": 100})).json()["data"]:
+        fixture.categories[category["type"]].append(category["category_id"])
+    if not fixture.categories["INCOME"] or not fixture.categories["EXPENSE"]:
+        raise RuntimeError("System categories missing; run `python -m app.initial_data` first.")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(transactions):
+        queue.put_nowait(transaction_payload(fixture, rng))
+
+    async def _worker():
+        while not queue.empty():
+            (await client.post(f"{API}/transactions/", json=queue.get_nowait())).raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    if transactions:
+        print(f"Seeded {transactions} transactions in {time.perf_counter() - started:.1f} s.")
+    return fixture
+
+def transaction_payload(fixture: Fixture, rng: random.Random) -> dict:
+    kind = "INCOME" if rng.random() < 0.2 else "EXPENSE"
+    return {
+        "wallet_id": rng.choice(fixture.wallet_ids),
+        "category_id": rng.choice(fixture.categories[kind]),
+        "transaction_type": kind,
+        "amount": str(Decimal(rng.randint(1_000, 500_000))),
+        "description": f"{rng.choice(SEARCH_TERMS)} {rng.randint(1, 999)}",
+    }
+
+# --- Workload ---
+
+def build_operations(fixture: Fixture, rng: random.Random) -> dict:
+    async def op_login(client):
+        return await login(client)
+
+    async def op_list(client):
+        return await client.get(f"{API}/transactions/", params={"limit": 20, "offset": rng.randint(0, 200)})
+
+    async def op_search(client):
+        return await client.get(f"{API}/transactions/", params={"q": rng.choice(SEARCH_TERMS), "limit": 20})
+
+    async def op_create(client):
+        return await client.post(f"{API}/transactions/", json=transaction_payload(fixture, rng))
+
+    async def op_transfer(client):
+        source, target = rng.sample(fixture.wallet_ids, 2)
+        return await client.post(f"{API}/finance/transfer", json={
+            "source_wallet_id": source, "target_wallet_id": target,
+            "amount": str(rng.randint(1_000, 50_000)), "description": "bench transfer",
+        })
+
+    async def op_summary(client):
+        return await client.get(f"{API}/finance/summary")
+
+    return {
+        "login": op_login, "list": op_list, "search": op_search,
+        "create": op_create, "transfer": op_transfer, "summary": op_summary,
+    }
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.db_queries: Dict[str, List[int]] = defaultdict(list)
+
+    def record(self, name: str, seconds: float, response: Optional[httpx.Response]) -> None:
+        self.latencies[name].append(seconds * 1000)
+        if response is None or response.status_code >= 400:
+            self.errors[name] += 1
+            return
+        match = DB_QUERIES_RE.search(response.headers.get("server-timing", ""))
+        if match:
+            self.db_queries[name].append(int(match.group(1)))
+
+async def drive(client: httpx.AsyncClient, operations: dict, weights: Dict[str, float],
+                concurrency: int, duration: float, seed_value: int) -> Recorder:
+    recorder = Recorder()
+    names = list(weights)
+    name_weights = [weights[n] for n in names]
+    deadline = time.perf_counter() + duration
+
+    async def _user(index: int):
+        rng = random.Random(seed_value + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=name_weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await operations[name](client)
+            except httpx.HTTPError:
+                response = None
+            recorder.record(name, time.perf_counter() - started, response)
+
+    await asyncio.gather(*(_user(i) for i in range(concurrency)))
+    return recorder
+
+# --- Reporting ---
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def summarize(recorder: Recorder, duration: float) -> dict:
+    endpoints = {}
+    all_latencies = []
+    for name, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(samples)
+        all_latencies.extend(ordered)
+        queries = recorder.db_queries.get(name)
+        endpoints[name] = {
+            "requests": len(ordered),
+            "errors": recorder.errors.get(name, 0),
+            "rps": round(len(ordered) / duration, 1),
+            "p50_ms": round(percentile(ordered, 50), 2),
+            "p95_ms": round(percentile(ordered, 95), 2),
+            "p99_ms": round(percentile(ordered, 99), 2),
+            "db_queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        }
+    all_latencies.sort()
+    return {
+        "endpoints": endpoints,
+        "total": {
+            "requests": len(all_latencies),
+            "errors": sum(recorder.errors.values()),
+            "rps": round(len(all_latencies) / duration, 1),
+            "p50_ms": round(percentile(all_latencies, 50), 2),
+            "p95_ms": round(percentile(all_latencies, 95), 2),
+            "p99_ms": round(percentile(all_latencies, 99), 2),
+        },
+    }
+
+def print_report(results: dict, baseline: Optional[dict] = None) -> None:
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+    print(f"{'endpoint':<10} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'q/req':>6}")
+    for name, stats in rows:
+        queries = stats.get("db_queries_per_request")
+        print(f"{name:<10} {stats['requests']:>7} {stats['errors']:>5} {stats['rps']:>8} {stats['p50_ms']:>8} "
+              f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {'' if queries is None else queries:>6}")
+        if baseline:
+            before = baseline["total"] if name == "TOTAL" else baseline["endpoints"].get(name)
+            if before:
+                print(f"{'  vs base':<10} {'':>7} {'':>5} {_delta(stats['rps'], before['rps']):>8} "
+                      f"{_delta(stats['p50_ms'], before['p50_ms']):>8} {_delta(stats['p95_ms'], before['p95_ms']):>8} "
+                      f"{_delta(stats['p99_ms'], before['p99_ms']):>8}")
+
+def _delta(after: float, before: float) -> str:
+    return f"{(after - before) / before * 100:+.0f}%" if before else "n/a"
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# --- Main ---
+
+async def run(args) -> dict:
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = start_server(args.port, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+            await wait_until_ready(client)
+            token = (await login(client)).json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+
+            rng = random.Random(args.seed)
+            fixture = await seed(client, rng, args.seed_wallets, args.seed_transactions, args.concurrency)
+            operations = build_operations(fixture, rng)
+            weights = {name: w for name, w in parse_mix(args.mix).items() if w > 0}
+            unknown = set(weights) - set(operations)
+            if unknown:
+                raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+
+            if args.warmup > 0:
+                await drive(client, operations, weights, args.concurrency, args.warmup, args.seed)
+            recorder = await drive(client, operations, weights, args.concurrency, args.duration, args.seed)
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    results = summarize(recorder, args.duration)
+    results["config"] = {
+        "commit": git_commit(), "duration_s": args.duration, "concurrency": args.concurrency,
+        "workers": args.workers if server else None, "mix": weights, "seed": args.seed,
+        "seed_transactions": args.seed_transactions,
+    }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds.")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before the run.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2, help="Uvicorn workers for the booted server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base-url", help="Use an already running server instead of booting one.")
+    parser.add_argument("--mix", default="login=1,list=30,search=10,create=10,transfer=3,summary=20")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed-wallets", type=int, default=5)
+    parser.add_argument("--seed-transactions", type=int, default=2000)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file.")
+    parser.add_argument("--compare", help="Previous results JSON to print deltas against.")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+    print_report(results, baseline)
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: response rendering time and size per endpoint payload, comparing the previous
+path (`jsonable_encoder` + stdlib `json` via JSONResponse, "before") with the current one
+(pydantic-core JSON-mode dump + orjson via FastJSONResponse, "after"), plus the body size
+after gzip and brotli as negotiated by CompressionMiddleware.
+
+Payloads are built from the real response schemas with synthetic rows; no DB is needed.
+
+Usage:
+    python -m benchmarks.response_rendering [--iterations 2000] [--json out.json]
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.schemas.category import CategoryResponse
+from app.schemas.common import APIListResponse, APIResponse
+from app.schemas.report import FinancialSummaryResponse
+from app.schemas.transaction import TransactionResponse
+from app.schemas.wallet import WalletResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def _amount(rng: random.Random) -> Decimal:
+    return Decimal(rng.randint(100, 5_000_000)) / 100
+
+def build_payloads(seed: int = 7):
+    rng = random.Random(seed)
+    user_id = uuid.UUID(int=rng.getrandbits(128))
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    wallets = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(5)]
+    categories = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(30)]
+
+    return {
+        "GET /transactions/?limit=100": APIListResponse[TransactionResponse](
+            message="Transactions retrieved successfully.",
+            data=[
+                TransactionResponse(
+                    transaction_id=uuid.UUID(int=rng.getrandbits(128)),
+                    wallet_id=rng.choice(wallets),
+                    category_id=rng.choice(categories),
+                    transaction_type=rng.choice(["INCOME", "EXPENSE"]),
+                    amount=_amount(rng),
+                    description=f"Pembelian #{i} di toko {rng.randint(1, 40)}",
+                    transaction_date=now - timedelta(minutes=17 * i),
+                )
+                for i in range(100)
+            ],
+            total_count=2400,
+        ),
+        "GET /wallets/": APIListResponse[WalletResponse](
+            message="Wallets retrieved successfully.",
+            data=[
+                WalletResponse(wallet_id=w, user_id=user_id, wallet_name=f"Wallet {i}", currency="IDR", current_balance=_amount(rng))
+                for i, w in enumerate(wallets)
+            ],
+            total_count=len(wallets),
+        ),
+        "GET /categories/?limit=30": APIListResponse[CategoryResponse](
+            message="Categories retrieved successfully.",
+            data=[
+                CategoryResponse(category_id=c, category_name=f"Kategori {i}", type=rng.choice(["INCOME", "EXPENSE"]))
+                for i, c in enumerate(categories)
+            ],
+            total_count=len(categories),
+        ),
+        "GET /finance/summary": APIResponse[FinancialSummaryResponse](
+            message="Financial summary retrieved.",
+            data=FinancialSummaryResponse(
+                total_income=_amount(rng), total_expense=_amount(rng), net_balance=_amount(rng), date_generated=now
+            ),
+        ),
+    }
+
+def render_before(model) -> bytes:
+    return JSONResponse(jsonable_encoder(model)).body
+
+def render_after(model) -> bytes:
+    # What FastAPI passes to the response class: the response_model dumped in JSON mode
+    return FastJSONResponse(model.model_dump(mode="json")).body
+
+def _time(render, model, iterations: int) -> float:
+    render(model)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render(model)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file.")
+    args = parser.parse_args()
+
+    results = {}
+    for name, model in build_payloads().items():
+        before_us = _time(render_before, model, args.iterations)
+        after_us = _time(render_after, model, args.iterations)
+        body = render_after(model)
+        assert json.loads(body) == json.loads(render_before(model)), f"{name}: renderers disagree"
+
+        sizes = {"raw": len(body), "gzip": len(gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL))}
+        if brotli:
+            sizes["br"] = len(brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY))
+        compressed = len(body) >= settings.COMPRESSION_MINIMUM_SIZE
+
+        results[name] = {"before_us": round(before_us, 2), "after_us": round(after_us, 2), "bytes": sizes, "compressed": compressed}
+        size_text = "  ".join(f"{k}={v}" for k, v in sizes.items())
+        print(f"{name:<30} before={before_us:>8.1f} us  after={after_us:>8.1f} us  "
+              f"speedup={before_us / after_us:>5.2f}x  {size_text}{'' if compressed else '  (below threshold)'}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Startup-time benchmark: reports how long `import app.main` takes in a fresh
+interpreter and how long the application lifespan takes to start and stop.
+
+Usage:
+    python -m benchmarks.startup_time [--runs 5] [--skip-lifespan] [--json out.json]
+
+The lifespan measurement needs a reachable database (it warms the pool).
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+def measure_import(runs: int) -> list:
+    """Imports the app in a new interpreter per run, so module caches never help."""
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            check=True, capture_output=True, text=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+async def _measure_lifespan_once() -> tuple:
+    from app.main import app, lifespan
+
+    started = time.perf_counter()
+    async with lifespan(app):
+        ready = time.perf_counter()
+    stopped = time.perf_counter()
+
+    from app.core.db import engine
+    await engine.dispose()
+    return (ready - started) * 1000, (stopped - ready) * 1000
+
+def measure_lifespan(runs: int) -> dict:
+    startup, shutdown = [], []
+    for _ in range(runs):
+        up, down = asyncio.run(_measure_lifespan_once())
+        startup.append(up)
+        shutdown.append(down)
+    return {"startup_ms": startup, "shutdown_ms": shutdown}
+
+def _summary(samples: list) -> dict:
+    return {
+        "min_ms": round(min(samples), 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-lifespan", action="store_true", help="Only measure import time (no DB needed).")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file.")
+    args = parser.parse_args()
+
+    results = {"import": _summary(measure_import(args.runs))}
+    if not args.skip_lifespan:
+        lifespan = measure_lifespan(args.runs)
+        results["lifespan_startup"] = _summary(lifespan["startup_ms"])
+        results["lifespan_shutdown"] = _summary(lifespan["shutdown_ms"])
+
+    for name, stats in results.items():
+        print(f"{name:<20} min={stats['min_ms']:>8} ms  median={stats['median_ms']:>8} ms  max={stats['max_ms']:>8} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+if __name__ == "__main__":
+    main()
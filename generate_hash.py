@@ -1,5 +1,5 @@
 # Use a temporary script to generate the hash
-from app.crud.user import get_password_hash
+from app.core.hashing import get_password_hash
 
 # The client is sending 'testpassword123' (see Dio Request in original prompt)
 password_to_hash = "testpassword123" 
@@ -0,0 +1,23 @@
+# gunicorn -c gunicorn.conf.py app.main:app
+import os
+import shutil
+import tempfile
+
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# Prometheus multiprocess mode: must be set before any worker imports prometheus_client,
+# so that every worker writes its samples to files /metrics can aggregate.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "finanzio-metrics"))
+
+def on_starting(server):
+    # Samples of a previous run would otherwise be counted again
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+def child_exit(server, worker):
+    # Drops the live gauges (in-flight requests, pool occupancy) of a dead worker
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)